@@ -353,9 +353,16 @@ class ORB2Engine:
         
         # Update OR builders
         if not self.or_builder.both_finalized:
+            was_finalized = self.or_builder.primary_finalized
             self.or_builder.update(bar)
             self.or_builder.finalize_if_due(timestamp)
-            
+
+            # Latch OR readiness and final levels on playbooks once per session
+            if self.or_builder.primary_finalized and not was_finalized:
+                or_state = self.or_builder.state()
+                for playbook in self.playbooks:
+                    playbook.on_or_finalized(or_state.primary_high, or_state.primary_low)
+
             # Add bar to auction builder during OR period
             if not self.or_builder.primary_finalized:
                 self.auction_builder.add_bar(bar)
@@ -1055,7 +1062,7 @@ class ORB2Engine:
             or_width_norm=signal.metadata.or_width_norm if signal.metadata else 0.0,
             initial_stop=signal.initial_stop,
             final_stop=stop_mgr.stop_price if stop_mgr else signal.initial_stop,
-            stop_phase=stop_mgr.phase.value if stop_mgr else "PHASE1",
+            stop_phase=stop_mgr.phase.name if stop_mgr else "PHASE1",
             salvage_triggered=(reason == "SALVAGE"),
         )
         
@@ -9,6 +9,12 @@ from .qc import (
     check_ohlc_validity,
     DayQualityReport,
 )
+from .session_cache import (
+    SESSION_BAR_DTYPE,
+    SessionArrayCache,
+    bars_to_session_array,
+    session_array_to_frame,
+)
 
 __all__ = [
     # Providers
@@ -24,4 +30,9 @@ __all__ = [
     "check_or_window",
     "check_ohlc_validity",
     "DayQualityReport",
+    # Session array cache
+    "SESSION_BAR_DTYPE",
+    "SessionArrayCache",
+    "bars_to_session_array",
+    "session_array_to_frame",
 ]
\ No newline at end of file
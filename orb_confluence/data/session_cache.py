@@ -0,0 +1,174 @@
+"""Memory-mapped per-session bar cache.
+
+Stores each session's bars as a structured NumPy ``.npy`` file so repeated
+backtests and parameter sweeps can ``np.load(..., mmap_mode='r')`` the same
+sessions without re-parsing JSON/CSV. Memory-mapped views share the OS page
+cache, so multiple sweep workers can read the same sessions without each
+holding a private copy.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+SESSION_BAR_DTYPE = np.dtype([
+    ("timestamp_ns", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+    ("volume_ratio", "f8"),
+    ("atr_14", "f8"),
+])
+
+# Fill values for optional feature columns (match playbook context defaults)
+_OPTIONAL_DEFAULTS = {"volume_ratio": 1.0, "atr_14": np.nan}
+
+
+def bars_to_session_array(bars: pd.DataFrame) -> np.ndarray:
+    """Convert a bar DataFrame into a SESSION_BAR_DTYPE structured array.
+
+    Args:
+        bars: DataFrame with timestamp_utc, open, high, low, close, volume and
+            optional volume_ratio / atr_14 columns
+
+    Returns:
+        Structured array with one record per bar
+    """
+    arr = np.empty(len(bars), dtype=SESSION_BAR_DTYPE)
+    timestamps = pd.to_datetime(bars["timestamp_utc"], utc=True).dt.tz_convert(None)
+    arr["timestamp_ns"] = timestamps.to_numpy(dtype="datetime64[ns]").astype("int64")
+
+    for col in ("open", "high", "low", "close", "volume"):
+        arr[col] = bars[col].to_numpy(dtype=float)
+
+    for col, default in _OPTIONAL_DEFAULTS.items():
+        arr[col] = bars[col].to_numpy(dtype=float) if col in bars else default
+
+    return arr
+
+
+def session_array_to_frame(arr: np.ndarray) -> pd.DataFrame:
+    """Convert a session structured array back into an engine-ready DataFrame.
+
+    Args:
+        arr: SESSION_BAR_DTYPE array (memory-mapped or in-memory)
+
+    Returns:
+        DataFrame with timestamp_utc and OHLCV/feature columns
+    """
+    df = pd.DataFrame({name: arr[name] for name in SESSION_BAR_DTYPE.names[1:]})
+    df.insert(0, "timestamp_utc", pd.to_datetime(arr["timestamp_ns"], utc=True))
+    return df
+
+
+class SessionArrayCache:
+    """Directory of per-session ``session_{YYYY-MM-DD}.npy`` bar files.
+
+    Example:
+        >>> cache = SessionArrayCache("data_cache/sessions/ES")
+        >>> cache.write(bars_df)  # One-time conversion
+        >>> sessions = cache.load_range("2025-01-01", "2025-03-31")
+        >>> results = FailureFadePlaybook.sweep(list(sessions.values()), or_levels, grid)
+    """
+
+    def __init__(self, cache_directory: Union[str, Path]):
+        """Initialize cache.
+
+        Args:
+            cache_directory: Directory holding the session .npy files (created if missing)
+        """
+        self.cache_dir = Path(cache_directory)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, session_date: str) -> Path:
+        """Get file path for a session.
+
+        Args:
+            session_date: Session date (YYYY-MM-DD)
+
+        Returns:
+            Path to session .npy file
+        """
+        return self.cache_dir / f"session_{session_date}.npy"
+
+    def write(self, bars: pd.DataFrame) -> List[Path]:
+        """Split bars by session date and write one .npy file per session.
+
+        Args:
+            bars: DataFrame with timestamp_utc and OHLCV columns
+
+        Returns:
+            List of written file paths
+        """
+        timestamps = pd.to_datetime(bars["timestamp_utc"], utc=True)
+        session_dates = timestamps.dt.strftime("%Y-%m-%d")
+
+        paths = []
+        for session_date, session_bars in bars.groupby(session_dates.to_numpy(), sort=True):
+            path = self.path(session_date)
+            np.save(path, bars_to_session_array(session_bars))
+            paths.append(path)
+
+        logger.info(f"Wrote {len(paths)} session arrays to {self.cache_dir}")
+        return paths
+
+    def write_csv(self, csv_path: Union[str, Path]) -> List[Path]:
+        """Parse a bar CSV once and write its sessions to the cache.
+
+        Args:
+            csv_path: CSV with timestamp_utc and OHLCV columns
+
+        Returns:
+            List of written file paths
+        """
+        bars = pd.read_csv(csv_path, parse_dates=["timestamp_utc"])
+        return self.write(bars)
+
+    def load(self, session_date: str) -> np.ndarray:
+        """Memory-map a session's bars (read-only).
+
+        Args:
+            session_date: Session date (YYYY-MM-DD)
+
+        Returns:
+            Read-only memory-mapped SESSION_BAR_DTYPE array
+        """
+        path = self.path(session_date)
+        if not path.exists():
+            raise FileNotFoundError(f"Session array not found: {path}")
+        return np.load(path, mmap_mode="r")
+
+    def load_range(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Memory-map all cached sessions within a date range.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD), None = all
+            end_date: End date (YYYY-MM-DD, inclusive), None = all
+
+        Returns:
+            Dictionary of session date -> memory-mapped array, in date order
+        """
+        return {
+            session_date: self.load(session_date)
+            for session_date in self.available_sessions()
+            if (start_date is None or session_date >= start_date)
+            and (end_date is None or session_date <= end_date)
+        }
+
+    def available_sessions(self) -> List[str]:
+        """Get sorted list of cached session dates.
+
+        Returns:
+            List of session date strings
+        """
+        return sorted(p.stem.replace("session_", "") for p in self.cache_dir.glob("session_*.npy"))
@@ -9,7 +9,11 @@ Each playbook encapsulates a specific trading logic:
 - PB6: Spread Alignment (ES/NQ)
 """
 
+from .bar_features import BarFeatures, compute_bar_features
 from .base import (
+    DIR_LONG,
+    DIR_SHORT,
+    DIRECTION_NAMES,
     Playbook,
     CandidateSignal,
     ExitModeDescriptor,
@@ -24,8 +28,13 @@ __all__ = [
     "CandidateSignal",
     "ExitModeDescriptor",
     "SignalMetadata",
+    "DIR_LONG",
+    "DIR_SHORT",
+    "DIRECTION_NAMES",
     "ORBRefinedPlaybook",
     "FailureFadePlaybook",
     "PullbackContinuationPlaybook",
+    "BarFeatures",
+    "compute_bar_features",
 ]
 
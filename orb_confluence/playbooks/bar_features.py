@@ -0,0 +1,88 @@
+"""Shared bar-level features for batch playbook evaluation.
+
+Playbooks look at overlapping quantities of the same bars (body size,
+wicks, distance beyond the OR, move in ATR units). Computing them once
+in a single pass over the bar arrays lets every playbook's batch path
+reduce to threshold comparisons on precomputed columns, instead of each
+playbook re-reading OHLC and recomputing its own intermediates.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class BarFeatures:
+    """Per-bar features shared by playbooks (arrays of a common shape)."""
+
+    body: np.ndarray  # |close - open|
+    upper_wick: np.ndarray  # high - max(open, close)
+    lower_wick: np.ndarray  # min(open, close) - low
+    wick_up_ratio: np.ndarray  # upper_wick / body (1.0 for zero body)
+    wick_dn_ratio: np.ndarray  # lower_wick / body (1.0 for zero body)
+    dist_to_or_high: np.ndarray  # close - or_high (positive above OR)
+    dist_to_or_low: np.ndarray  # or_low - close (positive below OR)
+    move_r_long: np.ndarray  # dist_to_or_high / ATR (0 where ATR <= 0)
+    move_r_short: np.ndarray  # dist_to_or_low / ATR (0 where ATR <= 0)
+
+
+def compute_bar_features(
+    bar_open: np.ndarray,
+    bar_high: np.ndarray,
+    bar_low: np.ndarray,
+    bar_close: np.ndarray,
+    or_high,
+    or_low,
+    atr_14=1.0,
+) -> BarFeatures:
+    """Compute shared playbook bar features in one pass.
+
+    Inputs broadcast against each other, so OR levels / ATR may be scalars,
+    per-session columns (S, 1) or full (S, B) arrays.
+
+    Args:
+        bar_open: Bar open prices
+        bar_high: Bar high prices
+        bar_low: Bar low prices
+        bar_close: Bar close prices
+        or_high: Primary OR high
+        or_low: Primary OR low
+        atr_14: ATR used to express moves in R
+
+    Returns:
+        BarFeatures
+    """
+    bar_open = np.asarray(bar_open, dtype=float)
+    bar_high = np.asarray(bar_high, dtype=float)
+    bar_low = np.asarray(bar_low, dtype=float)
+    bar_close = np.asarray(bar_close, dtype=float)
+    atr_14 = np.asarray(atr_14, dtype=float)
+
+    body = np.abs(bar_close - bar_open)
+    upper_wick = bar_high - np.maximum(bar_close, bar_open)
+    lower_wick = np.minimum(bar_close, bar_open) - bar_low
+
+    dist_to_or_high = bar_close - or_high
+    dist_to_or_low = or_low - bar_close
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_body = body > 0
+        wick_up_ratio = np.where(has_body, upper_wick / body, 1.0)
+        wick_dn_ratio = np.where(has_body, lower_wick / body, 1.0)
+
+        has_atr = atr_14 > 0
+        move_r_long = np.where(has_atr, dist_to_or_high / atr_14, 0.0)
+        move_r_short = np.where(has_atr, dist_to_or_low / atr_14, 0.0)
+
+    return BarFeatures(
+        body=body,
+        upper_wick=upper_wick,
+        lower_wick=lower_wick,
+        wick_up_ratio=wick_up_ratio,
+        wick_dn_ratio=wick_dn_ratio,
+        dist_to_or_high=dist_to_or_high,
+        dist_to_or_low=dist_to_or_low,
+        move_r_long=move_r_long,
+        move_r_short=move_r_short,
+    )
@@ -7,7 +7,14 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+
+# Integer direction codes used inside playbooks and batch arrays (int8);
+# CandidateSignal.direction stays a 'long'/'short' string for consumers.
+DIR_LONG = 1
+DIR_SHORT = -1
+DIRECTION_NAMES = {DIR_LONG: "long", DIR_SHORT: "short"}
 
 
 class ExitMode(str, Enum):
@@ -20,9 +27,12 @@ class ExitMode(str, Enum):
     TIME_DECAY_FORCE = "TIME_DECAY_FORCE"  # Force exit on time decay
 
 
-@dataclass
+@dataclass(frozen=True)
 class ExitModeDescriptor:
-    """Describes preferred exit mode for a signal."""
+    """Describes preferred exit mode for a signal.
+    
+    Immutable so playbooks can share one instance across all their signals.
+    """
     
     mode: ExitMode
     
@@ -121,8 +131,14 @@ class Playbook(ABC):
     1. Eligibility check (can this playbook trade in this context?)
     2. Signal generation (produce candidate signals)
     3. Exit mode recommendation
+    
+    Playbooks declare ``__slots__`` to keep per-instance state compact when
+    many are instantiated for parameter sweeps; subclasses must list their
+    own attributes.
     """
     
+    __slots__ = ("name", "config", "enabled", "_or_ready", "_or_high", "_or_low")
+    
     def __init__(self, name: str, config: Optional[Dict] = None) -> None:
         """Initialize playbook.
         
@@ -133,6 +149,50 @@ class Playbook(ABC):
         self.name = name
         self.config = config or {}
         self.enabled = self.config.get("enabled", True)
+        
+        # Cached OR state (set once per session by on_or_finalized)
+        self._or_ready = False
+        self._or_high: Optional[float] = None
+        self._or_low: Optional[float] = None
+    
+    def on_or_finalized(
+        self,
+        or_high: Optional[float] = None,
+        or_low: Optional[float] = None,
+    ) -> None:
+        """Notify playbook that the primary OR has finalized.
+        
+        Called by the engine once per session with the final OR levels;
+        lets eligibility checks skip the ``or_primary_finalized`` context
+        lookup and signal generation reuse the cached levels on every bar.
+        
+        Args:
+            or_high: Final primary OR high (if known)
+            or_low: Final primary OR low (if known)
+        """
+        self._or_ready = True
+        self._or_high = or_high
+        self._or_low = or_low
+    
+    def _cached_or_levels(self, context: Dict) -> Tuple[float, float]:
+        """Return cached OR (high, low), filling the cache from context once."""
+        if self._or_high is None or self._or_low is None:
+            self._or_high = context["or_primary_high"]
+            self._or_low = context["or_primary_low"]
+        return self._or_high, self._or_low
+    
+    def _check_or_ready(self, context: Dict) -> bool:
+        """Return cached OR readiness, falling back to the context flag.
+        
+        Callers that don't drive ``on_or_finalized`` still work: the first
+        finalized context latches the flag for the rest of the session.
+        """
+        if not self._or_ready and context.get("or_primary_finalized", False):
+            self.on_or_finalized(
+                context.get("or_primary_high"),
+                context.get("or_primary_low"),
+            )
+        return self._or_ready
     
     @abstractmethod
     def is_eligible(self, context: Dict) -> bool:
@@ -48,6 +48,16 @@ class ORBRefinedPlaybook(Playbook):
         >>> signals = playbook.generate_signals(context)
     """
     
+    __slots__ = (
+        "base_buffer",
+        "vol_alpha",
+        "rotation_penalty",
+        "min_buffer",
+        "max_buffer",
+        "require_retest",
+        "phase2_trigger_r",
+    )
+    
     def __init__(self, name: str = "PB1_ORB_Refined", config: Optional[Dict] = None) -> None:
         """Initialize ORB Refined playbook.
         
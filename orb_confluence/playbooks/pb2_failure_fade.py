@@ -8,11 +8,19 @@ Logic:
 5. Time stop if no progress
 """
 
-from typing import Dict, List, Optional
+from itertools import product
+from math import fabs
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+import pandas as pd
 from loguru import logger
 
+from .bar_features import BarFeatures, compute_bar_features
 from .base import (
+    DIR_LONG,
+    DIR_SHORT,
+    DIRECTION_NAMES,
     Playbook,
     CandidateSignal,
     ExitMode,
@@ -21,6 +29,100 @@ from .base import (
 )
 
 
+FadeHit = Tuple[int, float, float, float]
+
+# Max |close - entry| / entry for a detected failure to produce a signal
+ENTRY_PROXIMITY_PCT = 0.002
+
+
+def _stack_sessions(
+    bars_by_session: Sequence[Union[pd.DataFrame, np.ndarray]],
+    columns: Sequence[str],
+    defaults: Optional[Dict[str, float]] = None,
+) -> Dict[str, np.ndarray]:
+    """Stack per-session bar columns into NaN-padded (S, B) arrays.
+    
+    Args:
+        bars_by_session: One DataFrame or structured array (e.g. a
+            memory-mapped SessionArrayCache entry) per session
+        columns: Columns to stack
+        defaults: Fill values for columns missing from a session
+        
+    Returns:
+        Dictionary of column -> (n_sessions, max_bars) float array
+    """
+    defaults = defaults or {}
+    n_sessions = len(bars_by_session)
+    n_bars = max((len(bars) for bars in bars_by_session), default=0)
+    
+    stacked = {}
+    for col in columns:
+        arr = np.full((n_sessions, n_bars), np.nan)
+        for i, bars in enumerate(bars_by_session):
+            names = bars.dtype.names if isinstance(bars, np.ndarray) else bars.columns
+            if col in names:
+                arr[i, :len(bars)] = np.asarray(bars[col], dtype=float)
+            else:
+                arr[i, :len(bars)] = defaults[col]
+        stacked[col] = arr
+    
+    return stacked
+
+
+def _make_fade_step(
+    wick_ratio_min: float,
+    volume_fade_threshold: float,
+    reenter_mid: bool,
+) -> Callable[[float, float, float, float, float, float, float], Optional[FadeHit]]:
+    """Build a failure-detection step with config baked in as closure constants.
+    
+    The returned function takes ``(bar_open, bar_high, bar_low, bar_close,
+    or_high, or_low, volume_ratio)`` and returns ``(direction, entry_price,
+    failure_extreme, wick_ratio)`` (direction as DIR_LONG/DIR_SHORT) when a
+    wick-only failure with fading volume is detected, else None.
+    
+    Args:
+        wick_ratio_min: Min wick/body ratio
+        volume_fade_threshold: Max volume ratio for a fade
+        reenter_mid: Enter at OR mid vs rejection level
+        
+    Returns:
+        Step function
+    """
+    def step(
+        bar_open: float,
+        bar_high: float,
+        bar_low: float,
+        bar_close: float,
+        or_high: float,
+        or_low: float,
+        volume_ratio: float,
+    ) -> Optional[FadeHit]:
+        # Upside failure: high > OR high, but close < OR high
+        if bar_high > or_high and bar_close < or_high:
+            body_size = fabs(bar_close - bar_open)
+            upper_wick = bar_high - max(bar_close, bar_open)
+            wick_ratio = upper_wick / body_size if body_size > 0 else 1.0  # All wick
+            
+            if wick_ratio >= wick_ratio_min and volume_ratio < volume_fade_threshold:
+                entry_price = (or_high + or_low) / 2.0 if reenter_mid else or_high
+                return DIR_SHORT, entry_price, bar_high, wick_ratio
+        
+        # Downside failure: low < OR low, but close > OR low
+        elif bar_low < or_low and bar_close > or_low:
+            body_size = fabs(bar_close - bar_open)
+            lower_wick = min(bar_close, bar_open) - bar_low
+            wick_ratio = lower_wick / body_size if body_size > 0 else 1.0
+            
+            if wick_ratio >= wick_ratio_min and volume_ratio < volume_fade_threshold:
+                entry_price = (or_high + or_low) / 2.0 if reenter_mid else or_low
+                return DIR_LONG, entry_price, bar_low, wick_ratio
+        
+        return None
+    
+    return step
+
+
 class FailureFadePlaybook(Playbook):
     """OR Failure Fade playbook.
     
@@ -39,6 +141,18 @@ class FailureFadePlaybook(Playbook):
         ... })
     """
     
+    __slots__ = (
+        "wick_ratio_min",
+        "volume_fade_threshold",
+        "reenter_mid",
+        "time_stop_minutes",
+        "failed_breakout_high",
+        "failed_breakout_low",
+        "failure_detected",
+        "_step",
+        "_exit_desc",
+    )
+    
     def __init__(self, name: str = "PB2_Failure_Fade", config: Optional[Dict] = None) -> None:
         """Initialize Failure Fade playbook."""
         super().__init__(name, config)
@@ -52,6 +166,19 @@ class FailureFadePlaybook(Playbook):
         self.failed_breakout_high: Optional[float] = None
         self.failed_breakout_low: Optional[float] = None
         self.failure_detected = False
+        
+        # Detection step specialized on the (run-constant) config above
+        self._step = _make_fade_step(
+            self.wick_ratio_min,
+            self.volume_fade_threshold,
+            self.reenter_mid,
+        )
+        
+        # Shared exit descriptor: single target with time stop
+        self._exit_desc = ExitModeDescriptor(
+            mode=ExitMode.SINGLE_TARGET,
+            time_limit_minutes=self.time_stop_minutes,
+        )
     
     def is_eligible(self, context: Dict) -> bool:
         """Check eligibility for failure fade.
@@ -66,18 +193,7 @@ class FailureFadePlaybook(Playbook):
         Returns:
             True if eligible
         """
-        if not self.enabled:
-            return False
-        
-        # Must have finalized OR
-        if not context.get("or_primary_finalized", False):
-            return False
-        
-        # Only take one failure trade per session
-        if self.failure_detected:
-            return False
-        
-        return True
+        return self.enabled and self._check_or_ready(context) and not self.failure_detected
     
     def generate_signals(self, context: Dict) -> List[CandidateSignal]:
         """Generate failure fade signals.
@@ -95,98 +211,60 @@ class FailureFadePlaybook(Playbook):
         """
         signals = []
         
+        if not self.is_eligible(context):
+            return signals
+        
         # Extract context
         current_bar = context.get("current_bar")
         if current_bar is None:
             return signals
         
-        or_high = context["or_primary_high"]
-        or_low = context["or_primary_low"]
-        or_mid = (or_high + or_low) / 2.0
-        
-        bar_high = current_bar["high"]
-        bar_low = current_bar["low"]
+        or_high, or_low = self._cached_or_levels(context)
         bar_close = current_bar["close"]
-        bar_open = current_bar["open"]
+        volume_ratio = context.get("volume_ratio", 1.0)
         
-        # Detect wick-only failure
-        # Upside failure: high > OR high, but close < OR high
-        if bar_high > or_high and bar_close < or_high:
-            body_size = abs(bar_close - bar_open)
-            upper_wick = bar_high - max(bar_close, bar_open)
-            
-            if body_size > 0:
-                wick_ratio = upper_wick / body_size
-            else:
-                wick_ratio = 1.0  # All wick
-            
-            # Check wick ratio
-            if wick_ratio >= self.wick_ratio_min:
-                # Check volume fade
-                volume_ratio = context.get("volume_ratio", 1.0)
-                if volume_ratio < self.volume_fade_threshold:
-                    # Failure detected - short signal
-                    self.failed_breakout_high = bar_high
-                    self.failure_detected = True
-                    
-                    # Entry price
-                    if self.reenter_mid:
-                        entry_price = or_mid
-                    else:
-                        entry_price = or_high  # At rejection level
-                    
-                    # Only signal if price near entry
-                    if abs(bar_close - entry_price) / entry_price < 0.002:  # Within 0.2%
-                        signal = self._create_fade_signal(
-                            direction="short",
-                            entry_price=entry_price,
-                            or_high=or_high,
-                            or_low=or_low,
-                            failure_extreme=bar_high,
-                            context=context,
-                        )
-                        signals.append(signal)
-                        logger.info(f"Failure fade SHORT detected: wick {wick_ratio:.2f}, vol {volume_ratio:.2f}")
+        hit = self._step(
+            current_bar["open"],
+            current_bar["high"],
+            current_bar["low"],
+            bar_close,
+            or_high,
+            or_low,
+            volume_ratio,
+        )
+        if hit is None:
+            return signals
         
-        # Downside failure: low < OR low, but close > OR low
-        elif bar_low < or_low and bar_close > or_low:
-            body_size = abs(bar_close - bar_open)
-            lower_wick = min(bar_close, bar_open) - bar_low
-            
-            if body_size > 0:
-                wick_ratio = lower_wick / body_size
-            else:
-                wick_ratio = 1.0
-            
-            if wick_ratio >= self.wick_ratio_min:
-                volume_ratio = context.get("volume_ratio", 1.0)
-                if volume_ratio < self.volume_fade_threshold:
-                    # Failure detected - long signal
-                    self.failed_breakout_low = bar_low
-                    self.failure_detected = True
-                    
-                    if self.reenter_mid:
-                        entry_price = or_mid
-                    else:
-                        entry_price = or_low
-                    
-                    if abs(bar_close - entry_price) / entry_price < 0.002:
-                        signal = self._create_fade_signal(
-                            direction="long",
-                            entry_price=entry_price,
-                            or_high=or_high,
-                            or_low=or_low,
-                            failure_extreme=bar_low,
-                            context=context,
-                        )
-                        signals.append(signal)
-                        logger.info(f"Failure fade LONG detected: wick {wick_ratio:.2f}, vol {volume_ratio:.2f}")
+        direction, entry_price, failure_extreme, wick_ratio = hit
+        
+        # Failure detected
+        if direction == DIR_SHORT:
+            self.failed_breakout_high = failure_extreme
+        else:
+            self.failed_breakout_low = failure_extreme
+        self.failure_detected = True
+        
+        # Only signal if price near entry
+        if fabs(bar_close - entry_price) / entry_price < ENTRY_PROXIMITY_PCT:
+            signal = self._create_fade_signal(
+                direction=direction,
+                entry_price=entry_price,
+                or_high=or_high,
+                or_low=or_low,
+                failure_extreme=failure_extreme,
+                context=context,
+            )
+            signals.append(signal)
+            logger.info(
+                "Failure fade {} detected: wick {:.2f}, vol {:.2f}",
+                DIRECTION_NAMES[direction].upper(), wick_ratio, volume_ratio,
+            )
         
         return signals
     
     def _create_fade_signal(
         self,
-        direction: str,
+        direction: int,
         entry_price: float,
         or_high: float,
         or_low: float,
@@ -196,7 +274,7 @@ class FailureFadePlaybook(Playbook):
         """Create failure fade signal.
         
         Args:
-            direction: 'long' or 'short'
+            direction: DIR_LONG or DIR_SHORT
             entry_price: Entry price
             or_high: OR high
             or_low: OR low
@@ -208,12 +286,9 @@ class FailureFadePlaybook(Playbook):
         """
         # Stop just outside failure extreme
         buffer = context.get("atr_14", 1.0) * 0.1  # Small buffer
-        if direction == "long":
-            initial_stop = failure_extreme - buffer
-        else:  # short
-            initial_stop = failure_extreme + buffer
-        
-        phase1_distance = abs(entry_price - initial_stop)
+        # Stop sits beyond the failure extreme, so the signed distance is positive
+        initial_stop = failure_extreme - direction * buffer
+        phase1_distance = direction * (entry_price - initial_stop)
         
         # Build metadata
         metadata = SignalMetadata(
@@ -229,22 +304,16 @@ class FailureFadePlaybook(Playbook):
             p_extension=context.get("p_extension"),
         )
         
-        # Exit mode: Single target with time stop
-        exit_mode = ExitModeDescriptor(
-            mode=ExitMode.SINGLE_TARGET,
-            time_limit_minutes=self.time_stop_minutes,
-        )
-        
         signal = CandidateSignal(
             playbook_name=self.name,
-            direction=direction,
+            direction=DIRECTION_NAMES[direction],
             entry_price=entry_price,
             trigger_price=entry_price,
             buffer_used=0.0,
             initial_stop=initial_stop,
             phase1_stop_distance=phase1_distance,
             structural_anchor=failure_extreme,
-            exit_mode=exit_mode,
+            exit_mode=self._exit_desc,
             metadata=metadata,
             timestamp=context["timestamp"],
             priority=1.2,  # Higher priority than basic ORB
@@ -261,14 +330,118 @@ class FailureFadePlaybook(Playbook):
         Returns:
             ExitModeDescriptor
         """
-        return ExitModeDescriptor(
-            mode=ExitMode.SINGLE_TARGET,
-            time_limit_minutes=self.time_stop_minutes,
-        )
+        return self._exit_desc
     
     def reset_session(self):
         """Reset per-session state."""
         self.failed_breakout_high = None
         self.failed_breakout_low = None
         self.failure_detected = False
-
+        self._or_ready = False
+        self._or_high = None
+        self._or_low = None
+    
+    @classmethod
+    def sweep(
+        cls,
+        bars_by_session: Sequence[Union[pd.DataFrame, np.ndarray]],
+        or_levels: Sequence[Tuple[float, float]],
+        param_grid: Dict[str, Sequence[float]],
+        reenter_mid: bool = True,
+        features: Optional[BarFeatures] = None,
+    ) -> pd.DataFrame:
+        """Evaluate failure detection for a parameter grid across many sessions.
+        
+        Equivalent to replaying ``generate_signals`` bar by bar for every
+        (params, session) pair, but broadcasts the threshold tests over a
+        (params, sessions, bars) tensor in one NumPy pass. Sessions of
+        different lengths are NaN-padded (padded bars never trigger).
+        
+        Args:
+            bars_by_session: Post-OR bars per session with open/high/low/close
+                and optional volume_ratio (defaults to 1.0, as in context), as
+                DataFrames or structured arrays such as memory-mapped
+                SessionArrayCache entries
+            or_levels: (or_high, or_low) per session
+            param_grid: Lists for ``wick_ratio_min`` and/or
+                ``volume_fade_threshold`` (missing keys use the defaults)
+            reenter_mid: Enter at OR mid vs rejection level
+            features: Precomputed (S, B) bar features shared with other
+                playbooks (computed here if omitted)
+            
+        Returns:
+            DataFrame with one row per (params, session): the parameters,
+            session index, first failure bar index (-1 if none), direction
+            (int8 DIR_LONG/DIR_SHORT, 0 if none),
+            entry price, failure extreme, wick ratio and whether a signal
+            fires (close within entry proximity)
+            
+        Example:
+            >>> results = FailureFadePlaybook.sweep(
+            ...     sessions, or_levels,
+            ...     {"wick_ratio_min": [0.4, 0.55, 0.7],
+            ...      "volume_fade_threshold": [0.7, 0.8, 0.9]},
+            ... )
+        """
+        wick_values = param_grid.get("wick_ratio_min", [0.55])
+        vol_values = param_grid.get("volume_fade_threshold", [0.8])
+        combos = np.array(list(product(wick_values, vol_values)), dtype=float)
+        wick_p = combos[:, 0, None, None]  # (P, 1, 1)
+        vol_p = combos[:, 1, None, None]
+        
+        data = _stack_sessions(
+            bars_by_session,
+            ["open", "high", "low", "close", "volume_ratio"],
+            defaults={"volume_ratio": 1.0},
+        )
+        bar_open, bar_high = data["open"], data["high"]
+        bar_low, bar_close = data["low"], data["close"]
+        
+        levels = np.asarray(or_levels, dtype=float).reshape(-1, 2)
+        or_high = levels[:, 0, None]  # (S, 1)
+        or_low = levels[:, 1, None]
+        
+        # Per-bar features, shared across all parameter combos: (S, B)
+        if features is None:
+            features = compute_bar_features(bar_open, bar_high, bar_low, bar_close, or_high, or_low)
+        up = (bar_high > or_high) & (features.dist_to_or_high < 0)
+        down = ~up & (bar_low < or_low) & (features.dist_to_or_low < 0)
+        wick_ratio = np.where(up, features.wick_up_ratio, features.wick_dn_ratio)
+        
+        # Threshold tests broadcast over params: (P, S, B)
+        hits = (
+            (up | down)
+            & (wick_ratio >= wick_p)
+            & (data["volume_ratio"] < vol_p)
+        )
+        has_hit = hits.any(axis=2)
+        first = np.where(has_hit, hits.argmax(axis=2), -1)  # (P, S)
+        
+        # Gather the first failure bar per (params, session)
+        p_idx, s_idx = np.indices(first.shape)
+        bar_idx = np.maximum(first, 0)
+        is_up = up[s_idx, bar_idx]
+        sess_high = levels[s_idx, 0]
+        sess_low = levels[s_idx, 1]
+        if reenter_mid:
+            entry = (sess_high + sess_low) / 2.0
+        else:
+            entry = np.where(is_up, sess_high, sess_low)
+        close_at = bar_close[s_idx, bar_idx]
+        extreme = np.where(is_up, bar_high[s_idx, bar_idx], bar_low[s_idx, bar_idx])
+        with np.errstate(invalid="ignore"):
+            fires = has_hit & (np.abs(close_at - entry) / entry < ENTRY_PROXIMITY_PCT)
+        
+        return pd.DataFrame({
+            "wick_ratio_min": combos[p_idx, 0].ravel(),
+            "volume_fade_threshold": combos[p_idx, 1].ravel(),
+            "session": s_idx.ravel(),
+            "bar_index": first.ravel(),
+            "direction": np.where(
+                has_hit, np.where(is_up, DIR_SHORT, DIR_LONG), 0
+            ).astype(np.int8).ravel(),
+            "entry_price": np.where(has_hit, entry, np.nan).ravel(),
+            "failure_extreme": np.where(has_hit, extreme, np.nan).ravel(),
+            "wick_ratio": np.where(has_hit, wick_ratio[s_idx, bar_idx], np.nan).ravel(),
+            "signal": fires.ravel(),
+        })
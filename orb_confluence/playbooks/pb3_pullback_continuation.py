@@ -10,9 +10,14 @@ Logic:
 
 from typing import Dict, List, Optional
 
+import numpy as np
 from loguru import logger
 
+from .bar_features import BarFeatures
 from .base import (
+    DIR_LONG,
+    DIR_SHORT,
+    DIRECTION_NAMES,
     Playbook,
     CandidateSignal,
     ExitMode,
@@ -41,6 +46,25 @@ class PullbackContinuationPlaybook(Playbook):
         ... })
     """
     
+    __slots__ = (
+        "impulse_threshold_r",
+        "impulse_time_bars",
+        "flag_min_bars",
+        "flag_max_bars",
+        "flag_retrace_min",
+        "flag_retrace_max",
+        "impulse_detected",
+        "impulse_direction",
+        "impulse_high",
+        "impulse_low",
+        "impulse_range",
+        "impulse_bar_count",
+        "flag_bar_count",
+        "flag_high",
+        "flag_low",
+        "_exit_desc",
+    )
+    
     def __init__(
         self,
         name: str = "PB3_Pullback_Continuation",
@@ -58,13 +82,17 @@ class PullbackContinuationPlaybook(Playbook):
         
         # State tracking
         self.impulse_detected = False
-        self.impulse_direction: Optional[str] = None
+        self.impulse_direction: Optional[int] = None  # DIR_LONG / DIR_SHORT
         self.impulse_high: Optional[float] = None
         self.impulse_low: Optional[float] = None
+        self.impulse_range = 0.0  # Impulse extension beyond OR (set on detection)
         self.impulse_bar_count = 0
         self.flag_bar_count = 0
         self.flag_high: Optional[float] = None
         self.flag_low: Optional[float] = None
+        
+        # Shared exit descriptor: trail pivots (no early partial)
+        self._exit_desc = ExitModeDescriptor(mode=ExitMode.TRAIL_PIVOT)
     
     def is_eligible(self, context: Dict) -> bool:
         """Check eligibility for pullback continuation.
@@ -79,14 +107,7 @@ class PullbackContinuationPlaybook(Playbook):
         Returns:
             True if eligible
         """
-        if not self.enabled:
-            return False
-        
-        # Must have finalized OR
-        if not context.get("or_primary_finalized", False):
-            return False
-        
-        return True
+        return self.enabled and self._check_or_ready(context)
     
     def generate_signals(self, context: Dict) -> List[CandidateSignal]:
         """Generate pullback continuation signals.
@@ -104,14 +125,15 @@ class PullbackContinuationPlaybook(Playbook):
         """
         signals = []
         
+        if not self.is_eligible(context):
+            return signals
+        
         # Get bar data
         current_bar = context.get("current_bar")
         if current_bar is None:
             return signals
         
         current_price = current_bar["close"]
-        or_high = context["or_primary_high"]
-        or_low = context["or_primary_low"]
         
         # Step 1: Detect impulse if not already
         if not self.impulse_detected:
@@ -132,7 +154,10 @@ class PullbackContinuationPlaybook(Playbook):
             
             # Check if flag too long (momentum lost)
             if self.flag_bar_count > self.flag_max_bars:
-                logger.debug(f"Pullback continuation: flag too long ({self.flag_bar_count} bars), resetting")
+                logger.debug(
+                    "Pullback continuation: flag too long ({} bars), resetting",
+                    self.flag_bar_count,
+                )
                 self._reset_state()
                 return signals
             
@@ -141,17 +166,18 @@ class PullbackContinuationPlaybook(Playbook):
                 return signals
             
             # Step 3: Check for continuation breakout
-            if self.impulse_direction == "long":
+            if self.impulse_direction == DIR_LONG:
                 # Long continuation: break above flag high
                 if current_price > self.flag_high:
                     # Validate retrace
-                    impulse_range = self.impulse_high - or_high
                     flag_retrace = self.impulse_high - self.flag_low
-                    retrace_pct = flag_retrace / impulse_range if impulse_range > 0 else 0.0
+                    retrace_pct = (
+                        flag_retrace / self.impulse_range if self.impulse_range > 0 else 0.0
+                    )
                     
                     if self.flag_retrace_min <= retrace_pct <= self.flag_retrace_max:
                         signal = self._create_continuation_signal(
-                            direction="long",
+                            direction=DIR_LONG,
                             entry_price=current_price,
                             flag_high=self.flag_high,
                             flag_low=self.flag_low,
@@ -159,21 +185,22 @@ class PullbackContinuationPlaybook(Playbook):
                         )
                         signals.append(signal)
                         logger.info(
-                            f"Pullback continuation LONG: flag {self.flag_bar_count} bars, "
-                            f"retrace {retrace_pct:.0%}"
+                            "Pullback continuation LONG: flag {} bars, retrace {:.0%}",
+                            self.flag_bar_count, retrace_pct,
                         )
                         self._reset_state()
             
-            elif self.impulse_direction == "short":
+            elif self.impulse_direction == DIR_SHORT:
                 # Short continuation: break below flag low
                 if current_price < self.flag_low:
-                    impulse_range = or_low - self.impulse_low
                     flag_retrace = self.flag_high - self.impulse_low
-                    retrace_pct = flag_retrace / impulse_range if impulse_range > 0 else 0.0
+                    retrace_pct = (
+                        flag_retrace / self.impulse_range if self.impulse_range > 0 else 0.0
+                    )
                     
                     if self.flag_retrace_min <= retrace_pct <= self.flag_retrace_max:
                         signal = self._create_continuation_signal(
-                            direction="short",
+                            direction=DIR_SHORT,
                             entry_price=current_price,
                             flag_high=self.flag_high,
                             flag_low=self.flag_low,
@@ -181,8 +208,8 @@ class PullbackContinuationPlaybook(Playbook):
                         )
                         signals.append(signal)
                         logger.info(
-                            f"Pullback continuation SHORT: flag {self.flag_bar_count} bars, "
-                            f"retrace {retrace_pct:.0%}"
+                            "Pullback continuation SHORT: flag {} bars, retrace {:.0%}",
+                            self.flag_bar_count, retrace_pct,
                         )
                         self._reset_state()
         
@@ -203,8 +230,7 @@ class PullbackContinuationPlaybook(Playbook):
             return  # Too late for impulse
         
         # Check for strong move
-        or_high = context["or_primary_high"]
-        or_low = context["or_primary_low"]
+        or_high, or_low = self._cached_or_levels(context)
         atr_14 = context.get("atr_14", 1.0)
         
         current_price = bar["close"]
@@ -216,10 +242,13 @@ class PullbackContinuationPlaybook(Playbook):
             
             if move_r >= self.impulse_threshold_r:
                 self.impulse_detected = True
-                self.impulse_direction = "long"
+                self.impulse_direction = DIR_LONG
                 self.impulse_high = bar["high"]
+                self.impulse_range = self.impulse_high - or_high
                 self.impulse_bar_count = bars_since_or
-                logger.debug(f"Impulse detected: LONG {move_r:.2f}R in {bars_since_or} bars")
+                logger.debug(
+                    "Impulse detected: LONG {:.2f}R in {} bars", move_r, bars_since_or
+                )
         
         # Short impulse: strong move below OR
         elif current_price < or_low:
@@ -228,14 +257,49 @@ class PullbackContinuationPlaybook(Playbook):
             
             if move_r >= self.impulse_threshold_r:
                 self.impulse_detected = True
-                self.impulse_direction = "short"
+                self.impulse_direction = DIR_SHORT
                 self.impulse_low = bar["low"]
+                self.impulse_range = or_low - self.impulse_low
                 self.impulse_bar_count = bars_since_or
-                logger.debug(f"Impulse detected: SHORT {move_r:.2f}R in {bars_since_or} bars")
+                logger.debug(
+                    "Impulse detected: SHORT {:.2f}R in {} bars", move_r, bars_since_or
+                )
+    
+    def detect_impulses(
+        self,
+        features: BarFeatures,
+        bars_since_or: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized impulse test over precomputed bar features.
+        
+        Batch equivalent of the per-bar impulse check: applies this
+        playbook's thresholds to shared BarFeatures columns without
+        touching OHLC again.
+        
+        Args:
+            features: Bar features from compute_bar_features (with ATR)
+            bars_since_or: Bars since OR end, broadcastable to features
+            
+        Returns:
+            int8 array: DIR_LONG / DIR_SHORT impulse direction, 0 none
+        """
+        in_window = np.asarray(bars_since_or) <= self.impulse_time_bars
+        long_hit = (
+            in_window
+            & (features.dist_to_or_high > 0)
+            & (features.move_r_long >= self.impulse_threshold_r)
+        )
+        short_hit = (
+            in_window
+            & ~(features.dist_to_or_high > 0)
+            & (features.dist_to_or_low > 0)
+            & (features.move_r_short >= self.impulse_threshold_r)
+        )
+        return long_hit.astype(np.int8) - short_hit.astype(np.int8)
     
     def _create_continuation_signal(
         self,
-        direction: str,
+        direction: int,
         entry_price: float,
         flag_high: float,
         flag_low: float,
@@ -244,7 +308,7 @@ class PullbackContinuationPlaybook(Playbook):
         """Create continuation signal.
         
         Args:
-            direction: 'long' or 'short'
+            direction: DIR_LONG or DIR_SHORT
             entry_price: Entry price
             flag_high: Flag high
             flag_low: Flag low
@@ -257,14 +321,15 @@ class PullbackContinuationPlaybook(Playbook):
         atr_14 = context.get("atr_14", 1.0)
         buffer = atr_14 * 0.15
         
-        if direction == "long":
+        # Entry breaks the flag, so the signed stop distance is positive
+        if direction == DIR_LONG:
             initial_stop = flag_low - buffer
             structural_anchor = flag_low
+            phase1_distance = entry_price - initial_stop
         else:  # short
             initial_stop = flag_high + buffer
             structural_anchor = flag_high
-        
-        phase1_distance = abs(entry_price - initial_stop)
+            phase1_distance = initial_stop - entry_price
         
         # Build metadata
         metadata = SignalMetadata(
@@ -280,21 +345,16 @@ class PullbackContinuationPlaybook(Playbook):
             p_extension=context.get("p_extension"),
         )
         
-        # Exit mode: Trail pivots (no early partial)
-        exit_mode = ExitModeDescriptor(
-            mode=ExitMode.TRAIL_PIVOT,
-        )
-        
         signal = CandidateSignal(
             playbook_name=self.name,
-            direction=direction,
+            direction=DIRECTION_NAMES[direction],
             entry_price=entry_price,
             trigger_price=entry_price,
             buffer_used=0.0,
             initial_stop=initial_stop,
             phase1_stop_distance=phase1_distance,
             structural_anchor=structural_anchor,
-            exit_mode=exit_mode,
+            exit_mode=self._exit_desc,
             metadata=metadata,
             timestamp=context["timestamp"],
             priority=1.1,  # Slightly higher than basic ORB
@@ -311,9 +371,7 @@ class PullbackContinuationPlaybook(Playbook):
         Returns:
             ExitModeDescriptor
         """
-        return ExitModeDescriptor(
-            mode=ExitMode.TRAIL_PIVOT,
-        )
+        return self._exit_desc
     
     def _reset_state(self):
         """Reset impulse/flag tracking."""
@@ -321,6 +379,7 @@ class PullbackContinuationPlaybook(Playbook):
         self.impulse_direction = None
         self.impulse_high = None
         self.impulse_low = None
+        self.impulse_range = 0.0
         self.impulse_bar_count = 0
         self.flag_bar_count = 0
         self.flag_high = None
@@ -329,4 +388,7 @@ class PullbackContinuationPlaybook(Playbook):
     def reset_session(self):
         """Reset for new session."""
         self._reset_state()
+        self._or_ready = False
+        self._or_high = None
+        self._or_low = None
 
@@ -4,13 +4,16 @@ Generates comprehensive backtest reports with charts and statistics.
 """
 
 import base64
+import textwrap
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import pandas as pd
-from jinja2 import Template
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache, select_autoescape
+from markupsafe import Markup, escape
 
 from .analytics.metrics import PerformanceMetrics, compute_metrics
 from .analytics.attribution import FactorAttribution, analyze_factor_attribution, analyze_score_buckets
@@ -19,6 +22,111 @@ from .config.schema import StrategyConfig
 from .strategy.trade_state import ActiveTrade
 
 
+# Report stylesheet (inlined by default, or written once as styles.css)
+REPORT_CSS = """body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    margin: 0;
+    padding: 20px;
+    background-color: #f5f5f5;
+}
+.container {
+    max-width: 1400px;
+    margin: 0 auto;
+    background-color: white;
+    padding: 30px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+h1 {
+    color: #2c3e50;
+    border-bottom: 3px solid #3498db;
+    padding-bottom: 10px;
+}
+h2 {
+    color: #34495e;
+    margin-top: 30px;
+    border-bottom: 2px solid #ecf0f1;
+    padding-bottom: 8px;
+}
+.metrics-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+    gap: 20px;
+    margin: 20px 0;
+}
+.metric-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 20px;
+    border-radius: 8px;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+}
+.metric-card.positive {
+    background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
+}
+.metric-card.negative {
+    background: linear-gradient(135deg, #ee0979 0%, #ff6a00 100%);
+}
+.metric-label {
+    font-size: 14px;
+    opacity: 0.9;
+    margin-bottom: 8px;
+}
+.metric-value {
+    font-size: 28px;
+    font-weight: bold;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 20px 0;
+}
+th, td {
+    padding: 12px;
+    text-align: left;
+    border-bottom: 1px solid #ddd;
+}
+th {
+    background-color: #3498db;
+    color: white;
+    font-weight: bold;
+}
+tr:hover {
+    background-color: #f5f5f5;
+}
+.chart-container {
+    margin: 20px 0;
+    text-align: center;
+}
+.chart-container img {
+    max-width: 100%;
+    height: auto;
+    border: 1px solid #ddd;
+    border-radius: 4px;
+}
+.config-section {
+    background-color: #ecf0f1;
+    padding: 15px;
+    border-radius: 4px;
+    font-family: monospace;
+    font-size: 13px;
+    margin: 20px 0;
+}
+.timestamp {
+    color: #7f8c8d;
+    font-size: 14px;
+    margin-top: 30px;
+    text-align: center;
+}
+.positive-value {
+    color: #27ae60;
+    font-weight: bold;
+}
+.negative-value {
+    color: #e74c3c;
+    font-weight: bold;
+}
+"""
+
 # HTML Template
 REPORT_TEMPLATE = """
 <!DOCTYPE html>
@@ -27,110 +135,8 @@ REPORT_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ORB Confluence Strategy - Backtest Report</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 30px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        h1 {
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-        }
-        h2 {
-            color: #34495e;
-            margin-top: 30px;
-            border-bottom: 2px solid #ecf0f1;
-            padding-bottom: 8px;
-        }
-        .metrics-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin: 20px 0;
-        }
-        .metric-card {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        .metric-card.positive {
-            background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-        }
-        .metric-card.negative {
-            background: linear-gradient(135deg, #ee0979 0%, #ff6a00 100%);
-        }
-        .metric-label {
-            font-size: 14px;
-            opacity: 0.9;
-            margin-bottom: 8px;
-        }
-        .metric-value {
-            font-size: 28px;
-            font-weight: bold;
-        }
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }
-        th, td {
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }
-        th {
-            background-color: #3498db;
-            color: white;
-            font-weight: bold;
-        }
-        tr:hover {
-            background-color: #f5f5f5;
-        }
-        .chart-container {
-            margin: 20px 0;
-            text-align: center;
-        }
-        .chart-container img {
-            max-width: 100%;
-            height: auto;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-        }
-        .config-section {
-            background-color: #ecf0f1;
-            padding: 15px;
-            border-radius: 4px;
-            font-family: monospace;
-            font-size: 13px;
-            margin: 20px 0;
-        }
-        .timestamp {
-            color: #7f8c8d;
-            font-size: 14px;
-            margin-top: 30px;
-            text-align: center;
-        }
-        .positive-value {
-            color: #27ae60;
-            font-weight: bold;
-        }
-        .negative-value {
-            color: #e74c3c;
-            font-weight: bold;
-        }
-    </style>
+    {% if stylesheet_href %}<link rel="stylesheet" href="{{ stylesheet_href }}">{% else %}<style>
+""" + textwrap.indent(REPORT_CSS, ' ' * 8) + """    </style>{% endif %}
 </head>
 <body>
     <div class="container">
@@ -261,24 +267,7 @@ REPORT_TEMPLATE = """
                 <th>Δ Win Rate</th>
                 <th>Δ Avg R</th>
             </tr>
-            {% for _, row in attribution.factor_presence.iterrows() %}
-            <tr>
-                <td><strong>{{ row.factor }}</strong></td>
-                <td>{{ row.present_count }}</td>
-                <td>{{ "%.1f"|format(row.present_win_rate * 100) }}%</td>
-                <td class="{% if row.present_avg_r > 0 %}positive-value{% else %}negative-value{% endif %}">
-                    {{ "%.2f"|format(row.present_avg_r) }}R
-                </td>
-                <td>{{ "%.1f"|format(row.absent_win_rate * 100) }}%</td>
-                <td>{{ "%.2f"|format(row.absent_avg_r) }}R</td>
-                <td class="{% if row.delta_win_rate > 0 %}positive-value{% else %}negative-value{% endif %}">
-                    {{ "%+.1f"|format(row.delta_win_rate * 100) }}%
-                </td>
-                <td class="{% if row.delta_avg_r > 0 %}positive-value{% else %}negative-value{% endif %}">
-                    {{ "%+.2f"|format(row.delta_avg_r) }}R
-                </td>
-            </tr>
-            {% endfor %}
+            {{ attribution_rows }}
         </table>
         {% endif %}
         
@@ -292,16 +281,7 @@ REPORT_TEMPLATE = """
                 <th>Win Rate</th>
                 <th>Average R</th>
             </tr>
-            {% for _, row in score_buckets.iterrows() %}
-            <tr>
-                <td><strong>{{ row.score_bucket }}</strong></td>
-                <td>{{ row['count'] }}</td>
-                <td>{{ "%.1f"|format(row.win_rate * 100) }}%</td>
-                <td class="{% if row.avg_r > 0 %}positive-value{% else %}negative-value{% endif %}">
-                    {{ "%.2f"|format(row.avg_r) }}R
-                </td>
-            </tr>
-            {% endfor %}
+            {{ score_bucket_rows }}
         </table>
         {% endif %}
         
@@ -310,14 +290,14 @@ REPORT_TEMPLATE = """
             {% if charts.r_distribution %}
             <h2>R Distribution</h2>
             <div class="chart-container">
-                <img src="data:image/png;base64,{{ charts.r_distribution }}" alt="R Distribution">
+                <img src="{{ charts.r_distribution }}" alt="R Distribution">
             </div>
             {% endif %}
             
             {% if charts.score_gradient %}
             <h2>Score Gradient</h2>
             <div class="chart-container">
-                <img src="data:image/png;base64,{{ charts.score_gradient }}" alt="Score Gradient">
+                <img src="{{ charts.score_gradient }}" alt="Score Gradient">
             </div>
             {% endif %}
         {% endif %}
@@ -325,8 +305,8 @@ REPORT_TEMPLATE = """
         <!-- Configuration -->
         <h2>Strategy Configuration</h2>
         <div class="config-section">
-            <strong>OR Length:</strong> {{ config.orb.or_length_minutes }} minutes<br>
-            <strong>Stop Mode:</strong> {{ config.trade.stop_mode }}<br>
+            <strong>OR Length:</strong> {{ config.orb.base_minutes }} minutes<br>
+            <strong>Stop Mode:</strong> {{ config.trade.stop_mode.value }}<br>
             <strong>Partials:</strong> {{ "Enabled" if config.trade.partials else "Disabled" }}<br>
             {% if config.trade.partials %}
             <strong>Target 1:</strong> {{ config.trade.t1_r }}R ({{ "%.0f"|format(config.trade.t1_pct * 100) }}%)<br>
@@ -347,13 +327,169 @@ REPORT_TEMPLATE = """
 </html>
 """
 
+# Compiled once per process; generate_report only renders. Loading through
+# a loader lets the bytecode cache (per-user temp dir) share compiled template
+# code across processes, e.g. parallel parameter sweeps.
+_ENV = Environment(
+    loader=DictLoader({'report.html': REPORT_TEMPLATE}),
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False,
+    cache_size=400,
+)
+_COMPILED_TEMPLATE = _ENV.get_template('report.html')
+
+
+class _TradeSet:
+    """Hashable view of a trade list, keyed on the fields the analytics read."""
+    
+    __slots__ = ("trades", "key")
+    
+    def __init__(self, trades: List[ActiveTrade]) -> None:
+        self.trades = trades
+        self.key = tuple(
+            (
+                t.trade_id,
+                t.entry_timestamp,
+                t.exit_timestamp,
+                t.realized_r,
+                t.signal.confluence_score if t.signal else None,
+                tuple(sorted(t.signal.factors.items())) if t.signal else None,
+            )
+            for t in trades
+        )
+    
+    def __hash__(self) -> int:
+        return hash(self.key)
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _TradeSet) and self.key == other.key
+
+
+# Report analytics, run once per distinct trade list. Reports rendered
+# repeatedly from the same trades (e.g. varying only output options in a
+# sweep) reuse the cached results, which must be treated as read-only.
+
+@lru_cache(maxsize=32)
+def _metrics_for(trade_set: _TradeSet) -> PerformanceMetrics:
+    return compute_metrics(trade_set.trades)
+
+
+@lru_cache(maxsize=32)
+def _attribution_for(trade_set: _TradeSet) -> Optional[FactorAttribution]:
+    trades = trade_set.trades
+    return analyze_factor_attribution(trades) if trades else None
+
+
+@lru_cache(maxsize=32)
+def _score_buckets_for(trade_set: _TradeSet) -> pd.DataFrame:
+    trades = trade_set.trades
+    return analyze_score_buckets(trades) if trades else pd.DataFrame()
+
+
+def _value_class(value: float) -> str:
+    """CSS class for a signed table value."""
+    return "positive-value" if value > 0 else "negative-value"
+
+
+def _render_attribution_rows(factor_presence: pd.DataFrame) -> Markup:
+    """Pre-render factor attribution table rows.
+    
+    Built with itertuples rather than a template loop over iterrows, which
+    allocates a Series per row.
+    """
+    if factor_presence.empty:
+        # No trade carried factors: the frame has no columns to select
+        return Markup('')
+    
+    columns = [
+        'factor', 'present_count', 'present_win_rate', 'present_avg_r',
+        'absent_win_rate', 'absent_avg_r', 'delta_win_rate', 'delta_avg_r',
+    ]
+    rows = []
+    for (factor, present_count, present_win_rate, present_avg_r,
+         absent_win_rate, absent_avg_r, delta_win_rate, delta_avg_r) in (
+            factor_presence[columns].itertuples(index=False, name=None)):
+        rows.append(f"""
+            <tr>
+                <td><strong>{escape(factor)}</strong></td>
+                <td>{present_count}</td>
+                <td>{present_win_rate * 100:.1f}%</td>
+                <td class="{_value_class(present_avg_r)}">
+                    {present_avg_r:.2f}R
+                </td>
+                <td>{absent_win_rate * 100:.1f}%</td>
+                <td>{absent_avg_r:.2f}R</td>
+                <td class="{_value_class(delta_win_rate)}">
+                    {delta_win_rate * 100:+.1f}%
+                </td>
+                <td class="{_value_class(delta_avg_r)}">
+                    {delta_avg_r:+.2f}R
+                </td>
+            </tr>
+            """)
+    return Markup("".join(rows))
+
+
+def _render_score_bucket_rows(score_buckets: pd.DataFrame) -> Markup:
+    """Pre-render confluence score bucket table rows."""
+    columns = ['score_bucket', 'count', 'win_rate', 'avg_r']
+    rows = []
+    for score_bucket, count, win_rate, avg_r in (
+            score_buckets[columns].itertuples(index=False, name=None)):
+        rows.append(f"""
+            <tr>
+                <td><strong>{escape(score_bucket)}</strong></td>
+                <td>{count}</td>
+                <td>{win_rate * 100:.1f}%</td>
+                <td class="{_value_class(avg_r)}">
+                    {avg_r:.2f}R
+                </td>
+            </tr>
+            """)
+    return Markup("".join(rows))
+
+
+def _chart_sources(charts: Dict[str, bytes], output_path: Optional[Path]) -> Dict[str, str]:
+    """Resolve chart PNGs to <img> sources.
+    
+    With an output file, charts are written next to it under charts/ and
+    referenced by relative path, keeping large payloads out of the template
+    render. Without one, they are inlined as base64 data URIs.
+    
+    Args:
+        charts: Chart name -> PNG bytes.
+        output_path: Report file path, or None for an in-memory report.
+        
+    Returns:
+        Chart name -> image source.
+    """
+    if output_path is None:
+        return {
+            name: 'data:image/png;base64,' + base64.b64encode(png).decode('ascii')
+            for name, png in charts.items()
+        }
+    
+    sources = {}
+    if charts:
+        charts_dir = output_path.parent / 'charts'
+        charts_dir.mkdir(parents=True, exist_ok=True)
+        for name, png in charts.items():
+            (charts_dir / f'{name}.png').write_bytes(png)
+            sources[name] = f'charts/{name}.png'
+    return sources
+
 
 def generate_report(
     result: BacktestResult,
     config: StrategyConfig,
     output_path: Optional[Path] = None,
     run_id: Optional[str] = None,
-) -> str:
+    return_html: bool = True,
+    include_attribution: bool = True,
+    include_score_buckets: bool = True,
+    external_css: bool = False,
+) -> Optional[str]:
     """Generate HTML backtest report.
     
     Args:
@@ -361,51 +497,90 @@ def generate_report(
         config: Strategy configuration.
         output_path: Optional output directory (default: ./runs/{run_id}/report.html).
         run_id: Optional run ID (default: timestamp).
+        return_html: If False, stream the report straight to disk without
+            building the HTML string (requires output_path or run_id).
+        include_attribution: Compute and show the factor attribution table.
+        include_score_buckets: Compute and show the score bucket table.
+        external_css: When writing to a file, link a styles.css shared by all
+            reports in the output directory instead of inlining the stylesheet.
         
     Returns:
-        HTML string.
+        HTML string, or None when return_html is False.
         
     Examples:
         >>> html = generate_report(result, config)
         >>> # Save to file
         >>> Path('report.html').write_text(html)
     """
-    # Compute metrics
-    metrics = compute_metrics(result.trades)
+    trade_set = _TradeSet(result.trades)
+    
+    # Compute metrics (memoized per trade list)
+    metrics = _metrics_for(trade_set)
     
     # Compute attribution
-    attribution = analyze_factor_attribution(result.trades) if result.trades else None
+    attribution = _attribution_for(trade_set) if include_attribution else None
     
     # Compute score buckets
-    score_buckets = analyze_score_buckets(result.trades) if result.trades else pd.DataFrame()
+    score_buckets = _score_buckets_for(trade_set) if include_score_buckets else pd.DataFrame()
     
     # OR statistics (placeholder - would need actual OR data)
     or_stats = None
     
-    # Generate charts (placeholder - would use plotly)
+    # Generate charts (placeholder - would use plotly): name -> PNG bytes
     charts = {}
     
-    # Render template
-    template = Template(REPORT_TEMPLATE)
-    html = template.render(
+    # One clock read so the run ID and report timestamp agree
+    now = datetime.now()
+    
+    # Resolve output file
+    if output_path is not None or run_id is not None:
+        if run_id is None:
+            run_id = now.strftime('%Y%m%d_%H%M%S')
+        
+        if output_path is None:
+            output_path = Path('runs') / run_id / 'report.html'
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Shared stylesheet, written once per output directory
+    stylesheet_href = None
+    if external_css and output_path is not None:
+        css_path = output_path.parent / 'styles.css'
+        if not css_path.exists() or css_path.read_text(encoding='utf-8') != REPORT_CSS:
+            css_path.write_text(REPORT_CSS, encoding='utf-8')
+        stylesheet_href = 'styles.css'
+    
+    context = dict(
         metrics=metrics,
         attribution=attribution,
         score_buckets=score_buckets,
+        attribution_rows=_render_attribution_rows(attribution.factor_presence) if attribution else '',
+        score_bucket_rows=(
+            _render_score_bucket_rows(score_buckets) if not score_buckets.empty else ''
+        ),
         or_stats=or_stats,
-        charts=charts,
+        charts=_chart_sources(charts, output_path),
         config=config,
-        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        stylesheet_href=stylesheet_href,
+        timestamp=now.strftime('%Y-%m-%d %H:%M:%S'),
     )
     
-    # Save to file if path provided
-    if output_path is not None or run_id is not None:
-        if run_id is None:
-            run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
+    if not return_html:
         if output_path is None:
-            output_path = Path('runs') / run_id / 'report.html'
+            raise ValueError("return_html=False requires output_path or run_id")
         
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(html)
+        # Stream rendered chunks to disk instead of materializing the page
+        stream = _COMPILED_TEMPLATE.stream(**context)
+        stream.enable_buffering(size=64)
+        with output_path.open('w', encoding='utf-8') as f:
+            stream.dump(f)
+        return None
+    
+    # Render template
+    html = _COMPILED_TEMPLATE.render(**context)
+    
+    # Save to file if path provided
+    if output_path is not None:
+        output_path.write_text(html, encoding='utf-8')
     
     return html
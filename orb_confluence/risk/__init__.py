@@ -13,11 +13,14 @@ from .two_phase_stop import (
     StopPhase,
     TwoPhaseStopManager,
     StopUpdate,
+    STOP_PARAMS_DTYPE,
+    simulate_stops,
 )
 from .salvage import (
     SalvageConditions,
     SalvageManager,
     SalvageEvent,
+    SalvagePool,
 )
 from .trailing_modes import (
     TrailUpdate,
@@ -37,9 +40,12 @@ __all__ = [
     "StopPhase",
     "TwoPhaseStopManager",
     "StopUpdate",
+    "STOP_PARAMS_DTYPE",
+    "simulate_stops",
     "SalvageConditions",
     "SalvageManager",
     "SalvageEvent",
+    "SalvagePool",
     "TrailUpdate",
     "VolatilityTrailingStop",
     "PivotTrailingStop",
@@ -9,12 +9,43 @@ Handles:
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 
+import numpy as np
 from loguru import logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Fallback: create dummy decorator
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
 
-@dataclass
+
+# Relative tolerance below which a running-sum slope numerator is rounding noise
+_SLOPE_EPS = 1e-12
+
+# Time-decay exit codes returned by the compiled scan
+_EXIT_NONE = 0
+_EXIT_MAX_BARS = 1
+_EXIT_SLOPE_DECAY = 2
+_EXIT_NO_PROGRESS = 3
+
+
+@lru_cache(maxsize=16)
+def _target_order(target_rs: Tuple[float, ...]) -> Tuple[int, ...]:
+    """Stable ascending-R ordering of a target ladder (as indices)."""
+    return tuple(sorted(range(len(target_rs)), key=target_rs.__getitem__))
+
+
+@dataclass(slots=True)
 class PartialTarget:
     """Partial profit target definition."""
     
@@ -31,7 +62,7 @@ class PartialTarget:
         return f"Target({self.target_r:.1f}R, {self.size_fraction:.0%}) [{status}]"
 
 
-@dataclass
+@dataclass(slots=True)
 class PartialFillEvent:
     """Partial fill execution event."""
     
@@ -90,14 +121,37 @@ class PartialExitManager:
         self.direction = direction.lower()
         self.entry_price = entry_price
         self.initial_risk = initial_risk
-        self.targets = sorted(targets, key=lambda t: t.target_r)
+        
+        # Direction as a sign so one comparison covers both sides:
+        # long hits when price <= high, short when -price <= -low
+        self._sign = 1 if self.direction == "long" else -1
+        
+        # Sort by target_r; the ordering is shared by every trade that uses
+        # the same R ladder
+        target_rs = tuple(t.target_r for t in targets)
+        order = _target_order(target_rs)
+        self.targets = [targets[i] for i in order]
+        self._target_rs = tuple(target_rs[i] for i in order)
         
         # Compute target prices
-        for target in self.targets:
-            if self.direction == "long":
-                target.price = entry_price + (target.target_r * initial_risk)
-            else:  # short
-                target.price = entry_price - (target.target_r * initial_risk)
+        self._prices = tuple(
+            entry_price + self._sign * (target_r * initial_risk)
+            for target_r in self._target_rs
+        )
+        self._signed_prices = tuple(self._sign * price for price in self._prices)
+        
+        # Column (SoA) copies of the target fields read every bar; the
+        # PartialTarget objects are only written when a target fills
+        self._size_fractions = tuple(t.size_fraction for t in self.targets)
+        self._hit = [t.hit for t in self.targets]
+        self._hit_count = sum(self._hit)
+        for target, price in zip(self.targets, self._prices):
+            target.price = price
+        
+        # Targets are sorted by target_r, so signed prices ascend and fills
+        # happen front to back; the cursor marks the first unhit target
+        self._next_unhit_idx = 0
+        self._advance_cursor()
         
         # Position tracking
         self.remaining_size = 1.0
@@ -122,62 +176,132 @@ class PartialExitManager:
         Returns:
             List of PartialFillEvent (can be empty)
         """
+        start = self._next_unhit_idx
+        if start >= len(self._signed_prices):
+            self.all_targets_hit = True
+            return []
+        
+        # Cheapest rejection: bar doesn't reach the nearest pending target
+        signed_extreme = bar_high if self._sign > 0 else -bar_low
+        signed_prices = self._signed_prices
+        if signed_prices[start] > signed_extreme:
+            return []
+        
         fills = []
+        hit_mask = self._hit
         
-        for i, target in enumerate(self.targets):
-            if target.hit:
-                continue
-            
+        for i in range(start, len(signed_prices)):
             # Check if target price touched
-            hit = False
-            if self.direction == "long":
-                hit = bar_high >= target.price
-                fill_price = target.price  # Assume filled at target
-            else:  # short
-                hit = bar_low <= target.price
-                fill_price = target.price
+            if not hit_mask[i] and signed_prices[i] <= signed_extreme:
+                # Assume filled at target
+                fills.append(self._fill_target(i, self._prices[i], timestamp))
+        
+        # Check if all targets hit
+        if fills and self._hit_count == len(hit_mask):
+            self.all_targets_hit = True
+        
+        return fills
+    
+    def check_targets_vectorized(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+    ) -> List[PartialFillEvent]:
+        """Check targets over a block of bars at once (backtest mode).
+        
+        Equivalent to calling check_targets bar by bar: each pending target
+        fills on the first bar whose high (long) / low (short) touches it,
+        in bar order then target order.
+        
+        Args:
+            highs: Bar highs
+            lows: Bar lows
+            timestamps: Bar timestamps (aligned with highs/lows)
             
-            if hit:
-                # Mark target as hit
-                target.hit = True
-                target.hit_timestamp = timestamp
-                target.hit_price = fill_price
-                
-                # Reduce position
-                self.remaining_size -= target.size_fraction
-                self.remaining_size = max(0.0, self.remaining_size)  # Clamp to 0
-                
-                # Create fill event
-                fill = PartialFillEvent(
-                    timestamp=timestamp,
-                    target_number=i + 1,
-                    target_r=target.target_r,
-                    size_fraction=target.size_fraction,
-                    exit_price=fill_price,
-                    remaining_size=self.remaining_size,
-                    realized_r=target.target_r,
-                )
-                
-                fills.append(fill)
-                self.partial_fills.append(fill)
-                
-                logger.info(f"Partial target hit: {fill}")
+        Returns:
+            List of PartialFillEvent (can be empty)
+        """
+        highs = np.asarray(highs, dtype=float)
+        lows = np.asarray(lows, dtype=float)
+        if len(highs) == 0:
+            return []
+        
+        pending = [i for i, hit in enumerate(self._hit) if not hit]
+        signed_prices = np.array([self._signed_prices[i] for i in pending], dtype=float)
+        
+        # First touch = first index where the running extreme reaches the price
+        # (fmax skips NaN bars, which never touch in the scalar check)
+        signed_extremes = highs if self._sign > 0 else -lows
+        first_hit = np.searchsorted(
+            np.fmax.accumulate(signed_extremes), signed_prices, side="left"
+        )
+        
+        fills = []
+        for k in np.lexsort((pending, first_hit)):
+            bar_idx = first_hit[k]
+            if bar_idx >= len(highs):
+                break
+            i = pending[k]
+            fills.append(self._fill_target(i, self._prices[i], timestamps[bar_idx]))
         
         # Check if all targets hit
-        if all(t.hit for t in self.targets):
+        if self._hit_count == len(self._hit):
             self.all_targets_hit = True
         
         return fills
     
+    def _fill_target(
+        self,
+        index: int,
+        fill_price: float,
+        timestamp: datetime,
+    ) -> PartialFillEvent:
+        """Mark a target filled, reduce position and record the fill event."""
+        # Mark target as hit
+        self._hit[index] = True
+        self._hit_count += 1
+        if index == self._next_unhit_idx:
+            self._advance_cursor()
+        target = self.targets[index]
+        target.hit = True
+        target.hit_timestamp = timestamp
+        target.hit_price = fill_price
+        
+        # Reduce position
+        size_fraction = self._size_fractions[index]
+        self.remaining_size -= size_fraction
+        self.remaining_size = max(0.0, self.remaining_size)  # Clamp to 0
+        
+        # Create fill event
+        target_r = self._target_rs[index]
+        fill = PartialFillEvent(
+            timestamp=timestamp,
+            target_number=index + 1,
+            target_r=target_r,
+            size_fraction=size_fraction,
+            exit_price=fill_price,
+            remaining_size=self.remaining_size,
+            realized_r=target_r,
+        )
+        self.partial_fills.append(fill)
+        
+        logger.info("Partial target hit: {}", fill)
+        return fill
+    
+    def _advance_cursor(self) -> None:
+        """Move the next-unhit cursor past filled targets."""
+        while self._next_unhit_idx < len(self._hit) and self._hit[self._next_unhit_idx]:
+            self._next_unhit_idx += 1
+    
     def get_next_target(self) -> Optional[PartialTarget]:
         """Get next unhit target.
         
         Returns:
             Next PartialTarget or None if all hit
         """
-        for target in self.targets:
-            if not target.hit:
-                return target
+        if self._next_unhit_idx < len(self.targets):
+            return self.targets[self._next_unhit_idx]
         return None
     
     def has_runner(self) -> bool:
@@ -209,6 +333,70 @@ class PartialExitManager:
         return 0.0
 
 
+@njit(cache=True)
+def _scan_time_decay(
+    mfe_r: np.ndarray,
+    has_max_bars: bool,
+    max_bars: int,
+    slope_window: int,
+    slope_threshold: float,
+    no_progress_bars: int,
+    no_progress_threshold: float,
+) -> Tuple[int, int, float]:
+    """Compiled TimeDecayExitManager.update loop over a full MFE path.
+    
+    Mirrors update() operation for operation (running sums, per-window
+    resync, zero-slope snap) so exits match the per-bar path exactly.
+    
+    Returns:
+        (bar index, exit code, triggering value); (-1, _EXIT_NONE, 0.0) if none
+    """
+    n = slope_window
+    sum_x = n * (n - 1) / 2
+    sum_x2 = (n - 1) * n * (2 * n - 1) / 6
+    sum_y = 0.0
+    sum_xy = 0.0
+    
+    for bars in range(1, len(mfe_r) + 1):
+        current = mfe_r[bars - 1]
+        
+        if bars > n:
+            if bars % n == 0:
+                sum_y = 0.0
+                sum_xy = 0.0
+                for i in range(n):
+                    y = mfe_r[bars - n + i]
+                    sum_y += y
+                    sum_xy += i * y
+            else:
+                dropped = mfe_r[bars - 1 - n]
+                sum_xy += (n - 1) * current - (sum_y - dropped)
+                sum_y += current - dropped
+        else:
+            sum_xy += (bars - 1) * current
+            sum_y += current
+        
+        if has_max_bars and bars >= max_bars:
+            return bars - 1, _EXIT_MAX_BARS, float(bars)
+        
+        if bars >= n:
+            numerator = n * sum_xy - sum_x * sum_y
+            denominator = n * sum_x2 - sum_x ** 2
+            if abs(numerator) <= _SLOPE_EPS * (n * abs(sum_xy) + sum_x * abs(sum_y)):
+                numerator = 0.0
+            if denominator > 0:
+                slope = numerator / denominator
+                if slope < slope_threshold:
+                    return bars - 1, _EXIT_SLOPE_DECAY, slope
+        
+        if bars >= no_progress_bars:
+            progress = current - mfe_r[bars - no_progress_bars]
+            if progress < no_progress_threshold:
+                return bars - 1, _EXIT_NO_PROGRESS, progress
+    
+    return -1, _EXIT_NONE, 0.0
+
+
 class TimeDecayExitManager:
     """Manages time-based exit conditions.
     
@@ -248,10 +436,37 @@ class TimeDecayExitManager:
         self.no_progress_bars = no_progress_bars
         self.no_progress_threshold = no_progress_threshold_r
         
+        # Slope regressors are x = 0..slope_window-1, so their sums are constant
+        n = slope_window
+        self._sum_x = n * (n - 1) / 2
+        self._sum_x2 = (n - 1) * n * (2 * n - 1) / 6
+        
         # State tracking
         self.bars_in_trade = 0
-        self.mfe_history: List[float] = []
         self.entry_timestamp: Optional[datetime] = None
+        
+        # Running sums of MFE (y) and x*y over the slope window
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+        
+        # MFE ring buffer: only the last max(slope_window, no_progress_bars) + 1
+        # bars are ever read, slot (bars_in_trade - 1) % size holds the newest
+        self._mfe_size = max(slope_window, no_progress_bars) + 1
+        self._mfe_buffer = [0.0] * self._mfe_size
+    
+    @property
+    def mfe_history(self) -> List[float]:
+        """Retained MFE history, oldest first (at most the buffer size)."""
+        size = self._mfe_size
+        count = min(self.bars_in_trade, size)
+        return [
+            self._mfe_buffer[i % size]
+            for i in range(self.bars_in_trade - count, self.bars_in_trade)
+        ]
+    
+    def _mfe_back(self, k: int) -> float:
+        """MFE recorded k bars before the newest one."""
+        return self._mfe_buffer[(self.bars_in_trade - 1 - k) % self._mfe_size]
     
     def update(
         self,
@@ -271,49 +486,93 @@ class TimeDecayExitManager:
             self.entry_timestamp = timestamp
         
         self.bars_in_trade += 1
-        self.mfe_history.append(current_mfe_r)
+        self._mfe_buffer[(self.bars_in_trade - 1) % self._mfe_size] = current_mfe_r
+        
+        # Slide the slope window in O(1): every retained bar's x shifts down by one
+        n = self.slope_window
+        if self.bars_in_trade > n:
+            if self.bars_in_trade % n == 0:
+                # Resync once per window so float drift cannot accumulate
+                window = [self._mfe_back(n - 1 - i) for i in range(n)]
+                self._sum_y = sum(window)
+                self._sum_xy = sum(i * y for i, y in enumerate(window))
+            else:
+                dropped = self._mfe_back(n)
+                self._sum_xy += (n - 1) * current_mfe_r - (self._sum_y - dropped)
+                self._sum_y += current_mfe_r - dropped
+        else:
+            self._sum_xy += (self.bars_in_trade - 1) * current_mfe_r
+            self._sum_y += current_mfe_r
         
         # Check max bars
         if self.max_bars is not None and self.bars_in_trade >= self.max_bars:
-            return f"MAX_BARS: {self.bars_in_trade} bars in trade"
+            return self._exit_reason(_EXIT_MAX_BARS, self.bars_in_trade)
         
         # Check slope decay (need sufficient history)
-        if len(self.mfe_history) >= self.slope_window:
-            recent_mfe = self.mfe_history[-self.slope_window:]
-            
-            # Compute linear slope
-            x = list(range(len(recent_mfe)))
-            y = recent_mfe
-            
-            # Simple linear regression
-            n = len(x)
-            x_mean = sum(x) / n
-            y_mean = sum(y) / n
+        if self.bars_in_trade >= n:
+            # Least-squares slope from running sums
+            numerator = n * self._sum_xy - self._sum_x * self._sum_y
+            denominator = n * self._sum_x2 - self._sum_x ** 2
             
-            numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-            denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
+            # Flat windows have zero slope; don't let rounding flip the sign
+            if abs(numerator) <= _SLOPE_EPS * (n * abs(self._sum_xy) + self._sum_x * abs(self._sum_y)):
+                numerator = 0.0
             
             if denominator > 0:
                 slope = numerator / denominator
                 
                 if slope < self.slope_threshold:
-                    return f"SLOPE_DECAY: slope={slope:.4f} < {self.slope_threshold}"
+                    return self._exit_reason(_EXIT_SLOPE_DECAY, slope)
         
         # Check no progress
         if self.bars_in_trade >= self.no_progress_bars:
-            recent_progress = current_mfe_r - self.mfe_history[-self.no_progress_bars]
+            recent_progress = current_mfe_r - self._mfe_back(self.no_progress_bars - 1)
             
             if recent_progress < self.no_progress_threshold:
-                return (
-                    f"NO_PROGRESS: {recent_progress:.2f}R in "
-                    f"{self.no_progress_bars} bars"
-                )
+                return self._exit_reason(_EXIT_NO_PROGRESS, recent_progress)
         
         return None
     
+    def first_exit(self, mfe_r: np.ndarray) -> Tuple[int, Optional[str]]:
+        """Find the first time-decay exit along a whole MFE path (backtest mode).
+        
+        Equivalent to calling update() once per bar on a fresh trade with this
+        manager's settings, but runs as a single compiled loop. Does not touch
+        the live update() state.
+        
+        Args:
+            mfe_r: MFE in R for each bar of the trade
+            
+        Returns:
+            (bar index, exit reason), or (-1, None) if no exit triggers
+        """
+        bar_idx, code, value = _scan_time_decay(
+            np.ascontiguousarray(mfe_r, dtype=np.float64),
+            self.max_bars is not None,
+            self.max_bars or 0,
+            self.slope_window,
+            float(self.slope_threshold),
+            self.no_progress_bars,
+            float(self.no_progress_threshold),
+        )
+        if code == _EXIT_NONE:
+            return -1, None
+        if code == _EXIT_MAX_BARS:
+            value = int(value)
+        return int(bar_idx), self._exit_reason(code, value)
+    
+    def _exit_reason(self, code: int, value: float) -> str:
+        """Format the exit reason for an exit code and its triggering value."""
+        if code == _EXIT_MAX_BARS:
+            return f"MAX_BARS: {value} bars in trade"
+        if code == _EXIT_SLOPE_DECAY:
+            return f"SLOPE_DECAY: slope={value:.4f} < {self.slope_threshold}"
+        return f"NO_PROGRESS: {value:.2f}R in {self.no_progress_bars} bars"
+    
     def reset(self):
         """Reset for new trade."""
         self.bars_in_trade = 0
-        self.mfe_history = []
         self.entry_timestamp = None
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
 
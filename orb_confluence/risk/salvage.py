@@ -12,12 +12,26 @@ Salvage conditions:
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence, Tuple, Union
 
+import numpy as np
 from loguru import logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Fallback: create dummy decorator
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class SalvageConditions:
     """Salvage trigger conditions configuration."""
     
@@ -39,7 +53,7 @@ class SalvageConditions:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SalvageEvent:
     """Salvage exit event record."""
     
@@ -60,6 +74,130 @@ class SalvageEvent:
         )
 
 
+def _scan_salvage_vectorized(
+    mfe_r: np.ndarray,
+    current_r: np.ndarray,
+    trigger_mfe_r: float,
+    retrace_threshold: float,
+    confirmation_bars: int,
+    recovery_threshold: float,
+    has_max_bars_from_peak: bool,
+    max_bars_from_peak: int,
+) -> Tuple[int, float, float, int]:
+    """NumPy equivalent of _scan_salvage (used when numba is unavailable)."""
+    n = len(mfe_r)
+    if n == 0:
+        return -1, 0.0, 0.0, 0
+    idx = np.arange(n)
+    
+    # Peak MFE before/after each bar (starts at 0; fmax skips NaN like `>`)
+    running_peak = np.fmax.accumulate(np.concatenate(([0.0], mfe_r)))
+    new_peak = mfe_r > running_peak[:-1]
+    peak = running_peak[1:]
+    
+    # Bars since the last new peak (counts from the first bar if none yet)
+    last_peak_idx = np.maximum.accumulate(np.where(new_peak, idx, -1))
+    bars_since_peak = idx - last_peak_idx
+    
+    # Armed from the first new peak at/above the trigger (sticky); once
+    # armed, peak > 0 so the ratios below are well defined
+    arming = new_peak & (mfe_r >= trigger_mfe_r)
+    if not arming.any():
+        return -1, 0.0, 0.0, 0
+    armed = idx >= np.argmax(arming)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        retrace_ratio = (peak - current_r) / peak
+        recovery_r = current_r / peak
+    
+    retracing = (
+        armed
+        & ~(recovery_r >= recovery_threshold)
+        & (retrace_ratio >= retrace_threshold)
+    )
+    
+    # Consecutive retracing bars; the count restarts at every new peak
+    breaks = np.where(~retracing, idx, np.where(new_peak, idx - 1, -1))
+    confirmed = idx - np.maximum.accumulate(breaks)
+    
+    fires = retracing & (confirmed >= confirmation_bars)
+    if has_max_bars_from_peak:
+        fires &= bars_since_peak <= max_bars_from_peak
+    if not fires.any():
+        return -1, 0.0, 0.0, 0
+    
+    t = int(np.argmax(fires))
+    return t, peak[t], retrace_ratio[t], int(bars_since_peak[t])
+
+
+@njit(cache=True)
+def _scan_salvage(
+    mfe_r: np.ndarray,
+    current_r: np.ndarray,
+    trigger_mfe_r: float,
+    retrace_threshold: float,
+    confirmation_bars: int,
+    recovery_threshold: float,
+    has_max_bars_from_peak: bool,
+    max_bars_from_peak: int,
+) -> Tuple[int, float, float, int]:
+    """Compiled SalvageManager.evaluate loop over a full trade path.
+    
+    Mirrors evaluate() branch for branch on a fresh manager and stops at the
+    first trigger.
+    
+    Returns:
+        (bar index, peak MFE, retrace ratio, bars since peak); index -1 if none
+    """
+    peak_mfe_r = 0.0
+    bars_since_peak = 0
+    armed = False
+    confirmed = 0
+    
+    for t in range(len(mfe_r)):
+        mfe = mfe_r[t]
+        r = current_r[t]
+        
+        if mfe > peak_mfe_r:
+            peak_mfe_r = mfe
+            bars_since_peak = 0
+            confirmed = 0
+            if mfe >= trigger_mfe_r:
+                armed = True
+        else:
+            bars_since_peak += 1
+        
+        if not armed:
+            continue
+        
+        if peak_mfe_r > 0:
+            retrace_ratio = (peak_mfe_r - r) / peak_mfe_r
+            recovery_r = r / peak_mfe_r
+        else:
+            retrace_ratio = 0.0
+            recovery_r = 0.0
+        
+        if recovery_r >= recovery_threshold:
+            confirmed = 0
+            continue
+        
+        if retrace_ratio >= retrace_threshold:
+            confirmed += 1
+        else:
+            confirmed = 0
+            continue
+        
+        if confirmed < confirmation_bars:
+            continue
+        
+        if has_max_bars_from_peak and bars_since_peak > max_bars_from_peak:
+            continue
+        
+        return t, peak_mfe_r, retrace_ratio, bars_since_peak
+    
+    return -1, 0.0, 0.0, 0
+
+
 class SalvageManager:
     """Manages salvage abort detection for a trade.
     
@@ -86,6 +224,23 @@ class SalvageManager:
         ...     print(f"Salvage exit: {salvage_event}")
     """
     
+    __slots__ = (
+        "direction",
+        "entry_price",
+        "initial_risk",
+        "initial_stop",
+        "conditions",
+        "peak_mfe_r",
+        "peak_price",
+        "peak_timestamp",
+        "bars_since_peak",
+        "salvage_armed",
+        "salvage_triggered",
+        "retrace_confirmation_bars",
+        "total_salvage_checks",
+        "false_salvage_count",
+    )
+    
     def __init__(
         self,
         direction: str,
@@ -141,6 +296,7 @@ class SalvageManager:
             SalvageEvent if salvage triggered, None otherwise
         """
         self.total_salvage_checks += 1
+        conditions = self.conditions
         
         # Update peak tracking
         if current_mfe_r > self.peak_mfe_r:
@@ -151,9 +307,9 @@ class SalvageManager:
             self.retrace_confirmation_bars = 0
             
             # Check if salvage should be armed
-            if current_mfe_r >= self.conditions.trigger_mfe_r:
+            if current_mfe_r >= conditions.trigger_mfe_r:
                 self.salvage_armed = True
-                logger.debug(f"Salvage armed at {current_mfe_r:.2f}R MFE")
+                logger.debug("Salvage armed at {:.2f}R MFE", current_mfe_r)
         else:
             self.bars_since_peak += 1
         
@@ -166,42 +322,43 @@ class SalvageManager:
             return None
         
         # Compute retrace from peak
-        if self.peak_mfe_r > 0:
-            retrace_ratio = (self.peak_mfe_r - current_r) / self.peak_mfe_r
+        peak_mfe_r = self.peak_mfe_r
+        if peak_mfe_r > 0:
+            retrace_ratio = (peak_mfe_r - current_r) / peak_mfe_r
+            recovery_r = current_r / peak_mfe_r
         else:
             retrace_ratio = 0.0
+            recovery_r = 0.0
         
         # Check recovery (if price recovers, reset confirmation)
-        recovery_r = current_r / self.peak_mfe_r if self.peak_mfe_r > 0 else 0.0
-        if recovery_r >= self.conditions.recovery_threshold:
+        if recovery_r >= conditions.recovery_threshold:
             if self.retrace_confirmation_bars > 0:
                 logger.debug(
-                    f"Trade recovered to {recovery_r:.0%} of peak MFE, "
-                    f"resetting salvage confirmation"
+                    "Trade recovered to {:.0%} of peak MFE, resetting salvage confirmation",
+                    recovery_r,
                 )
                 self.false_salvage_count += 1
             self.retrace_confirmation_bars = 0
             return None
         
         # Check retrace threshold
-        if retrace_ratio >= self.conditions.retrace_threshold:
+        if retrace_ratio >= conditions.retrace_threshold:
             self.retrace_confirmation_bars += 1
         else:
             self.retrace_confirmation_bars = 0
             return None
         
         # Check confirmation bars
-        if self.retrace_confirmation_bars < self.conditions.confirmation_bars:
+        if self.retrace_confirmation_bars < conditions.confirmation_bars:
             return None
         
         # Optional max bars check
-        if (
-            self.conditions.max_bars_from_peak is not None
-            and self.bars_since_peak > self.conditions.max_bars_from_peak
-        ):
+        max_bars_from_peak = conditions.max_bars_from_peak
+        if max_bars_from_peak is not None and self.bars_since_peak > max_bars_from_peak:
             logger.debug(
-                f"Salvage disabled: {self.bars_since_peak} bars from peak "
-                f"exceeds max {self.conditions.max_bars_from_peak}"
+                "Salvage disabled: {} bars from peak exceeds max {}",
+                self.bars_since_peak,
+                max_bars_from_peak,
             )
             return None
         
@@ -230,6 +387,58 @@ class SalvageManager:
         
         return event
     
+    @classmethod
+    def evaluate_series(
+        cls,
+        mfe_r: np.ndarray,
+        current_r: np.ndarray,
+        prices: np.ndarray,
+        timestamps: Sequence[datetime],
+        conditions: Optional[SalvageConditions] = None,
+    ) -> Optional[SalvageEvent]:
+        """Find the first salvage exit along a whole trade path (backtest mode).
+        
+        Equivalent to calling evaluate() bar by bar on a fresh manager, but
+        runs as one compiled loop (or NumPy array scans without numba).
+        
+        Args:
+            mfe_r: MFE in R-multiples per bar
+            current_r: Current R (P&L) per bar
+            prices: Market price per bar
+            timestamps: Bar timestamps
+            conditions: Salvage conditions (defaults if None)
+            
+        Returns:
+            SalvageEvent for the first triggering bar, None if salvage never fires
+        """
+        conditions = conditions or SalvageConditions()
+        mfe_r = np.ascontiguousarray(mfe_r, dtype=np.float64)
+        current_r = np.ascontiguousarray(current_r, dtype=np.float64)
+        
+        scan = _scan_salvage if NUMBA_AVAILABLE else _scan_salvage_vectorized
+        t, peak, retrace_ratio, bars_since_peak = scan(
+            mfe_r,
+            current_r,
+            float(conditions.trigger_mfe_r),
+            float(conditions.retrace_threshold),
+            int(conditions.confirmation_bars),
+            float(conditions.recovery_threshold),
+            conditions.max_bars_from_peak is not None,
+            conditions.max_bars_from_peak or 0,
+        )
+        if t < 0:
+            return None
+        
+        return SalvageEvent(
+            timestamp=timestamps[t],
+            mfe_r=float(peak),
+            current_r=float(current_r[t]),
+            retrace_ratio=float(retrace_ratio),
+            bars_since_peak=int(bars_since_peak),
+            exit_price=float(prices[t]),
+            salvage_benefit_r=float(current_r[t]) - (-1.0),
+        )
+    
     @property
     def is_armed(self) -> bool:
         """Check if salvage is armed (MFE exceeded trigger)."""
@@ -256,6 +465,129 @@ class SalvageManager:
         }
 
 
+class SalvagePool:
+    """Salvage state for many concurrent trades, evaluated one bar at a time.
+    
+    Structure-of-arrays counterpart of SalvageManager for backtests that run
+    many trade hypotheses side by side (e.g. a salvage parameter grid). Each
+    slot follows exactly the same state machine as SalvageManager.evaluate,
+    but all slots advance together with one set of array operations per bar.
+    
+    Example:
+        >>> grid = [SalvageConditions(confirmation_bars=k) for k in (2, 4, 6)]
+        >>> pool = SalvagePool(len(grid), grid)
+        >>> 
+        >>> # On each bar
+        >>> fired = pool.evaluate_all(current_mfe_r, current_r)
+    """
+    
+    __slots__ = (
+        "n",
+        "trigger_mfe_r",
+        "retrace_threshold",
+        "confirmation_bars",
+        "recovery_threshold",
+        "max_bars_from_peak",
+        "peak_mfe_r",
+        "bars_since_peak",
+        "retrace_confirmation_bars",
+        "salvage_armed",
+        "salvage_triggered",
+        "false_salvage_count",
+    )
+    
+    def __init__(
+        self,
+        n: int,
+        conditions: Optional[Union[SalvageConditions, Sequence[SalvageConditions]]] = None,
+    ) -> None:
+        """Initialize salvage pool.
+        
+        Args:
+            n: Number of trade slots
+            conditions: Shared salvage conditions, or one per slot (defaults if None)
+        """
+        if conditions is None or isinstance(conditions, SalvageConditions):
+            conditions = [conditions or SalvageConditions()] * n
+        if len(conditions) != n:
+            raise ValueError(f"Expected {n} salvage conditions, got {len(conditions)}")
+        
+        self.n = n
+        
+        # Per-slot thresholds (no max bars limit -> inf)
+        self.trigger_mfe_r = np.array([c.trigger_mfe_r for c in conditions], dtype=np.float64)
+        self.retrace_threshold = np.array([c.retrace_threshold for c in conditions], dtype=np.float64)
+        self.confirmation_bars = np.array([c.confirmation_bars for c in conditions], dtype=np.int64)
+        self.recovery_threshold = np.array([c.recovery_threshold for c in conditions], dtype=np.float64)
+        self.max_bars_from_peak = np.array(
+            [np.inf if c.max_bars_from_peak is None else c.max_bars_from_peak for c in conditions],
+            dtype=np.float64,
+        )
+        
+        # State
+        self.peak_mfe_r = np.zeros(n, dtype=np.float64)
+        self.bars_since_peak = np.zeros(n, dtype=np.int64)
+        self.retrace_confirmation_bars = np.zeros(n, dtype=np.int64)
+        self.salvage_armed = np.zeros(n, dtype=bool)
+        self.salvage_triggered = np.zeros(n, dtype=bool)
+        self.false_salvage_count = np.zeros(n, dtype=np.int64)
+    
+    def evaluate_all(
+        self,
+        current_mfe_r: np.ndarray,
+        current_r: np.ndarray,
+    ) -> np.ndarray:
+        """Evaluate salvage conditions for every slot on one bar.
+        
+        Args:
+            current_mfe_r: Current MFE in R-multiples per slot
+            current_r: Current R (P&L) per slot
+            
+        Returns:
+            Boolean mask of slots whose salvage triggered on this bar
+        """
+        current_mfe_r = np.asarray(current_mfe_r, dtype=np.float64)
+        current_r = np.asarray(current_r, dtype=np.float64)
+        
+        # Update peak tracking
+        new_peak = current_mfe_r > self.peak_mfe_r
+        np.copyto(self.peak_mfe_r, current_mfe_r, where=new_peak)
+        self.bars_since_peak += 1
+        self.bars_since_peak[new_peak] = 0
+        self.retrace_confirmation_bars[new_peak] = 0
+        self.salvage_armed |= new_peak & (current_mfe_r >= self.trigger_mfe_r)
+        
+        # Only armed, not yet triggered slots are evaluated
+        active = self.salvage_armed & ~self.salvage_triggered
+        
+        # Compute retrace from peak and recovery
+        peak = self.peak_mfe_r
+        has_peak = peak > 0
+        retrace_ratio = np.zeros(self.n)
+        np.divide(peak - current_r, peak, out=retrace_ratio, where=has_peak)
+        recovery_r = np.zeros(self.n)
+        np.divide(current_r, peak, out=recovery_r, where=has_peak)
+        
+        # Recovery resets confirmation
+        recovered = active & (recovery_r >= self.recovery_threshold)
+        self.false_salvage_count += recovered & (self.retrace_confirmation_bars > 0)
+        
+        # Retrace extends confirmation, anything else resets it
+        retracing = active & ~recovered & (retrace_ratio >= self.retrace_threshold)
+        self.retrace_confirmation_bars[active & ~retracing] = 0
+        self.retrace_confirmation_bars += retracing
+        
+        # Confirmation bars and optional max bars from peak
+        fired = (
+            retracing
+            & (self.retrace_confirmation_bars >= self.confirmation_bars)
+            & (self.bars_since_peak <= self.max_bars_from_peak)
+        )
+        self.salvage_triggered |= fired
+        
+        return fired
+
+
 def analyze_salvage_performance(
     trades_with_salvage: list,
     trades_without_salvage: list,
@@ -279,20 +611,27 @@ def analyze_salvage_performance(
             "salvage_rate": 0.0,
         }
     
+    # Gather benefit and exit R in a single pass over the events
+    n_salvage = len(trades_with_salvage)
+    values = np.fromiter(
+        ((t.salvage_benefit_r, t.current_r) for t in trades_with_salvage),
+        dtype=[("benefit_r", "f8"), ("current_r", "f8")],
+        count=n_salvage,
+    )
+    
     # Compute benefits
-    benefits = [t.salvage_benefit_r for t in trades_with_salvage]
-    avg_benefit = sum(benefits) / len(benefits)
-    total_benefit = sum(benefits)
+    total_benefit = float(values["benefit_r"].sum())
+    avg_benefit = total_benefit / n_salvage
     
     # Compare average loss
-    avg_loss_with = sum(t.current_r for t in trades_with_salvage) / len(trades_with_salvage)
+    avg_loss_with = float(values["current_r"].mean())
     avg_loss_without = -1.0  # Would have been full -1R
     
     return {
-        "n_salvage_trades": len(trades_with_salvage),
+        "n_salvage_trades": n_salvage,
         "avg_benefit_r": avg_benefit,
         "total_benefit_r": total_benefit,
-        "salvage_rate": len(trades_with_salvage) / (len(trades_with_salvage) + len(trades_without_salvage)),
+        "salvage_rate": n_salvage / (n_salvage + len(trades_without_salvage)),
         "avg_loss_with_salvage": avg_loss_with,
         "avg_loss_without_salvage": avg_loss_without,
         "loss_reduction": avg_loss_without - avg_loss_with,
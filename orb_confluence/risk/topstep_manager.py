@@ -15,11 +15,50 @@ Additional Conservative Limits:
 This is CRITICAL for live trading - violating TopStep rules = account failure.
 """
 
+import struct
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, date
-from typing import Optional, Dict, Any
+from enum import IntEnum
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
 from loguru import logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Fallback: create dummy decorator
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+
+
+class HaltReason(IntEnum):
+    """Reason trading was halted."""
+    NONE = 0
+    DAILY = 1
+    WEEKLY = 2
+    DRAWDOWN = 3
+
+
+# Reported name per HaltReason (RiskStatus.reason / get_statistics)
+_HALT_REASON_NAMES = (None, "DAILY_LOSS_LIMIT", "WEEKLY_LOSS_LIMIT", "TRAILING_DRAWDOWN_LIMIT")
+
+# Journaled breach: day ordinal, HaltReason, daily PNL, weekly PNL, trailing DD
+_BREACH_RECORD = struct.Struct('<iBddd')
+
+# Circuit breaker: size multiplier per worst limit-usage band (percent)
+_CB_THRESHOLDS = (50.0, 70.0, 85.0)
+_CB_MULTIPLIERS = (1.0, 0.75, 0.50, 0.25)
+
 
 @dataclass
 class RiskLimits:
@@ -37,10 +76,13 @@ class RiskLimits:
     max_position_size: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskStatus:
     """Current risk status.
     
+    TopStepRiskManager.check_risk_status() returns one reused instance per
+    manager, updated in place on every call.
+    
     Attributes:
         can_trade: Whether trading is allowed
         reason: Reason for current status
@@ -63,6 +105,46 @@ class RiskStatus:
     drawdown_limit_pct: float
 
 
+@njit(cache=True)
+def _resolve_halts(
+    new_day: np.ndarray,
+    new_week: np.ndarray,
+    daily_breach: np.ndarray,
+    weekly_breach: np.ndarray,
+    drawdown_breach: np.ndarray,
+) -> np.ndarray:
+    """Compiled halt state machine over precomputed per-trade breach flags.
+    
+    Mirrors update_equity: daily halts clear on a new day, weekly halts on a
+    new week, drawdown halts never; a new halt is only recorded while trading
+    is not already halted (daily, then weekly, then drawdown).
+    
+    Returns:
+        HaltReason code in effect after each trade
+    """
+    n = len(new_day)
+    reasons = np.zeros(n, dtype=np.int8)
+    reason = HaltReason.NONE
+    
+    for i in range(n):
+        if new_day[i] and reason == HaltReason.DAILY:
+            reason = HaltReason.NONE
+        if new_week[i] and reason == HaltReason.WEEKLY:
+            reason = HaltReason.NONE
+        
+        if reason == HaltReason.NONE:
+            if daily_breach[i]:
+                reason = HaltReason.DAILY
+            elif weekly_breach[i]:
+                reason = HaltReason.WEEKLY
+            elif drawdown_breach[i]:
+                reason = HaltReason.DRAWDOWN
+        
+        reasons[i] = reason
+    
+    return reasons
+
+
 class TopStepRiskManager:
     """TopStep-compliant risk management system.
     
@@ -93,6 +175,7 @@ class TopStepRiskManager:
         is_combine: bool = True,
         enable_weekly_limit: bool = True,
         enable_position_scaling: bool = True,
+        log_breaches: bool = True,
     ):
         """Initialize TopStep risk manager.
         
@@ -101,6 +184,9 @@ class TopStepRiskManager:
             is_combine: True for Combine (stricter limits), False for funded
             enable_weekly_limit: Enable weekly loss limit (conservative)
             enable_position_scaling: Enable automatic position size scaling
+            log_breaches: Log each limit breach as it happens; when False
+                (e.g. parameter sweeps) breaches are only journaled until
+                flush_breaches() is called
         """
         # TopStep limits (Combine phase)
         if is_combine:
@@ -119,9 +205,16 @@ class TopStepRiskManager:
                 max_position_size=5,
             )
         
+        # Hot-path copies of the limits (self.limits stays the public view)
+        self._daily_lim = self.limits.daily_loss_limit
+        self._weekly_lim = self.limits.weekly_loss_limit
+        self._dd_lim = self.limits.trailing_drawdown_limit
+        self._max_size = self.limits.max_position_size
+        
         # Configuration
         self.enable_weekly_limit = enable_weekly_limit
         self.enable_position_scaling = enable_position_scaling
+        self.log_breaches = log_breaches
         
         # Account tracking
         self.account_size = account_size
@@ -131,6 +224,7 @@ class TopStepRiskManager:
         # Daily tracking
         self.daily_pnl = 0.0
         self.current_date = None
+        self._current_date_ord = 0  # current_date.toordinal() (0 = no date yet)
         
         # Weekly tracking
         self.weekly_pnl = 0.0
@@ -139,7 +233,24 @@ class TopStepRiskManager:
         
         # Status
         self.trading_halted = False
-        self.halt_reason = None
+        self.halt_reason = HaltReason.NONE
+        
+        # Reused by check_risk_status() so per-bar polling does not allocate
+        self._status_buf = RiskStatus(
+            can_trade=True,
+            reason="Within limits",
+            daily_pnl=0.0,
+            weekly_pnl=0.0,
+            trailing_drawdown=0.0,
+            max_position_size=self.limits.max_position_size,
+            daily_limit_pct=0.0,
+            weekly_limit_pct=0.0,
+            drawdown_limit_pct=0.0,
+        )
+        self._status_key = None  # State the buffer was last computed from
+        
+        # Packed record per limit breach (see flush_breaches)
+        self._breach_log = deque(maxlen=1024)
         
         logger.info(
             f"TopStepRiskManager initialized: "
@@ -160,16 +271,19 @@ class TopStepRiskManager:
         if timestamp is None:
             timestamp = datetime.now()
         
-        trade_date = timestamp.date()
-        
-        # Check if new day
-        if self.current_date is None or trade_date != self.current_date:
+        # Check if new day (the ISO week can only change with the date, so
+        # the week number is only derived on the first trade of each day).
+        # Comparing day ordinals avoids building a date object per trade.
+        trade_ord = timestamp.toordinal()
+        if trade_ord != self._current_date_ord:
+            self._current_date_ord = trade_ord
+            trade_date = timestamp.date()
             self._reset_daily(trade_date)
-        
-        # Check if new week
-        week_number = timestamp.isocalendar()[1]
-        if self.current_week is None or week_number != self.current_week:
-            self._reset_weekly(week_number, self.current_equity)
+            
+            # Check if new week
+            week_number = trade_date.isocalendar()[1]
+            if week_number != self.current_week:
+                self._reset_weekly(week_number, self.current_equity)
         
         # Update metrics
         self.daily_pnl += trade_pnl
@@ -181,8 +295,62 @@ class TopStepRiskManager:
             self.peak_equity = self.current_equity
             logger.debug(f"New peak equity: ${self.peak_equity:,.2f}")
         
-        # Check limits
-        self._check_limits()
+        # Check limits (PNL and peak above are still tracked while halted)
+        if not self.trading_halted:
+            self._check_limits()
+    
+    def replay_series(
+        self,
+        pnls: np.ndarray,
+        timestamps: Sequence[datetime],
+    ) -> np.ndarray:
+        """Replay a sequence of trade PNLs on a fresh account (backtest mode).
+        
+        Equivalent to calling update_equity() trade by trade on a new manager
+        with this manager's limits: daily/weekly PNL and trailing drawdown are
+        computed as array scans and only the halt state machine runs as a
+        compiled loop. This manager's own state is not modified.
+        
+        Args:
+            pnls: Profit/loss per trade
+            timestamps: Trade timestamps (for date/week tracking)
+            
+        Returns:
+            Boolean mask, True where trading is halted after the trade
+        """
+        pnls = np.ascontiguousarray(pnls, dtype=np.float64)
+        n = len(pnls)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps))
+        days = index.normalize()
+        weeks = index.isocalendar()['week'].to_numpy()
+        
+        # Day and week boundaries (the week can only change with the date)
+        new_day = np.ones(n, dtype=bool)
+        new_day[1:] = days[1:] != days[:-1]
+        new_week = np.ones(n, dtype=bool)
+        new_week[1:] = new_day[1:] & (weeks[1:] != weeks[:-1])
+        
+        # Per-period running PNL, accumulated in trade order like update_equity
+        pnl_series = pd.Series(pnls)
+        daily_pnl = pnl_series.groupby(np.cumsum(new_day)).cumsum().to_numpy()
+        weekly_pnl = pnl_series.groupby(np.cumsum(new_week)).cumsum().to_numpy()
+        
+        equity = np.cumsum(np.concatenate(([float(self.account_size)], pnls)))
+        peak = np.maximum.accumulate(equity)
+        trailing_dd = equity[1:] - peak[1:]
+        
+        daily_breach = daily_pnl <= self.limits.daily_loss_limit
+        if self.enable_weekly_limit:
+            weekly_breach = weekly_pnl <= self.limits.weekly_loss_limit
+        else:
+            weekly_breach = np.zeros(n, dtype=bool)
+        drawdown_breach = trailing_dd <= self.limits.trailing_drawdown_limit
+        
+        reasons = _resolve_halts(new_day, new_week, daily_breach, weekly_breach, drawdown_breach)
+        return reasons != HaltReason.NONE
     
     def _reset_daily(self, new_date: date):
         """Reset daily metrics for new trading day.
@@ -201,9 +369,9 @@ class TopStepRiskManager:
         self.current_date = new_date
         
         # Reset halt if it was daily-related
-        if self.trading_halted and self.halt_reason == "DAILY_LOSS_LIMIT":
+        if self.trading_halted and self.halt_reason == HaltReason.DAILY:
             self.trading_halted = False
-            self.halt_reason = None
+            self.halt_reason = HaltReason.NONE
             logger.info("Trading resumed for new day")
     
     def _reset_weekly(self, new_week: int, current_equity: float):
@@ -225,61 +393,177 @@ class TopStepRiskManager:
         self.current_week = new_week
         
         # Reset halt if it was weekly-related
-        if self.trading_halted and self.halt_reason == "WEEKLY_LOSS_LIMIT":
+        if self.trading_halted and self.halt_reason == HaltReason.WEEKLY:
             self.trading_halted = False
-            self.halt_reason = None
+            self.halt_reason = HaltReason.NONE
             logger.info("Trading resumed for new week")
     
     def _check_limits(self):
-        """Check if any risk limits have been breached."""
+        """Check if any risk limits have been breached.
+        
+        Only the first breach is recorded, so nothing is checked once
+        trading is already halted.
+        """
+        if self.trading_halted:
+            return
+        
         # Check daily loss limit
-        if self.daily_pnl <= self.limits.daily_loss_limit:
-            if not self.trading_halted:
-                self.trading_halted = True
-                self.halt_reason = "DAILY_LOSS_LIMIT"
+        if self.daily_pnl <= self._daily_lim:
+            self._record_breach(HaltReason.DAILY)
+            if self.log_breaches:
                 logger.error(
                     f"🛑 DAILY LOSS LIMIT BREACHED: "
-                    f"${self.daily_pnl:,.2f} <= ${self.limits.daily_loss_limit:,.2f}"
+                    f"${self.daily_pnl:,.2f} <= ${self._daily_lim:,.2f}"
                 )
+            return
         
         # Check weekly loss limit
-        if self.enable_weekly_limit and self.weekly_pnl <= self.limits.weekly_loss_limit:
-            if not self.trading_halted:
-                self.trading_halted = True
-                self.halt_reason = "WEEKLY_LOSS_LIMIT"
+        if self.enable_weekly_limit and self.weekly_pnl <= self._weekly_lim:
+            self._record_breach(HaltReason.WEEKLY)
+            if self.log_breaches:
                 logger.error(
                     f"🛑 WEEKLY LOSS LIMIT BREACHED: "
-                    f"${self.weekly_pnl:,.2f} <= ${self.limits.weekly_loss_limit:,.2f}"
+                    f"${self.weekly_pnl:,.2f} <= ${self._weekly_lim:,.2f}"
                 )
+            return
         
         # Check trailing drawdown
         trailing_dd = self.current_equity - self.peak_equity
-        if trailing_dd <= self.limits.trailing_drawdown_limit:
-            if not self.trading_halted:
-                self.trading_halted = True
-                self.halt_reason = "TRAILING_DRAWDOWN_LIMIT"
+        if trailing_dd <= self._dd_lim:
+            self._record_breach(HaltReason.DRAWDOWN)
+            if self.log_breaches:
                 logger.error(
                     f"🛑 TRAILING DRAWDOWN LIMIT BREACHED: "
-                    f"${trailing_dd:,.2f} <= ${self.limits.trailing_drawdown_limit:,.2f}"
+                    f"${trailing_dd:,.2f} <= ${self._dd_lim:,.2f}"
                 )
     
+    def _record_breach(self, reason: HaltReason):
+        """Halt trading and journal the breach as a packed binary record.
+        
+        Args:
+            reason: Limit that was breached
+        """
+        self.trading_halted = True
+        self.halt_reason = reason
+        self._breach_log.append(_BREACH_RECORD.pack(
+            self._current_date_ord,
+            reason,
+            self.daily_pnl,
+            self.weekly_pnl,
+            self.current_equity - self.peak_equity,
+        ))
+    
+    def flush_breaches(self) -> List[Tuple[Optional[date], HaltReason, float, float, float]]:
+        """Decode and clear the journaled limit breaches.
+        
+        Breaches are logged here when log_breaches is off, so a sweep emits
+        them once at the end of the run instead of as they happen.
+        
+        Returns:
+            List of (date, reason, daily PNL, weekly PNL, trailing drawdown)
+        """
+        breaches = []
+        for record in self._breach_log:
+            day_ord, reason, daily_pnl, weekly_pnl, trailing_dd = _BREACH_RECORD.unpack(record)
+            breaches.append((
+                date.fromordinal(day_ord) if day_ord else None,
+                HaltReason(reason),
+                daily_pnl,
+                weekly_pnl,
+                trailing_dd,
+            ))
+        self._breach_log.clear()
+        
+        if not self.log_breaches:
+            for day, reason, daily_pnl, weekly_pnl, trailing_dd in breaches:
+                logger.error(
+                    f"🛑 {self.reason_name(reason)} BREACHED on {day}: "
+                    f"daily ${daily_pnl:,.2f}, weekly ${weekly_pnl:,.2f}, drawdown ${trailing_dd:,.2f}"
+                )
+        
+        return breaches
+    
+    def _compute_limit_pcts(self) -> Tuple[float, float, float, float]:
+        """Compute signed limit usage percentages.
+        
+        Returns:
+            (daily %, weekly %, drawdown %, trailing drawdown)
+        """
+        trailing_dd = self.current_equity - self.peak_equity
+        return (
+            self.daily_pnl / self._daily_lim * 100 if self._daily_lim else 0.0,
+            self.weekly_pnl / self._weekly_lim * 100 if self._weekly_lim else 0.0,
+            trailing_dd / self._dd_lim * 100 if self._dd_lim else 0.0,
+            trailing_dd,
+        )
+    
+    @staticmethod
+    def reason_name(reason: HaltReason) -> Optional[str]:
+        """Reported name of a halt reason.
+        
+        Args:
+            reason: Halt reason, e.g. from a journaled breach
+            
+        Returns:
+            Name such as 'DAILY_LOSS_LIMIT', or None for HaltReason.NONE
+        """
+        return _HALT_REASON_NAMES[reason]
+    
+    @property
+    def halt_reason_name(self) -> Optional[str]:
+        """Reported name of the current halt reason (None while trading)."""
+        return _HALT_REASON_NAMES[self.halt_reason]
+    
+    def check_can_trade_fast(self, base_size: Optional[int] = None) -> Tuple[bool, int]:
+        """Per-bar trading gate without building a RiskStatus.
+        
+        Skips the warning text and status bookkeeping of check_risk_status()
+        for callers that only need the trade/no-trade decision and size.
+        
+        Args:
+            base_size: Base position size (defaults to the max position size)
+            
+        Returns:
+            (can trade, adjusted position size)
+        """
+        if self.trading_halted:
+            return False, 0
+        
+        if base_size is None:
+            base_size = self._max_size
+        return True, self.get_position_size_limit(base_size)
+    
     def check_risk_status(self) -> RiskStatus:
         """Check current risk status.
         
+        The returned object is owned by the manager and overwritten by the
+        next call; copy it (e.g. dataclasses.replace) to keep a snapshot.
+        Repeated polls with no state change in between return it as is.
+        
         Returns:
             RiskStatus with current state and limits
         """
-        # Calculate percentages
-        daily_limit_pct = (self.daily_pnl / self.limits.daily_loss_limit * 100) if self.limits.daily_loss_limit != 0 else 0
-        weekly_limit_pct = (self.weekly_pnl / self.limits.weekly_loss_limit * 100) if self.limits.weekly_loss_limit != 0 else 0
+        key = (
+            self.daily_pnl,
+            self.weekly_pnl,
+            self.current_equity,
+            self.peak_equity,
+            self.trading_halted,
+            self.halt_reason,
+            self.enable_position_scaling,
+        )
+        if key == self._status_key:
+            return self._status_buf
+        self._status_key = key
         
-        trailing_dd = self.current_equity - self.peak_equity
-        drawdown_limit_pct = (trailing_dd / self.limits.trailing_drawdown_limit * 100) if self.limits.trailing_drawdown_limit != 0 else 0
+        # Calculate percentages
+        daily_limit_pct, weekly_limit_pct, drawdown_limit_pct, trailing_dd = self._compute_limit_pcts()
         
         # Determine status
         if self.trading_halted:
             can_trade = False
-            reason = f"Trading halted: {self.halt_reason}"
+            reason = f"Trading halted: {self.halt_reason_name}"
+            max_size = 0
         else:
             can_trade = True
             
@@ -292,21 +576,25 @@ class TopStepRiskManager:
                 reason = f"⚠️ Warning: {drawdown_limit_pct:.0f}% of drawdown limit used"
             else:
                 reason = "Within limits"
-        
-        # Get max position size
-        max_size = self.get_position_size_limit(self.limits.max_position_size)
-        
-        return RiskStatus(
-            can_trade=can_trade,
-            reason=reason,
-            daily_pnl=self.daily_pnl,
-            weekly_pnl=self.weekly_pnl,
-            trailing_drawdown=trailing_dd,
-            max_position_size=max_size,
-            daily_limit_pct=daily_limit_pct,
-            weekly_limit_pct=weekly_limit_pct,
-            drawdown_limit_pct=drawdown_limit_pct,
-        )
+            
+            # Get max position size from the percentages computed above
+            max_size = self._max_size
+            if self.enable_position_scaling:
+                worst_pct = max(abs(daily_limit_pct), abs(weekly_limit_pct), abs(drawdown_limit_pct))
+                max_size = self._scaled_position_size(max_size, worst_pct)
+        
+        status = self._status_buf
+        status.can_trade = can_trade
+        status.reason = reason
+        status.daily_pnl = self.daily_pnl
+        status.weekly_pnl = self.weekly_pnl
+        status.trailing_drawdown = trailing_dd
+        status.max_position_size = max_size
+        status.daily_limit_pct = daily_limit_pct
+        status.weekly_limit_pct = weekly_limit_pct
+        status.drawdown_limit_pct = drawdown_limit_pct
+        
+        return status
     
     def get_position_size_limit(self, base_size: int) -> int:
         """Get position size limit based on current risk status.
@@ -328,31 +616,31 @@ class TopStepRiskManager:
             return 0
         
         if not self.enable_position_scaling:
-            return min(base_size, self.limits.max_position_size)
+            return min(base_size, self._max_size)
         
         # Calculate worst percentage across all limits
-        daily_pct = abs(self.daily_pnl / self.limits.daily_loss_limit * 100) if self.limits.daily_loss_limit != 0 else 0
-        weekly_pct = abs(self.weekly_pnl / self.limits.weekly_loss_limit * 100) if self.limits.weekly_loss_limit != 0 else 0
-        
-        trailing_dd = self.current_equity - self.peak_equity
-        dd_pct = abs(trailing_dd / self.limits.trailing_drawdown_limit * 100) if self.limits.trailing_drawdown_limit != 0 else 0
+        daily_pct, weekly_pct, dd_pct, _ = self._compute_limit_pcts()
+        worst_pct = max(abs(daily_pct), abs(weekly_pct), abs(dd_pct))
         
-        worst_pct = max(daily_pct, weekly_pct, dd_pct)
+        return self._scaled_position_size(base_size, worst_pct)
+    
+    def _scaled_position_size(self, base_size: int, worst_pct: float) -> int:
+        """Apply the circuit breaker and max size limit to a base size.
         
+        Args:
+            base_size: Base position size (contracts)
+            worst_pct: Worst limit usage across all limits (percent)
+            
+        Returns:
+            Adjusted position size (contracts)
+        """
         # Apply circuit breaker
-        if worst_pct >= 85:
-            multiplier = 0.25  # 25% size
-        elif worst_pct >= 70:
-            multiplier = 0.50  # 50% size
-        elif worst_pct >= 50:
-            multiplier = 0.75  # 75% size
-        else:
-            multiplier = 1.0   # Full size
+        multiplier = _CB_MULTIPLIERS[bisect_right(_CB_THRESHOLDS, worst_pct)]
         
         adjusted_size = int(base_size * multiplier)
         
         # Apply max size limit
-        adjusted_size = min(adjusted_size, self.limits.max_position_size)
+        adjusted_size = min(adjusted_size, self._max_size)
         
         # Log if adjusted
         if adjusted_size < base_size:
@@ -374,7 +662,7 @@ class TopStepRiskManager:
         self.current_equity = self.account_size
         self.peak_equity = self.account_size
         self.trading_halted = False
-        self.halt_reason = None
+        self.halt_reason = HaltReason.NONE
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get risk manager statistics.
@@ -399,7 +687,7 @@ class TopStepRiskManager:
                 'weekly_pnl': self.weekly_pnl,
                 'trailing_drawdown': trailing_dd,
                 'trading_halted': self.trading_halted,
-                'halt_reason': self.halt_reason,
+                'halt_reason': self.halt_reason_name,
             },
             'configuration': {
                 'enable_weekly_limit': self.enable_weekly_limit,
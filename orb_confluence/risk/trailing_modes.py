@@ -10,18 +10,39 @@ Implements multiple trailing strategies:
 """
 
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, MutableSequence, Sequence, Tuple
 
 import numpy as np
 from loguru import logger
 
 from ..playbooks.base import ExitMode
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Fallback: create dummy decorator
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
 
-@dataclass
+
+# Exit modes bound once; ExitMode.<NAME> goes through the enum metaclass
+_MODE_VOL = ExitMode.TRAIL_VOL
+_MODE_PIVOT = ExitMode.TRAIL_PIVOT
+_MODE_HYBRID = ExitMode.HYBRID_VOL_PIVOT
+
+
+@dataclass(slots=True)
 class TrailUpdate:
     """Trail stop update event."""
     
@@ -41,7 +62,7 @@ class TrailUpdate:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PivotLevel:
     """Structural pivot level."""
     
@@ -58,11 +79,16 @@ class PivotLevel:
 class TrailingStopStrategy(ABC):
     """Abstract base for trailing stop strategies."""
     
+    # Risk for MFE in R; subclasses set it per instance
+    initial_risk: float = 0.0
+    
     def __init__(
         self,
         direction: str,
         entry_price: float,
         initial_stop: float,
+        record_updates: bool = True,
+        max_history: Optional[int] = None,
     ) -> None:
         """Initialize trailing strategy.
         
@@ -70,12 +96,22 @@ class TrailingStopStrategy(ABC):
             direction: 'long' or 'short'
             entry_price: Entry price
             initial_stop: Initial stop price
+            record_updates: Build and keep TrailUpdates; if False only
+                current_stop moves (update() returns None)
+            max_history: Keep only the most recent TrailUpdates in
+                trail_updates (None keeps all)
         """
         self.direction = direction.lower()
+        self.record_updates = record_updates
+        # +1 long / -1 short: favorable moves are sign * (new - old) > 0
+        self._sign = 1.0 if self.direction == "long" else -1.0
         self.entry_price = entry_price
         self.current_stop = initial_stop
         self.highest_favorable = entry_price
-        self.trail_updates: List[TrailUpdate] = []
+        # A bounded deque for long live sessions that only need recent moves
+        self.trail_updates: MutableSequence[TrailUpdate] = (
+            [] if max_history is None else deque(maxlen=max_history)
+        )
     
     @abstractmethod
     def update(
@@ -100,36 +136,136 @@ class TrailingStopStrategy(ABC):
         """
         pass
     
+    def update_batch(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+        atrs: Optional[np.ndarray] = None,
+    ) -> List[TrailUpdate]:
+        """Apply a run of bars in one pass.
+        
+        Equivalent to calling update() bar by bar (with atr=None when atrs
+        is None). Continues from the current state, so it can be mixed
+        with per-bar updates, e.g. to replay a whole trade in a backtest.
+        
+        Args:
+            highs: Bar highs
+            lows: Bar lows
+            timestamps: Bar timestamps
+            atrs: ATR per bar (None if unavailable)
+            
+        Returns:
+            TrailUpdates for the bars where the stop moved
+        """
+        return self._batch(
+            np.asarray(highs, dtype=np.float64),
+            np.asarray(lows, dtype=np.float64),
+            timestamps,
+            None if atrs is None else np.asarray(atrs, dtype=np.float64),
+        )
+    
+    @abstractmethod
+    def _batch(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+        atrs: Optional[np.ndarray],
+    ) -> List[TrailUpdate]:
+        """Advance over a run of bars (float64 arrays).
+        
+        Returns:
+            TrailUpdates for the bars where the stop moved
+        """
+        pass
+    
+    def _record_batch(
+        self,
+        timestamps: Sequence[datetime],
+        moved: np.ndarray,
+        stops: np.ndarray,
+        favorable: np.ndarray,
+        mode: ExitMode,
+        reason,
+    ) -> List[TrailUpdate]:
+        """Create TrailUpdates for the bars where a batch moved the stop.
+        
+        Args:
+            timestamps: Bar timestamps
+            moved: True where the stop improved
+            stops: Stop after each bar
+            favorable: Favorable extreme after each bar
+            mode: Exit mode
+            reason: Callable mapping a bar index to the update reason
+            
+        Returns:
+            TrailUpdates in bar order
+        """
+        if not self.record_updates:
+            if moved.any():
+                self.current_stop = float(stops[-1])
+            return []
+        
+        sign = self._sign
+        initial_risk = self.initial_risk
+        updates = []
+        for t in np.flatnonzero(moved).tolist():
+            if initial_risk > 0:
+                current_mfe_r = float((sign * favorable[t] - sign * self.entry_price) / initial_risk)
+            else:
+                current_mfe_r = 0.0
+            update = TrailUpdate(
+                timestamp=timestamps[t],
+                old_stop=self.current_stop,
+                new_stop=float(stops[t]),
+                reason=reason(t),
+                current_mfe_r=current_mfe_r,
+                trail_mode=mode,
+            )
+            self.current_stop = update.new_stop
+            updates.append(update)
+        self.trail_updates.extend(updates)
+        return updates
+    
     def _create_update(
         self,
         new_stop: float,
         reason: str,
-        current_mfe_r: float,
         timestamp: datetime,
         mode: ExitMode,
+        reason_args: tuple = (),
     ) -> Optional[TrailUpdate]:
         """Create trail update if stop improved.
         
+        MFE (from highest_favorable) and the reason text are only
+        computed once the stop has moved.
+        
         Args:
             new_stop: New stop price
-            reason: Update reason
-            current_mfe_r: Current MFE
+            reason: Update reason, or a str.format template for reason_args
             timestamp: Update timestamp
             mode: Exit mode
+            reason_args: Values formatted into reason
             
         Returns:
             TrailUpdate if stop improved, None otherwise
         """
         old_stop = self.current_stop
+        sign = self._sign
         
         # Check if stop improved (only move in favorable direction)
-        improved = False
-        if self.direction == "long":
-            improved = new_stop > old_stop
-        else:  # short
-            improved = new_stop < old_stop
-        
-        if improved:
+        if sign * (new_stop - old_stop) > 0:
+            if not self.record_updates:
+                self.current_stop = new_stop
+                return None
+            if reason_args:
+                reason = reason.format(*reason_args)
+            initial_risk = self.initial_risk
+            if initial_risk > 0:
+                current_mfe_r = (sign * self.highest_favorable - sign * self.entry_price) / initial_risk
+            else:
+                current_mfe_r = 0.0
             update = TrailUpdate(
                 timestamp=timestamp,
                 old_stop=old_stop,
@@ -153,10 +289,37 @@ class TrailingStopStrategy(ABC):
         Returns:
             True if stop hit
         """
-        if self.direction == "long":
-            return current_price <= self.current_stop
-        else:
-            return current_price >= self.current_stop
+        return self._sign * (current_price - self.current_stop) <= 0
+
+
+def _vol_trail_series(
+    favorable: float,
+    stop: float,
+    extremes: np.ndarray,
+    atrs: np.ndarray,
+    atr_multiple: float,
+    sign: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ATR trail over a run of bars with cumulative max/min.
+    
+    Args:
+        favorable: Favorable extreme before the run
+        stop: Stop before the run
+        extremes: Bar highs (long) or lows (short)
+        atrs: ATR per bar
+        atr_multiple: ATR multiple for the trail distance
+        sign: +1 long, -1 short
+        
+    Returns:
+        (favorable extreme, stop, True where the stop moved) per bar
+    """
+    # fmax/fmin skip NaN bars, like the per-bar comparisons
+    accumulate = np.fmax.accumulate if sign > 0 else np.fmin.accumulate
+    hf = accumulate(np.concatenate([[favorable], extremes]))[1:]
+    new_stops = hf - sign * (atr_multiple * atrs)
+    stops = accumulate(np.concatenate([[stop], new_stops]))
+    moved = sign * (new_stops - stops[:-1]) > 0
+    return hf, stops[1:], moved
 
 
 class VolatilityTrailingStop(TrailingStopStrategy):
@@ -180,6 +343,8 @@ class VolatilityTrailingStop(TrailingStopStrategy):
         initial_stop: float,
         atr_multiple: float = 2.0,
         initial_risk: float = 5.0,
+        record_updates: bool = True,
+        max_history: Optional[int] = None,
     ) -> None:
         """Initialize volatility trailing.
         
@@ -189,8 +354,10 @@ class VolatilityTrailingStop(TrailingStopStrategy):
             initial_stop: Initial stop
             atr_multiple: ATR multiple for trail distance
             initial_risk: Initial risk for R calculations
+            record_updates: Build and keep TrailUpdates
+            max_history: Most recent TrailUpdates to keep (None keeps all)
         """
-        super().__init__(direction, entry_price, initial_stop)
+        super().__init__(direction, entry_price, initial_stop, record_updates, max_history)
         self.atr_multiple = atr_multiple
         self.initial_risk = initial_risk
     
@@ -220,39 +387,175 @@ class VolatilityTrailingStop(TrailingStopStrategy):
             logger.warning("ATR not provided for volatility trailing")
             return None
         
+        sign = self._sign
+        hf = self.highest_favorable
+        atr_multiple = self.atr_multiple
+        
         # Update highest favorable
-        if self.direction == "long":
-            if bar_high > self.highest_favorable:
-                self.highest_favorable = bar_high
-        else:  # short
-            if bar_low < self.highest_favorable:
-                self.highest_favorable = bar_low
+        extreme = bar_high if sign > 0 else bar_low
+        if sign * (extreme - hf) > 0:
+            hf = self.highest_favorable = extreme
         
         # Compute trail distance
-        trail_distance = self.atr_multiple * atr
+        trail_distance = atr_multiple * atr
         
         # New stop at trail distance from highest favorable
-        if self.direction == "long":
-            new_stop = self.highest_favorable - trail_distance
-        else:  # short
-            new_stop = self.highest_favorable + trail_distance
-        
-        # Compute MFE
-        if self.initial_risk > 0:
-            if self.direction == "long":
-                current_mfe_r = (self.highest_favorable - self.entry_price) / self.initial_risk
-            else:
-                current_mfe_r = (self.entry_price - self.highest_favorable) / self.initial_risk
-        else:
-            current_mfe_r = 0.0
+        new_stop = hf - sign * trail_distance
         
         return self._create_update(
-            new_stop=new_stop,
-            reason=f"ATR trail: {self.atr_multiple}x{atr:.2f} from {self.highest_favorable:.2f}",
-            current_mfe_r=current_mfe_r,
-            timestamp=timestamp,
-            mode=ExitMode.TRAIL_VOL,
+            new_stop,
+            "ATR trail: {}x{:.2f} from {:.2f}",
+            timestamp,
+            _MODE_VOL,
+            (atr_multiple, atr, hf),
         )
+    
+    def _batch(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+        atrs: Optional[np.ndarray],
+    ) -> List[TrailUpdate]:
+        """Advance over a run of bars with cumulative max/min.
+        
+        Returns:
+            TrailUpdates for the bars where the stop moved
+        """
+        if atrs is None:
+            logger.warning("ATR not provided for volatility trailing")
+            return []
+        if len(highs) == 0:
+            return []
+        
+        sign = self._sign
+        hf, stops, moved = _vol_trail_series(
+            self.highest_favorable, self.current_stop, highs if sign > 0 else lows,
+            atrs, self.atr_multiple, sign,
+        )
+        
+        self.highest_favorable = float(hf[-1])
+        return self._record_batch(
+            timestamps, moved, stops, hf, _MODE_VOL,
+            lambda t: f"ATR trail: {self.atr_multiple}x{atrs[t]:.2f} from {hf[t]:.2f}",
+        )
+
+
+def swing_pivot_mask(
+    values: np.ndarray,
+    lookback: int,
+    direction: str = "long",
+) -> np.ndarray:
+    """Flag strict swing pivots across a whole bar series.
+    
+    Vectorized form of PivotTrailingStop's per-bar check: bar i is a
+    swing low (long) if its low is strictly below the lows of the
+    lookback bars on each side, or a swing high (short) if its high is
+    strictly above them. A pivot at bar i is confirmed on bar
+    i + lookback.
+    
+    Args:
+        values: Bar lows (long) or bar highs (short)
+        lookback: Bars required on each side of the pivot
+        direction: 'long' for swing lows, 'short' for swing highs
+        
+    Returns:
+        Boolean array, True at each pivot bar
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+    if n < lookback * 2 + 1:
+        return mask
+    if lookback == 0:
+        mask[:] = True
+        return mask
+    
+    # windows[j] spans values[j:j + lookback]: the left neighbours of bar
+    # j + lookback and the right neighbours of bar j - 1.
+    windows = np.lib.stride_tricks.sliding_window_view(values, lookback)
+    centers = values[lookback:n - lookback]
+    if direction.lower() == "long":
+        mask[lookback:n - lookback] = (
+            (centers < windows[:n - lookback * 2].min(axis=1))
+            & (centers < windows[lookback + 1:].min(axis=1))
+        )
+    else:
+        mask[lookback:n - lookback] = (
+            (centers > windows[:n - lookback * 2].max(axis=1))
+            & (centers > windows[lookback + 1:].max(axis=1))
+        )
+    return mask
+
+
+@njit(cache=True)
+def _scan_pivot_trail(
+    values: np.ndarray,
+    pivot_mask: np.ndarray,
+    start: int,
+    lookback: int,
+    highest_favorable: np.ndarray,
+    buffers: np.ndarray,
+    sign: float,
+    stop: float,
+    pivot_prices: np.ndarray,
+    pivot_ids: np.ndarray,
+    n_pivots: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Compiled PivotTrailingStop.update loop over a run of bars.
+    
+    values/pivot_mask cover the retained bar history followed by the new
+    bars (new bar t sits at start + t). Confirmed pivots are kept in
+    pivot_prices/pivot_ids (capacity 6) and updated in place; ids index
+    into values, or are negative for pivots confirmed before this run.
+    
+    Returns:
+        (stop per bar, best pivot price per bar, True where the stop
+        moved, number of confirmed pivots)
+    """
+    n = len(highest_favorable)
+    stops = np.empty(n)
+    best_prices = np.full(n, np.nan)
+    improved = np.zeros(n, dtype=np.bool_)
+    
+    for t in range(n):
+        # Pivot whose window closes on this bar
+        mid = start + t - lookback
+        if mid - lookback >= 0 and pivot_mask[mid]:
+            price = values[mid]
+            duplicate = False
+            for j in range(n_pivots):
+                if pivot_prices[j] == price:
+                    duplicate = True
+                    break
+            if not duplicate:
+                pivot_prices[n_pivots] = price
+                pivot_ids[n_pivots] = mid
+                n_pivots += 1
+                if n_pivots > 5:
+                    for j in range(5):
+                        pivot_prices[j] = pivot_prices[j + 1]
+                        pivot_ids[j] = pivot_ids[j + 1]
+                    n_pivots = 5
+        
+        # Tightest pivot on the protective side of the favorable extreme
+        hf = highest_favorable[t]
+        found = False
+        best = 0.0
+        for j in range(n_pivots):
+            price = pivot_prices[j]
+            if sign * (hf - price) > 0 and (not found or sign * (price - best) > 0):
+                best = price
+                found = True
+        if found:
+            best_prices[t] = best
+            new_stop = best - sign * buffers[t]
+            if sign * (new_stop - stop) > 0:
+                stop = new_stop
+                improved[t] = True
+        stops[t] = stop
+    
+    return stops, best_prices, improved, n_pivots
 
 
 class PivotTrailingStop(TrailingStopStrategy):
@@ -277,6 +580,8 @@ class PivotTrailingStop(TrailingStopStrategy):
         pivot_lookback: int = 3,
         buffer_atr_mult: float = 0.1,
         initial_risk: float = 5.0,
+        record_updates: bool = True,
+        max_history: Optional[int] = None,
     ) -> None:
         """Initialize pivot trailing.
         
@@ -287,15 +592,38 @@ class PivotTrailingStop(TrailingStopStrategy):
             pivot_lookback: Bars for pivot confirmation
             buffer_atr_mult: Buffer below pivot (ATR mult)
             initial_risk: Initial risk for R calculations
+            record_updates: Build and keep TrailUpdates
+            max_history: Most recent TrailUpdates to keep (None keeps all)
         """
-        super().__init__(direction, entry_price, initial_stop)
+        super().__init__(direction, entry_price, initial_stop, record_updates, max_history)
         self.pivot_lookback = pivot_lookback
         self.buffer_mult = buffer_atr_mult
         self.initial_risk = initial_risk
         
-        # Track recent bars for pivot detection
-        self.recent_bars: List[dict] = []
-        self.confirmed_pivots: List[PivotLevel] = []
+        # Recent bars for pivot detection, one bounded column per field. A
+        # pivot check only reads the last 2 * pivot_lookback + 1 bars.
+        window = pivot_lookback * 2 + 1
+        self._highs = deque(maxlen=window)
+        self._lows = deque(maxlen=window)
+        self._timestamps = deque(maxlen=window)
+        
+        # Monotonic deque over the window: bar numbers and lows (highs for
+        # short) with no later bar strictly more extreme. The front is the
+        # earliest window extreme, so each pivot check is O(1) amortized.
+        self._bar_count = 0
+        self._extreme_bars = deque()
+        self._extreme_values = deque()
+        # Five most recent distinct pivots, plus the same pivots ordered by
+        # sign * price so dedup and best-pivot lookups are a bisect
+        self.confirmed_pivots: deque = deque(maxlen=5)
+        self._pivot_keys: List[float] = []
+        self._sorted_pivots: List[PivotLevel] = []
+        
+        # Cached best pivot. It changes only when the pivots change or the
+        # favorable extreme passes the nearest pivot not yet usable.
+        self._best_pivot: Optional[PivotLevel] = None
+        self._best_dirty = False
+        self._next_pivot_price = self._sign * np.inf
     
     def update(
         self,
@@ -319,122 +647,225 @@ class PivotTrailingStop(TrailingStopStrategy):
         Returns:
             TrailUpdate if stop moved
         """
-        # Store bar
-        self.recent_bars.append({
-            "timestamp": timestamp,
-            "high": bar_high,
-            "low": bar_low,
-            "close": current_price,
-        })
-        
-        # Keep only necessary bars
-        if len(self.recent_bars) > self.pivot_lookback * 2 + 10:
-            self.recent_bars.pop(0)
+        best_pivot = self._observe(bar_high, bar_low, timestamp)
+        
+        if best_pivot is None:
+            return None
+        
+        # Compute stop with buffer
+        sign = self._sign
+        buffer = self.buffer_mult * atr if atr is not None else 0.0
+        new_stop = best_pivot.price - sign * buffer
+        
+        return self._create_update(
+            new_stop,
+            "Pivot trail: {} @ {:.2f}",
+            timestamp,
+            _MODE_PIVOT,
+            (best_pivot.pivot_type, best_pivot.price),
+        )
+    
+    def _observe(
+        self,
+        bar_high: float,
+        bar_low: float,
+        timestamp: datetime,
+    ) -> Optional[PivotLevel]:
+        """Record a bar, confirm pivots and return the best pivot.
+        
+        Args:
+            bar_high: Bar high
+            bar_low: Bar low
+            timestamp: Timestamp
+            
+        Returns:
+            Best PivotLevel for the stop, or None
+        """
+        # Store bar (oldest bar drops off once the window is full)
+        self._highs.append(bar_high)
+        self._lows.append(bar_low)
+        self._timestamps.append(timestamp)
         
         # Update highest favorable
-        if self.direction == "long":
-            if bar_high > self.highest_favorable:
-                self.highest_favorable = bar_high
-        else:
-            if bar_low < self.highest_favorable:
-                self.highest_favorable = bar_low
+        sign = self._sign
+        extreme = bar_high if sign > 0 else bar_low
+        if sign * (extreme - self.highest_favorable) > 0:
+            self.highest_favorable = extreme
         
         # Detect new pivots
         self._detect_pivots()
         
         # Find best pivot for stop
-        best_pivot = self._find_best_pivot()
+        return self._find_best_pivot()
+    
+    def _batch(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+        atrs: Optional[np.ndarray],
+    ) -> List[TrailUpdate]:
+        """Advance over a run of bars.
         
-        if best_pivot is None:
-            return None
+        Returns:
+            TrailUpdates for the bars where the stop moved
+        """
+        if len(highs) == 0:
+            return []
         
-        # Compute stop with buffer
-        buffer = self.buffer_mult * atr if atr is not None else 0.0
+        stops, hf, improved, best_prices = self._scan(highs, lows, timestamps, atrs)
+        pivot_type = "swing_low" if self._sign > 0 else "swing_high"
+        return self._record_batch(
+            timestamps, improved, stops, hf, _MODE_PIVOT,
+            lambda t: f"Pivot trail: {pivot_type} @ {best_prices[t]:.2f}",
+        )
+    
+    def _scan(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+        atrs: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Advance bar history and pivots over a non-empty run of bars.
         
-        if self.direction == "long":
-            new_stop = best_pivot.price - buffer
-        else:  # short
-            new_stop = best_pivot.price + buffer
+        Pivot confirmation and stop selection run as one compiled loop.
+        current_stop is left for the caller to move.
         
-        # Compute MFE
-        if self.initial_risk > 0:
-            if self.direction == "long":
-                current_mfe_r = (self.highest_favorable - self.entry_price) / self.initial_risk
-            else:
-                current_mfe_r = (self.entry_price - self.highest_favorable) / self.initial_risk
+        Returns:
+            (stop, favorable extreme, True where the stop moved, best pivot
+            price) per bar
+        """
+        n = len(highs)
+        sign = self._sign
+        long = sign > 0
+        history = self._lows if long else self._highs
+        start = len(history)
+        values = np.concatenate([np.asarray(history, dtype=np.float64), lows if long else highs])
+        pivot_mask = swing_pivot_mask(values, self.pivot_lookback, self.direction)
+        
+        # Favorable extreme after each bar (NaN bars leave it unchanged)
+        if long:
+            hf = np.fmax.accumulate(np.concatenate([[self.highest_favorable], highs]))[1:]
         else:
-            current_mfe_r = 0.0
+            hf = np.fmin.accumulate(np.concatenate([[self.highest_favorable], lows]))[1:]
         
-        return self._create_update(
-            new_stop=new_stop,
-            reason=f"Pivot trail: {best_pivot.pivot_type} @ {best_pivot.price:.2f}",
-            current_mfe_r=current_mfe_r,
-            timestamp=timestamp,
-            mode=ExitMode.TRAIL_PIVOT,
+        buffers = np.zeros(n) if atrs is None else self.buffer_mult * atrs
+        
+        pivots = self.confirmed_pivots
+        pivot_prices = np.empty(6)
+        pivot_ids = np.empty(6, dtype=np.int64)
+        for j, pivot in enumerate(pivots):
+            pivot_prices[j] = pivot.price
+            pivot_ids[j] = -1 - j
+        
+        stops, best_prices, improved, n_pivots = _scan_pivot_trail(
+            values, pivot_mask, start, self.pivot_lookback, hf, buffers, sign,
+            float(self.current_stop), pivot_prices, pivot_ids, len(pivots),
         )
+        
+        # Rebuild pivot and bar history from the scan
+        all_timestamps = list(self._timestamps) + list(timestamps)
+        pivot_type = "swing_low" if long else "swing_high"
+        self.confirmed_pivots = deque((
+            pivots[-1 - i] if i < 0 else PivotLevel(
+                timestamp=all_timestamps[i],
+                price=float(values[i]),
+                pivot_type=pivot_type,
+                confirmed=True,
+            )
+            for i in pivot_ids[:n_pivots].tolist()
+        ), maxlen=5)
+        self._sort_pivots()
+        self._best_dirty = True
+        self._highs.extend(highs.tolist())
+        self._lows.extend(lows.tolist())
+        self._timestamps.extend(timestamps)
+        self._rebuild_extremes(self._bar_count + n)
+        self.highest_favorable = float(hf[-1])
+        return stops, hf, improved, best_prices
     
     def _detect_pivots(self) -> None:
         """Detect swing pivots in recent bars."""
-        if len(self.recent_bars) < self.pivot_lookback * 2 + 1:
-            return
+        sign = self._sign
+        value = self._lows[-1] if sign > 0 else self._highs[-1]
+        bar = self._bar_count
+        self._bar_count = bar + 1
+        
+        # Push the new bar, dropping bars it beats and the bar leaving the window
+        bars = self._extreme_bars
+        values = self._extreme_values
+        while values and sign * (values[-1] - value) > 0:
+            values.pop()
+            bars.pop()
+        bars.append(bar)
+        values.append(value)
+        lookback = self.pivot_lookback
+        if bars[0] < bar - lookback * 2:
+            bars.popleft()
+            values.popleft()
         
-        # Check middle bar for pivot
-        mid_idx = len(self.recent_bars) - self.pivot_lookback - 1
-        if mid_idx < self.pivot_lookback:
+        # Swing low (long): mid low < all lookback bars on each side
+        # Swing high (short): mid high > all lookback bars on each side
+        # The mid bar is the earliest window extreme and no later bar ties it.
+        # Most bars fail the front check, so the warm-up test (a full window
+        # of 2 * lookback + 1 bars) only runs when the front is the mid bar.
+        if bars[0] != bar - lookback or bar < lookback * 2:
+            return
+        mid_value = values[0]
+        if len(values) > 1 and values[1] == mid_value:
             return
         
-        mid_bar = self.recent_bars[mid_idx]
+        # Add if not duplicate; the oldest of five pivots drops off
+        keys = self._pivot_keys
+        key = sign * mid_value
+        idx = bisect_left(keys, key)
+        if idx < len(keys) and keys[idx] == key:
+            return
+        pivots = self.confirmed_pivots
+        sorted_pivots = self._sorted_pivots
+        if len(pivots) == 5:
+            old = bisect_left(keys, sign * pivots[0].price)
+            del keys[old]
+            del sorted_pivots[old]
+            if old < idx:
+                idx -= 1
+        pivot = PivotLevel(
+            timestamp=self._timestamps[lookback],
+            price=mid_value,
+            pivot_type="swing_low" if sign > 0 else "swing_high",
+            confirmed=True,
+        )
+        pivots.append(pivot)
+        keys.insert(idx, key)
+        sorted_pivots.insert(idx, pivot)
+        self._best_dirty = True
+    
+    def _sort_pivots(self) -> None:
+        """Rebuild the price-ordered pivot lists from confirmed_pivots."""
+        sign = self._sign
+        self._sorted_pivots = sorted(self.confirmed_pivots, key=lambda p: sign * p.price)
+        self._pivot_keys = [sign * p.price for p in self._sorted_pivots]
+    
+    def _rebuild_extremes(self, bar_count: int) -> None:
+        """Rebuild the monotonic deque from the bar window after a batch.
         
-        # Swing low: mid low < all lookback bars on each side
-        if self.direction == "long":
-            is_swing_low = True
-            for i in range(mid_idx - self.pivot_lookback, mid_idx + self.pivot_lookback + 1):
-                if i == mid_idx:
-                    continue
-                if i < 0 or i >= len(self.recent_bars):
-                    is_swing_low = False
-                    break
-                if self.recent_bars[i]["low"] <= mid_bar["low"]:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                pivot = PivotLevel(
-                    timestamp=mid_bar["timestamp"],
-                    price=mid_bar["low"],
-                    pivot_type="swing_low",
-                    confirmed=True,
-                )
-                # Add if not duplicate
-                if not any(p.price == pivot.price for p in self.confirmed_pivots):
-                    self.confirmed_pivots.append(pivot)
-        
-        # Swing high: mid high > all lookback bars on each side
-        else:  # short
-            is_swing_high = True
-            for i in range(mid_idx - self.pivot_lookback, mid_idx + self.pivot_lookback + 1):
-                if i == mid_idx:
-                    continue
-                if i < 0 or i >= len(self.recent_bars):
-                    is_swing_high = False
-                    break
-                if self.recent_bars[i]["high"] >= mid_bar["high"]:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                pivot = PivotLevel(
-                    timestamp=mid_bar["timestamp"],
-                    price=mid_bar["high"],
-                    pivot_type="swing_high",
-                    confirmed=True,
-                )
-                if not any(p.price == pivot.price for p in self.confirmed_pivots):
-                    self.confirmed_pivots.append(pivot)
-        
-        # Keep only recent pivots
-        if len(self.confirmed_pivots) > 5:
-            self.confirmed_pivots.pop(0)
+        Args:
+            bar_count: Bars seen so far, including the batch
+        """
+        sign = self._sign
+        window = self._lows if sign > 0 else self._highs
+        bars = self._extreme_bars
+        values = self._extreme_values
+        bars.clear()
+        values.clear()
+        for bar, value in enumerate(window, start=bar_count - len(window)):
+            while values and sign * (values[-1] - value) > 0:
+                values.pop()
+                bars.pop()
+            bars.append(bar)
+            values.append(value)
+        self._bar_count = bar_count
     
     def _find_best_pivot(self) -> Optional[PivotLevel]:
         """Find best pivot for stop placement.
@@ -442,28 +873,23 @@ class PivotTrailingStop(TrailingStopStrategy):
         Returns:
             Best PivotLevel or None
         """
-        if not self.confirmed_pivots:
-            return None
+        sign = self._sign
+        hf = self.highest_favorable
+        if not self._best_dirty and not sign * (hf - self._next_pivot_price) > 0:
+            return self._best_pivot
         
         # For long: find highest swing low below current price
         # For short: find lowest swing high above current price
+        # Also track the nearest pivot beyond it, which hf may pass later.
+        keys = self._pivot_keys
+        idx = bisect_left(keys, sign * hf)
+        best = self._sorted_pivots[idx - 1] if idx else None
+        next_price = sign * keys[idx] if idx < len(keys) else sign * np.inf
         
-        if self.direction == "long":
-            valid_pivots = [
-                p for p in self.confirmed_pivots
-                if p.pivot_type == "swing_low" and p.price < self.highest_favorable
-            ]
-            if valid_pivots:
-                return max(valid_pivots, key=lambda p: p.price)
-        else:  # short
-            valid_pivots = [
-                p for p in self.confirmed_pivots
-                if p.pivot_type == "swing_high" and p.price > self.highest_favorable
-            ]
-            if valid_pivots:
-                return min(valid_pivots, key=lambda p: p.price)
-        
-        return None
+        self._best_pivot = best
+        self._best_dirty = False
+        self._next_pivot_price = next_price
+        return best
 
 
 class HybridTrailingStop(TrailingStopStrategy):
@@ -488,6 +914,8 @@ class HybridTrailingStop(TrailingStopStrategy):
         atr_multiple: float = 1.8,
         pivot_lookback: int = 3,
         initial_risk: float = 5.0,
+        record_updates: bool = True,
+        max_history: Optional[int] = None,
     ) -> None:
         """Initialize hybrid trailing.
         
@@ -498,10 +926,14 @@ class HybridTrailingStop(TrailingStopStrategy):
             atr_multiple: ATR multiple for fallback
             pivot_lookback: Pivot confirmation bars
             initial_risk: Initial risk
+            record_updates: Build and keep TrailUpdates
+            max_history: Most recent TrailUpdates to keep (None keeps all)
         """
-        super().__init__(direction, entry_price, initial_stop)
+        super().__init__(direction, entry_price, initial_stop, record_updates, max_history)
+        self.atr_multiple = atr_multiple
+        self.initial_risk = initial_risk
         
-        # Create both strategies
+        # Pivot component: structure detection and its own ratcheted stop
         self.pivot_trail = PivotTrailingStop(
             direction=direction,
             entry_price=entry_price,
@@ -510,13 +942,9 @@ class HybridTrailingStop(TrailingStopStrategy):
             initial_risk=initial_risk,
         )
         
-        self.vol_trail = VolatilityTrailingStop(
-            direction=direction,
-            entry_price=entry_price,
-            initial_stop=initial_stop,
-            atr_multiple=atr_multiple,
-            initial_risk=initial_risk,
-        )
+        # ATR component, computed inline (skips bars without ATR)
+        self.vol_favorable = entry_price
+        self.vol_stop = initial_stop
     
     def update(
         self,
@@ -542,57 +970,177 @@ class HybridTrailingStop(TrailingStopStrategy):
         Returns:
             TrailUpdate if stop moved
         """
-        # Try pivot first
-        pivot_update = self.pivot_trail.update(
-            current_price=current_price,
-            bar_high=bar_high,
-            bar_low=bar_low,
-            timestamp=timestamp,
-            atr=atr,
-        )
+        sign = self._sign
         
-        # Update vol trail too
-        vol_update = self.vol_trail.update(
-            current_price=current_price,
-            bar_high=bar_high,
-            bar_low=bar_low,
-            timestamp=timestamp,
-            atr=atr,
-        )
+        # Pivot stop
+        pivot_trail = self.pivot_trail
+        best_pivot = pivot_trail._observe(bar_high, bar_low, timestamp)
+        pivot_stop = pivot_trail.current_stop
+        if best_pivot is not None:
+            buffer = pivot_trail.buffer_mult * atr if atr is not None else 0.0
+            new_stop = best_pivot.price - sign * buffer
+            if sign * (new_stop - pivot_stop) > 0:
+                pivot_stop = pivot_trail.current_stop = new_stop
+        
+        # ATR stop
+        vol_favorable = self.vol_favorable
+        vol_stop = self.vol_stop
+        if atr is None:
+            logger.warning("ATR not provided for volatility trailing")
+        else:
+            extreme = bar_high if sign > 0 else bar_low
+            if sign * (extreme - vol_favorable) > 0:
+                vol_favorable = self.vol_favorable = extreme
+            new_stop = vol_favorable - sign * (self.atr_multiple * atr)
+            if sign * (new_stop - vol_stop) > 0:
+                vol_stop = self.vol_stop = new_stop
         
         # Use best stop (most favorable)
-        pivot_stop = self.pivot_trail.current_stop
-        vol_stop = self.vol_trail.current_stop
+        best_stop = vol_stop if sign * (vol_stop - pivot_stop) > 0 else pivot_stop
+        reason = "Hybrid trail: pivot" if best_stop == pivot_stop else "Hybrid trail: ATR fallback"
         
-        if self.direction == "long":
-            best_stop = max(pivot_stop, vol_stop)
-            reason_suffix = "pivot" if best_stop == pivot_stop else "ATR fallback"
-        else:  # short
-            best_stop = min(pivot_stop, vol_stop)
-            reason_suffix = "pivot" if best_stop == pivot_stop else "ATR fallback"
+        # Update highest favorable: max() of the pivot extreme (every bar) and
+        # the ATR extreme (bars with an ATR) is the former for longs and the
+        # latter for shorts, so pick it without recomputing either
+        self.highest_favorable = (
+            pivot_trail.highest_favorable if sign > 0 else vol_favorable
+        )
         
-        # Update highest favorable
-        self.highest_favorable = max(self.pivot_trail.highest_favorable, self.vol_trail.highest_favorable)
+        return self._create_update(best_stop, reason, timestamp, _MODE_HYBRID)
+    
+    def _batch(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+        atrs: Optional[np.ndarray],
+    ) -> List[TrailUpdate]:
+        """Advance both component stops and combine their series.
         
-        # Compute MFE
-        initial_risk = self.pivot_trail.initial_risk
-        if initial_risk > 0:
-            if self.direction == "long":
-                current_mfe_r = (self.highest_favorable - self.entry_price) / initial_risk
-            else:
-                current_mfe_r = (self.entry_price - self.highest_favorable) / initial_risk
+        Returns:
+            TrailUpdates for the bars where the stop moved
+        """
+        n = len(highs)
+        if n == 0:
+            return []
+        
+        sign = self._sign
+        pivot_trail = self.pivot_trail
+        pivot_stops, pivot_hf, _, _ = pivot_trail._scan(highs, lows, timestamps, atrs)
+        pivot_trail.current_stop = float(pivot_stops[-1])
+        
+        if atrs is None:
+            logger.warning("ATR not provided for volatility trailing")
+            vol_stops = np.full(n, self.vol_stop)
+            vol_hf = np.full(n, self.vol_favorable)
         else:
-            current_mfe_r = 0.0
+            vol_hf, vol_stops, _ = _vol_trail_series(
+                self.vol_favorable, self.vol_stop, highs if sign > 0 else lows,
+                atrs, self.atr_multiple, sign,
+            )
+            self.vol_favorable = float(vol_hf[-1])
+            self.vol_stop = float(vol_stops[-1])
         
-        return self._create_update(
-            new_stop=best_stop,
-            reason=f"Hybrid trail: {reason_suffix}",
-            current_mfe_r=current_mfe_r,
-            timestamp=timestamp,
-            mode=ExitMode.HYBRID_VOL_PIVOT,
+        use_vol = sign * (vol_stops - pivot_stops) > 0
+        best_stops = np.where(use_vol, vol_stops, pivot_stops)
+        hf = pivot_hf if sign > 0 else vol_hf
+        
+        accumulate = np.fmax.accumulate if sign > 0 else np.fmin.accumulate
+        stops = accumulate(np.concatenate([[self.current_stop], best_stops]))
+        moved = sign * (best_stops - stops[:-1]) > 0
+        stops = stops[1:]
+        
+        self.highest_favorable = float(hf[-1])
+        return self._record_batch(
+            timestamps, moved, stops, hf, _MODE_HYBRID,
+            lambda t: "Hybrid trail: ATR fallback" if use_vol[t] else "Hybrid trail: pivot",
         )
 
 
+def _make_vol_trail(
+    direction: str,
+    entry_price: float,
+    initial_stop: float,
+    initial_risk: float,
+    mode_params: dict,
+    **kwargs,
+) -> VolatilityTrailingStop:
+    """TRAIL_VOL strategy for TrailingStopManager."""
+    return VolatilityTrailingStop(
+        direction=direction,
+        entry_price=entry_price,
+        initial_stop=initial_stop,
+        atr_multiple=mode_params.get("trail_factor", 2.0),
+        initial_risk=initial_risk,
+        **kwargs,
+    )
+
+
+def _make_pivot_trail(
+    direction: str,
+    entry_price: float,
+    initial_stop: float,
+    initial_risk: float,
+    mode_params: dict,
+    **kwargs,
+) -> PivotTrailingStop:
+    """TRAIL_PIVOT strategy for TrailingStopManager."""
+    return PivotTrailingStop(
+        direction=direction,
+        entry_price=entry_price,
+        initial_stop=initial_stop,
+        pivot_lookback=mode_params.get("pivot_lookback", 3),
+        initial_risk=initial_risk,
+        **kwargs,
+    )
+
+
+def _make_hybrid_trail(
+    direction: str,
+    entry_price: float,
+    initial_stop: float,
+    initial_risk: float,
+    mode_params: dict,
+    **kwargs,
+) -> HybridTrailingStop:
+    """HYBRID_VOL_PIVOT strategy for TrailingStopManager."""
+    return HybridTrailingStop(
+        direction=direction,
+        entry_price=entry_price,
+        initial_stop=initial_stop,
+        atr_multiple=mode_params.get("trail_factor", 1.8),
+        initial_risk=initial_risk,
+        **kwargs,
+    )
+
+
+def _make_default_trail(
+    direction: str,
+    entry_price: float,
+    initial_stop: float,
+    initial_risk: float,
+    mode_params: dict,
+    **kwargs,
+) -> VolatilityTrailingStop:
+    """Fallback ATR trail for exit modes without a trailing strategy."""
+    return VolatilityTrailingStop(
+        direction=direction,
+        entry_price=entry_price,
+        initial_stop=initial_stop,
+        atr_multiple=2.0,
+        initial_risk=initial_risk,
+        **kwargs,
+    )
+
+
+# Strategy constructor per exit mode: one dict lookup per manager
+_STRATEGY_FACTORY = {
+    _MODE_VOL: _make_vol_trail,
+    _MODE_PIVOT: _make_pivot_trail,
+    _MODE_HYBRID: _make_hybrid_trail,
+}
+
+
 class TrailingStopManager:
     """Manager for all trailing stop strategies.
     
@@ -623,6 +1171,8 @@ class TrailingStopManager:
         initial_stop: float,
         exit_mode: ExitMode,
         initial_risk: float,
+        record_updates: bool = True,
+        max_history: Optional[int] = None,
         **mode_params
     ) -> None:
         """Initialize trailing manager.
@@ -633,47 +1183,24 @@ class TrailingStopManager:
             initial_stop: Initial stop
             exit_mode: Exit mode to use
             initial_risk: Initial risk
+            record_updates: Build and keep TrailUpdates (False for replays
+                that only read current_stop)
+            max_history: Most recent TrailUpdates to keep (None keeps all)
             **mode_params: Mode-specific parameters
         """
         self.exit_mode = exit_mode
         
-        # Create appropriate strategy
-        if exit_mode == ExitMode.TRAIL_VOL:
-            self.strategy = VolatilityTrailingStop(
-                direction=direction,
-                entry_price=entry_price,
-                initial_stop=initial_stop,
-                atr_multiple=mode_params.get("trail_factor", 2.0),
-                initial_risk=initial_risk,
-            )
-        
-        elif exit_mode == ExitMode.TRAIL_PIVOT:
-            self.strategy = PivotTrailingStop(
-                direction=direction,
-                entry_price=entry_price,
-                initial_stop=initial_stop,
-                pivot_lookback=mode_params.get("pivot_lookback", 3),
-                initial_risk=initial_risk,
-            )
-        
-        elif exit_mode == ExitMode.HYBRID_VOL_PIVOT:
-            self.strategy = HybridTrailingStop(
-                direction=direction,
-                entry_price=entry_price,
-                initial_stop=initial_stop,
-                atr_multiple=mode_params.get("trail_factor", 1.8),
-                initial_risk=initial_risk,
-            )
-        
-        else:
-            # Default to volatility
-            self.strategy = VolatilityTrailingStop(
-                direction=direction,
-                entry_price=entry_price,
-                initial_stop=initial_stop,
-                atr_multiple=2.0,
-                initial_risk=initial_risk,
-            )
+        # Create appropriate strategy (default to volatility)
+        make_strategy = _STRATEGY_FACTORY.get(exit_mode, _make_default_trail)
+        self.strategy = make_strategy(
+            direction,
+            entry_price,
+            initial_stop,
+            initial_risk,
+            mode_params,
+            record_updates=record_updates,
+            max_history=max_history,
+        )
     
     def update(self, **kwargs) -> Optional[TrailUpdate]:
         """Update trailing stop.
@@ -686,6 +1213,26 @@ class TrailingStopManager:
         """
         return self.strategy.update(**kwargs)
     
+    def update_batch(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Sequence[datetime],
+        atrs: Optional[np.ndarray] = None,
+    ) -> List[TrailUpdate]:
+        """Apply a run of bars in one pass.
+        
+        Args:
+            highs: Bar highs
+            lows: Bar lows
+            timestamps: Bar timestamps
+            atrs: ATR per bar (None if unavailable)
+            
+        Returns:
+            TrailUpdates for the bars where the stop moved
+        """
+        return self.strategy.update_batch(highs, lows, timestamps, atrs)
+    
     def check_stop_hit(self, current_price: float) -> bool:
         """Check if stop hit.
         
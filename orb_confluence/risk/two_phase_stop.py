@@ -13,20 +13,35 @@ Logic:
 
 from dataclasses import dataclass
 from datetime import datetime
-from enum import Enum
-from typing import Optional
+from enum import IntEnum
+from typing import List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from loguru import logger
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Fallback: create dummy decorator
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+    prange = range
 
-class StopPhase(str, Enum):
-    """Stop phase classification."""
-    PHASE1_STATISTICAL = "PHASE1_STATISTICAL"  # Tight statistical stop
-    PHASE2_EXPANSION = "PHASE2_EXPANSION"  # Wider structural stop
-    PHASE3_RUNNER = "PHASE3_RUNNER"  # Trail for extended move
 
+class StopPhase(IntEnum):
+    """Stop phase classification (int codes, usable in compiled scans)."""
+    PHASE1_STATISTICAL = 0  # Tight statistical stop
+    PHASE2_EXPANSION = 1  # Wider structural stop
+    PHASE3_RUNNER = 2  # Trail for extended move
 
-@dataclass
+
+@dataclass(slots=True)
 class StopUpdate:
     """Stop update event record."""
     
@@ -41,12 +56,192 @@ class StopUpdate:
     def __repr__(self) -> str:
         """String representation."""
         return (
-            f"StopUpdate({self.old_phase} → {self.new_phase}, "
+            f"StopUpdate({self.old_phase.name} → {self.new_phase.name}, "
             f"stop {self.old_stop:.2f} → {self.new_stop:.2f}, "
             f"MFE={self.current_mfe_r:.2f}R, reason='{self.reason}')"
         )
 
 
+# Phases bound once and compared by identity; StopPhase.<NAME> goes
+# through the enum metaclass
+_PHASE1 = StopPhase.PHASE1_STATISTICAL
+_PHASE2 = StopPhase.PHASE2_EXPANSION
+_PHASE3 = StopPhase.PHASE3_RUNNER
+
+# Phases by int code, and update reasons, for the compiled path scan
+_PHASES = (_PHASE1, _PHASE2, _PHASE3)
+_EVENT_NONE = 0
+_EVENT_BREAKEVEN = 1
+_EVENT_PHASE2 = 2
+_EVENT_RUNNER = 3
+_EVENT_ANCHOR = 4
+
+# One record per trade for simulate_stops
+STOP_PARAMS_DTYPE = np.dtype([
+    ("direction", np.int8),  # +1 long, -1 short
+    ("entry_price", np.float64),
+    ("initial_risk", np.float64),
+    ("phase1_distance", np.float64),  # Already scaled by stop_multiplier
+    ("phase2_trigger", np.float64),
+    ("runner_trigger", np.float64),
+    ("breakeven_trigger", np.float64),
+    ("structural_anchor", np.float64),  # NaN if none
+    ("structural_buffer", np.float64),
+    ("runner_allowed", np.bool_),  # p_extension >= p_extension_threshold
+])
+
+
+@njit(cache=True)
+def _scan_two_phase(
+    mfe_r: np.ndarray,
+    anchors: np.ndarray,
+    sign: float,
+    entry_price: float,
+    initial_risk: float,
+    phase2_trigger: float,
+    runner_trigger: float,
+    breakeven_trigger: float,
+    structural_buffer: float,
+    runner_allowed: bool,
+    stop: float,
+    phase: int,
+    highest_mfe_r: float,
+    breakeven_applied: bool,
+    anchor: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, bool, float]:
+    """Compiled TwoPhaseStopManager.update loop over a trade path.
+    
+    Phases are StopPhase int codes. A NaN anchor means no
+    structural anchor (or, in anchors, no new anchor on that bar).
+    
+    Returns:
+        (stop per bar, phase per bar, _EVENT_* reason code per bar,
+        highest MFE, breakeven applied, structural anchor)
+    """
+    n = len(mfe_r)
+    stops = np.empty(n)
+    phases = np.empty(n, dtype=np.int8)
+    events = np.zeros(n, dtype=np.int8)
+    
+    for t in range(n):
+        mfe = mfe_r[t]
+        if mfe > highest_mfe_r:
+            highest_mfe_r = mfe
+        if not np.isnan(anchors[t]):
+            anchor = anchors[t]
+        
+        # Phase 2 stop: structural anchor with buffer, else entry -/+ 0.5R
+        if np.isnan(anchor):
+            phase2_stop = entry_price - sign * (initial_risk * 0.5)
+        else:
+            phase2_stop = anchor - sign * structural_buffer
+        
+        new_stop = stop
+        new_phase = phase
+        event = _EVENT_NONE
+        if phase == 0:
+            if not breakeven_applied and mfe >= breakeven_trigger:
+                new_stop = stop if sign * (stop - entry_price) > 0 else entry_price
+                if new_stop != stop:
+                    breakeven_applied = True
+                    event = _EVENT_BREAKEVEN
+            elif mfe >= phase2_trigger:
+                new_phase = 1
+                new_stop = stop if sign * (stop - phase2_stop) > 0 else phase2_stop
+                event = _EVENT_PHASE2
+        elif phase == 1:
+            if mfe >= runner_trigger and runner_allowed:
+                new_phase = 2
+                event = _EVENT_RUNNER
+            if sign * (phase2_stop - stop) > 0:
+                new_stop = phase2_stop
+                event = _EVENT_ANCHOR
+        
+        if new_stop == stop and new_phase == phase:
+            event = _EVENT_NONE
+        stop = new_stop
+        phase = new_phase
+        stops[t] = stop
+        phases[t] = phase
+        events[t] = event
+    
+    return stops, phases, events, highest_mfe_r, breakeven_applied, anchor
+
+
+@njit(parallel=True, cache=True)
+def _simulate_two_phase(
+    mfe_r: np.ndarray,
+    anchors: np.ndarray,
+    sign: np.ndarray,
+    entry_price: np.ndarray,
+    initial_risk: np.ndarray,
+    phase1_distance: np.ndarray,
+    phase2_trigger: np.ndarray,
+    runner_trigger: np.ndarray,
+    breakeven_trigger: np.ndarray,
+    structural_anchor: np.ndarray,
+    structural_buffer: np.ndarray,
+    runner_allowed: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run _scan_two_phase for each trade (row), in parallel across trades."""
+    n, m = mfe_r.shape
+    stops = np.empty((n, m))
+    phases = np.empty((n, m), dtype=np.int8)
+    
+    for t in prange(n):
+        trade_stops, trade_phases, _, _, _, _ = _scan_two_phase(
+            mfe_r[t], anchors[t], sign[t], entry_price[t], initial_risk[t],
+            phase2_trigger[t], runner_trigger[t], breakeven_trigger[t],
+            structural_buffer[t], runner_allowed[t],
+            entry_price[t] - sign[t] * phase1_distance[t], 0, 0.0, False,
+            structural_anchor[t],
+        )
+        stops[t] = trade_stops
+        phases[t] = trade_phases
+    
+    return stops, phases
+
+
+def simulate_stops(
+    mfe_r: np.ndarray,
+    params: np.ndarray,
+    structural_anchors: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate two-phase stops for many trades in one compiled pass.
+    
+    Row t gives the same stops and phases as a fresh TwoPhaseStopManager
+    for trade t updated bar by bar, without building managers or
+    StopUpdates. Trades are run in parallel when numba is available.
+    
+    Args:
+        mfe_r: MFE in R-multiples, shape (n_trades, n_bars); pad shorter
+            trades with NaN (the stop holds on NaN bars)
+        params: Per-trade parameters, array of STOP_PARAMS_DTYPE records
+        structural_anchors: Updated structural anchor per bar, same shape
+            as mfe_r, NaN where there is none (None if never updated)
+        
+    Returns:
+        (stop price per trade and bar, StopPhase int code per trade and bar)
+    """
+    mfe_r = np.ascontiguousarray(mfe_r, dtype=np.float64)
+    if structural_anchors is None:
+        anchors = np.full(mfe_r.shape, np.nan)
+    else:
+        anchors = np.ascontiguousarray(structural_anchors, dtype=np.float64)
+    params = np.asarray(params, dtype=STOP_PARAMS_DTYPE)
+    
+    def field(name, dtype=np.float64):
+        return np.ascontiguousarray(params[name], dtype=dtype)
+    
+    return _simulate_two_phase(
+        mfe_r, anchors, field("direction"), field("entry_price"),
+        field("initial_risk"), field("phase1_distance"), field("phase2_trigger"),
+        field("runner_trigger"), field("breakeven_trigger"),
+        field("structural_anchor"), field("structural_buffer"),
+        field("runner_allowed", np.bool_),
+    )
+
+
 class TwoPhaseStopManager:
     """Manages two-phase stop evolution for a single trade.
     
@@ -94,6 +289,7 @@ class TwoPhaseStopManager:
         p_extension_threshold: float = 0.42,
         stop_multiplier: float = 1.3,  # ✨ OPTIMIZATION: Widen stops to reduce noise stop-outs
         breakeven_trigger_r: float = 0.3,  # ✨ OPTIMIZATION: Move to breakeven at +0.3R MFE
+        record_updates: bool = True,
     ) -> None:
         """Initialize two-phase stop manager.
         
@@ -110,8 +306,13 @@ class TwoPhaseStopManager:
             p_extension_threshold: Min p_extension to enable runner
             stop_multiplier: Multiplier for initial stop distance (1.3 = 30% wider)
             breakeven_trigger_r: MFE threshold to move stop to breakeven
+            record_updates: Build and keep StopUpdates; if False only the
+                stop and phase move (update() returns None)
         """
         self.direction = direction.lower()
+        # Direction as a bool, and +1 long / -1 short for the compiled scan
+        self._is_long = self.direction == "long"
+        self._sign = 1.0 if self._is_long else -1.0
         self.entry_price = entry_price
         self.initial_risk = initial_risk
         self.phase1_distance = phase1_stop_distance * stop_multiplier  # ✨ Apply multiplier
@@ -123,14 +324,18 @@ class TwoPhaseStopManager:
         self.p_threshold = p_extension_threshold
         self.stop_multiplier = stop_multiplier
         self.breakeven_trigger = breakeven_trigger_r
+        # Phase 2 stop, recomputed only when the anchor changes (set it
+        # through update() / update_batch())
+        self._phase2_stop = self._compute_phase2_stop()
         
         # Current state
-        self.current_phase = StopPhase.PHASE1_STATISTICAL
+        self.current_phase = _PHASE1
         self.current_stop = self._compute_phase1_stop()
         self.highest_mfe_r = 0.0
         self.breakeven_applied = False  # ✨ Track if breakeven already applied
         
         # History
+        self.record_updates = record_updates
         self.stop_updates: list[StopUpdate] = []
     
     def _compute_phase1_stop(self) -> float:
@@ -139,7 +344,7 @@ class TwoPhaseStopManager:
         Returns:
             Stop price
         """
-        if self.direction == "long":
+        if self._is_long:
             return self.entry_price - self.phase1_distance
         else:  # short
             return self.entry_price + self.phase1_distance
@@ -154,13 +359,13 @@ class TwoPhaseStopManager:
         """
         if self.structural_anchor is None:
             # Fallback: OR opposite or entry - 0.5R
-            if self.direction == "long":
+            if self._is_long:
                 return self.entry_price - self.initial_risk * 0.5
             else:
                 return self.entry_price + self.initial_risk * 0.5
         
         # Use structural anchor with buffer
-        if self.direction == "long":
+        if self._is_long:
             return self.structural_anchor - self.structural_buffer
         else:  # short
             return self.structural_anchor + self.structural_buffer
@@ -190,6 +395,7 @@ class TwoPhaseStopManager:
         # Update structural anchor if provided
         if new_structural_anchor is not None:
             self.structural_anchor = new_structural_anchor
+            self._phase2_stop = self._compute_phase2_stop()
         
         old_stop = self.current_stop
         old_phase = self.current_phase
@@ -197,63 +403,72 @@ class TwoPhaseStopManager:
         new_phase = old_phase
         reason = ""
         
-        # Phase transition logic
-        if self.current_phase == StopPhase.PHASE1_STATISTICAL:
+        # Phase transition logic; most bars are spent in Phase 1
+        if old_phase is _PHASE1:
             # ✨ OPTIMIZATION: Check for breakeven move first (at +0.3R MFE)
             if not self.breakeven_applied and current_mfe_r >= self.breakeven_trigger:
                 # Move stop to breakeven (entry price)
                 new_stop = self.entry_price
                 # Ensure we're moving stop in favorable direction only
-                if self.direction == "long":
+                if self._is_long:
                     new_stop = max(new_stop, old_stop)
                 else:
                     new_stop = min(new_stop, old_stop)
                 
-                if new_stop != old_stop:  # Only record if actually moved
-                    self.breakeven_applied = True
-                    reason = f"Breakeven move at {current_mfe_r:.2f}R MFE"
-                    logger.info(f"Trade moved to breakeven: stop {old_stop:.2f} → {new_stop:.2f}")
+                if new_stop == old_stop:  # Only record if actually moved
+                    return None
+                self.breakeven_applied = True
+                reason = f"Breakeven move at {current_mfe_r:.2f}R MFE"
+                logger.info("Trade moved to breakeven: stop {:.2f} → {:.2f}", old_stop, new_stop)
             
             # Check for Phase 2 transition
             elif current_mfe_r >= self.phase2_trigger:
-                new_phase = StopPhase.PHASE2_EXPANSION
-                new_stop = self._compute_phase2_stop()
+                new_phase = _PHASE2
+                new_stop = self._phase2_stop
                 # Only move stop up (long) or down (short), never against direction
-                if self.direction == "long":
+                if self._is_long:
                     new_stop = max(new_stop, old_stop)
                 else:
                     new_stop = min(new_stop, old_stop)
                 reason = f"Phase 2 transition at {current_mfe_r:.2f}R MFE"
-                logger.info(f"Trade transition: Phase 1 → Phase 2, stop {old_stop:.2f} → {new_stop:.2f}")
+                logger.info("Trade transition: Phase 1 → Phase 2, stop {:.2f} → {:.2f}", old_stop, new_stop)
+            
+            else:
+                return None
         
-        elif self.current_phase == StopPhase.PHASE2_EXPANSION:
+        elif old_phase is _PHASE3:
+            # Trailing logic handled by trailing module
+            # This manager just tracks phase
+            return None
+        
+        else:  # Phase 2
             # Check for Phase 3 transition (runner)
             if current_mfe_r >= self.runner_trigger:
                 # Check p_extension gate
                 if self.p_extension is not None and self.p_extension >= self.p_threshold:
-                    new_phase = StopPhase.PHASE3_RUNNER
+                    new_phase = _PHASE3
                     reason = f"Runner enabled at {current_mfe_r:.2f}R (p={self.p_extension:.2f})"
-                    logger.info(f"Trade transition: Phase 2 → Phase 3 (runner)")
+                    logger.info("Trade transition: Phase 2 → Phase 3 (runner)")
                 else:
                     # Don't transition, but could tighten stop
                     pass
             
             # In Phase 2, can update structural stop if better level found
-            potential_stop = self._compute_phase2_stop()
-            if self.direction == "long" and potential_stop > old_stop:
+            potential_stop = self._phase2_stop
+            is_long = self._is_long
+            if is_long and potential_stop > old_stop:
                 new_stop = potential_stop
                 reason = "Updated structural anchor"
-            elif self.direction == "short" and potential_stop < old_stop:
+            elif not is_long and potential_stop < old_stop:
                 new_stop = potential_stop
                 reason = "Updated structural anchor"
         
-        elif self.current_phase == StopPhase.PHASE3_RUNNER:
-            # Trailing logic handled by trailing module
-            # This manager just tracks phase
-            pass
-        
         # Create update record if something changed
-        if new_stop != old_stop or new_phase != old_phase:
+        if new_stop != old_stop or new_phase is not old_phase:
+            if not self.record_updates:
+                self.current_stop = new_stop
+                self.current_phase = new_phase
+                return None
             update = StopUpdate(
                 timestamp=timestamp,
                 old_stop=old_stop,
@@ -270,6 +485,89 @@ class TwoPhaseStopManager:
         
         return None
     
+    def update_batch(
+        self,
+        mfe_r: np.ndarray,
+        timestamps: Sequence[datetime],
+        structural_anchors: Optional[np.ndarray] = None,
+    ) -> List[StopUpdate]:
+        """Apply a run of bars in one compiled pass.
+        
+        Equivalent to calling update() bar by bar, and continues from the
+        current state, e.g. to replay a whole trade in a backtest.
+        
+        Args:
+            mfe_r: Current MFE in R-multiples per bar
+            timestamps: Bar timestamps
+            structural_anchors: Updated structural anchor per bar, NaN
+                where there is none (None if never updated)
+            
+        Returns:
+            StopUpdates for the bars where the stop or phase changed (empty
+            if record_updates is False)
+        """
+        mfe_r = np.asarray(mfe_r, dtype=np.float64)
+        n = len(mfe_r)
+        if structural_anchors is None:
+            anchors = np.full(n, np.nan)
+        else:
+            anchors = np.asarray(structural_anchors, dtype=np.float64)
+        
+        old_stop = self.current_stop
+        old_code = int(self.current_phase)
+        stops, phases, events, highest, breakeven_applied, anchor = _scan_two_phase(
+            mfe_r, anchors, self._sign, float(self.entry_price), float(self.initial_risk),
+            float(self.phase2_trigger), float(self.runner_trigger),
+            float(self.breakeven_trigger), float(self.structural_buffer),
+            self.p_extension is not None and self.p_extension >= self.p_threshold,
+            float(old_stop), old_code, float(self.highest_mfe_r), self.breakeven_applied,
+            np.nan if self.structural_anchor is None else float(self.structural_anchor),
+        )
+        
+        updates = []
+        record = self.record_updates
+        for t in np.flatnonzero(events).tolist():
+            new_stop = float(stops[t])
+            new_code = int(phases[t])
+            if t > 0:
+                old_stop = float(stops[t - 1])
+                old_code = int(phases[t - 1])
+            mfe = float(mfe_r[t])
+            event = events[t]
+            if event == _EVENT_BREAKEVEN:
+                reason = f"Breakeven move at {mfe:.2f}R MFE"
+                logger.info("Trade moved to breakeven: stop {:.2f} → {:.2f}", old_stop, new_stop)
+            elif event == _EVENT_PHASE2:
+                reason = f"Phase 2 transition at {mfe:.2f}R MFE"
+                logger.info("Trade transition: Phase 1 → Phase 2, stop {:.2f} → {:.2f}", old_stop, new_stop)
+            elif event == _EVENT_RUNNER:
+                reason = f"Runner enabled at {mfe:.2f}R (p={self.p_extension:.2f})"
+            else:
+                reason = "Updated structural anchor"
+            if new_code == 2 and old_code == 1:
+                logger.info("Trade transition: Phase 2 → Phase 3 (runner)")
+            if not record:
+                continue
+            updates.append(StopUpdate(
+                timestamp=timestamps[t],
+                old_stop=old_stop,
+                new_stop=new_stop,
+                old_phase=_PHASES[old_code],
+                new_phase=_PHASES[new_code],
+                reason=reason,
+                current_mfe_r=mfe,
+            ))
+        
+        if n:
+            self.current_stop = float(stops[-1])
+            self.current_phase = _PHASES[int(phases[-1])]
+            self.highest_mfe_r = float(highest)
+            self.breakeven_applied = bool(breakeven_applied)
+            self.structural_anchor = None if np.isnan(anchor) else float(anchor)
+            self._phase2_stop = self._compute_phase2_stop()
+        self.stop_updates.extend(updates)
+        return updates
+    
     def check_stop_hit(self, current_price: float) -> bool:
         """Check if stop has been hit.
         
@@ -279,7 +577,7 @@ class TwoPhaseStopManager:
         Returns:
             True if stop hit, False otherwise
         """
-        if self.direction == "long":
+        if self._is_long:
             return current_price <= self.current_stop
         else:  # short
             return current_price >= self.current_stop
@@ -299,7 +597,7 @@ class TwoPhaseStopManager:
     @property
     def is_in_runner_phase(self) -> bool:
         """Check if trade is in runner phase."""
-        return self.current_phase == StopPhase.PHASE3_RUNNER
+        return self.current_phase is _PHASE3
     
     @property
     def phase(self) -> StopPhase:
@@ -313,28 +611,28 @@ class TwoPhaseStopManager:
 
 
 def compute_phase1_stop_from_mae_distribution(
-    winner_mae_values: list[float],
+    winner_mae_values: Union[Sequence[float], np.ndarray],
     percentile: float = 80.0,
 ) -> float:
     """Compute Phase 1 stop distance from winner MAE distribution.
     
     Args:
-        winner_mae_values: List of MAE values (R-multiples) from winning trades
+        winner_mae_values: MAE values (R-multiples) from winning trades, as a
+            list or array
         percentile: Percentile to use (e.g., 80th = accommodates 80% of winners)
         
     Returns:
         Stop distance in R-multiples
     """
-    import numpy as np
+    # MAE is negative, so take absolute value (a fresh array)
+    abs_mae = np.abs(np.asarray(winner_mae_values, dtype=np.float64))
     
-    if not winner_mae_values:
+    if abs_mae.size == 0:
         return 1.0  # Default fallback
     
-    # MAE is negative, so take absolute value
-    abs_mae = [abs(mae) for mae in winner_mae_values]
-    
-    # Get percentile
-    stop_r = np.percentile(abs_mae, percentile)
+    # Get percentile; np.percentile selects with a partial sort, and may
+    # reorder abs_mae in place since it is our own copy
+    stop_r = np.percentile(abs_mae, percentile, overwrite_input=True)
     
     return float(stop_r)
 
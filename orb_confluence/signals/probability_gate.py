@@ -14,14 +14,16 @@ Logic:
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
+import numpy as np
 from loguru import logger
 
 from ..playbooks.base import CandidateSignal
 
 
-@dataclass
+@dataclass(slots=True)
 class ProbabilityGateConfig:
     """Configuration for probability gating."""
     
@@ -49,7 +51,7 @@ class ProbabilityGateConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalWithProbability:
     """Signal with probability assessment."""
     
@@ -97,6 +99,10 @@ class ProbabilityGate:
             config: Gating configuration (uses defaults if None)
         """
         self.config = config or ProbabilityGateConfig()
+        # Hard-floor rejection reason with the floor pre-formatted
+        self._floor_reason = (
+            "p_extension {:.2f} < min_floor " + f"{self.config.p_min_floor:.2f}"
+        )
     
     def evaluate(
         self,
@@ -112,13 +118,14 @@ class ProbabilityGate:
         Returns:
             SignalWithProbability with gating decision
         """
-        # Check hard floor
-        if p_extension < self.config.p_min_floor:
+        config = self.config
+        soft_floor = config.p_soft_floor
+        runner_threshold = config.p_runner_threshold
+        
+        # Check hard floor (the common case; fields passed positionally)
+        if p_extension < config.p_min_floor:
             return SignalWithProbability(
-                signal=signal,
-                p_extension=p_extension,
-                passed_gate=False,
-                rejection_reason=f"p_extension {p_extension:.2f} < min_floor {self.config.p_min_floor:.2f}",
+                signal, p_extension, False, self._floor_reason.format(p_extension),
             )
         
         # Signal passes - determine adjustments
@@ -128,53 +135,158 @@ class ProbabilityGate:
         target_adjustment = 1.0
         
         # Check soft floor (reduce size)
-        if p_extension < self.config.p_soft_floor:
-            size_adjustment = self.config.reduced_size_factor
+        if p_extension < soft_floor:
+            size_adjustment = config.reduced_size_factor
             logger.debug(
-                f"Signal in soft floor zone (p={p_extension:.2f}), "
-                f"reducing size to {size_adjustment:.0%}"
+                "Signal in soft floor zone (p={:.2f}), reducing size to {:.0%}",
+                p_extension,
+                size_adjustment,
             )
         
         # Check runner threshold
-        if p_extension >= self.config.p_runner_threshold:
+        if p_extension >= runner_threshold:
             runner_enabled = True
-            logger.debug(f"Runner enabled for p={p_extension:.2f}")
+            logger.debug("Runner enabled for p={:.2f}", p_extension)
         
         # Adjust targets based on probability
-        if self.config.adjust_targets_by_prob:
-            if p_extension >= self.config.p_runner_threshold:
+        if config.adjust_targets_by_prob:
+            if runner_enabled:
                 # High probability - increase targets
-                target_adjustment = self.config.high_prob_target_mult
-            elif p_extension < self.config.p_soft_floor:
+                target_adjustment = config.high_prob_target_mult
+            elif p_extension < soft_floor:
                 # Low probability - decrease targets
-                target_adjustment = self.config.low_prob_target_mult
+                target_adjustment = config.low_prob_target_mult
         
+        # Positional fields: signal, p_extension, passed_gate,
+        # rejection_reason, size_adjustment, runner_enabled, target_adjustment
         return SignalWithProbability(
-            signal=signal,
-            p_extension=p_extension,
-            passed_gate=passed,
-            size_adjustment=size_adjustment,
-            runner_enabled=runner_enabled,
-            target_adjustment=target_adjustment,
+            signal, p_extension, passed, None,
+            size_adjustment, runner_enabled, target_adjustment,
         )
     
+    def _decide_batch(
+        self,
+        signals_with_probs: list[tuple[CandidateSignal, float]],
+    ) -> tuple[np.ndarray, ...]:
+        """Gate decisions for many signals as arrays.
+        
+        Args:
+            signals_with_probs: List of (signal, p_extension) tuples
+            
+        Returns:
+            (rejected, reduced size, runner enabled, size adjustment,
+            target adjustment) per signal
+        """
+        config = self.config
+        probs = np.fromiter(
+            (p_ext for _, p_ext in signals_with_probs),
+            dtype=np.float64,
+            count=len(signals_with_probs),
+        )
+        
+        # Same comparisons as evaluate(), so NaN passes at full size
+        rejected = probs < config.p_min_floor
+        reduced = probs < config.p_soft_floor
+        runner = probs >= config.p_runner_threshold
+        sizes = np.where(reduced, config.reduced_size_factor, 1.0)
+        if config.adjust_targets_by_prob:
+            targets = np.select(
+                [runner, reduced],
+                [config.high_prob_target_mult, config.low_prob_target_mult],
+                1.0,
+            )
+        else:
+            targets = np.ones(len(probs))
+        
+        return rejected, reduced, runner, sizes, targets
+    
     def batch_evaluate(
         self,
         signals_with_probs: list[tuple[CandidateSignal, float]],
     ) -> list[SignalWithProbability]:
         """Evaluate multiple signals.
         
+        Same decisions as evaluate() per signal, with the threshold checks
+        done as array comparisons over all probabilities at once.
+        
         Args:
             signals_with_probs: List of (signal, p_extension) tuples
             
         Returns:
             List of SignalWithProbability
         """
+        rejected, reduced, runner, sizes, targets = self._decide_batch(signals_with_probs)
+        
+        floor_reason = self._floor_reason
         results = []
+        for (signal, p_ext), reject, soft, run, size, target in zip(
+            signals_with_probs,
+            rejected.tolist(),
+            reduced.tolist(),
+            runner.tolist(),
+            sizes.tolist(),
+            targets.tolist(),
+        ):
+            # Positional fields: signal, p_extension, passed_gate,
+            # rejection_reason, size_adjustment, runner_enabled,
+            # target_adjustment
+            if reject:
+                results.append(SignalWithProbability(
+                    signal, p_ext, False, floor_reason.format(p_ext),
+                ))
+                continue
+            if soft:
+                logger.debug(
+                    "Signal in soft floor zone (p={:.2f}), reducing size to {:.0%}",
+                    p_ext,
+                    size,
+                )
+            if run:
+                logger.debug("Runner enabled for p={:.2f}", p_ext)
+            results.append(SignalWithProbability(
+                signal, p_ext, True, None, size, run, target,
+            ))
         
-        for signal, p_ext in signals_with_probs:
-            result = self.evaluate(signal, p_ext)
-            results.append(result)
+        return results
+    
+    def evaluate_and_filter(
+        self,
+        signals_with_probs: list[tuple[CandidateSignal, float]],
+    ) -> list[SignalWithProbability]:
+        """Evaluate multiple signals and keep only those that pass.
+        
+        Same result as filter_passing_signals(batch_evaluate(...)), in one
+        pass that never builds results for rejected signals.
+        
+        Args:
+            signals_with_probs: List of (signal, p_extension) tuples
+            
+        Returns:
+            List of passing SignalWithProbability, in input order
+        """
+        rejected, reduced, runner, sizes, targets = self._decide_batch(signals_with_probs)
+        
+        keep = np.flatnonzero(~rejected)
+        results = []
+        for i, soft, run, size, target in zip(
+            keep.tolist(),
+            reduced[keep].tolist(),
+            runner[keep].tolist(),
+            sizes[keep].tolist(),
+            targets[keep].tolist(),
+        ):
+            signal, p_ext = signals_with_probs[i]
+            if soft:
+                logger.debug(
+                    "Signal in soft floor zone (p={:.2f}), reducing size to {:.0%}",
+                    p_ext,
+                    size,
+                )
+            if run:
+                logger.debug("Runner enabled for p={:.2f}", p_ext)
+            results.append(SignalWithProbability(
+                signal, p_ext, True, None, size, run, target,
+            ))
         
         return results
     
@@ -193,6 +305,10 @@ class ProbabilityGate:
         return [r for r in results if r.passed_gate]
 
 
+# Shared gate for the config=None path (the gate holds no per-call state)
+_DEFAULT_GATE = ProbabilityGate()
+
+
 def apply_probability_gate(
     signal: CandidateSignal,
     p_extension: float,
@@ -208,16 +324,27 @@ def apply_probability_gate(
     Returns:
         SignalWithProbability with gating decision
     """
-    gate = ProbabilityGate(config=config)
+    gate = _DEFAULT_GATE if config is None else ProbabilityGate(config=config)
     return gate.evaluate(signal, p_extension)
 
 
+class RunnerParams(NamedTuple):
+    """Runner parameters for a given extension probability."""
+    
+    runner_target_r: float
+    trail_factor: float
+    p_extension: float
+
+
+# Results are immutable, so repeated probabilities (e.g. from a binned
+# model) share one cached tuple
+@lru_cache(maxsize=256)
 def compute_runner_params(
     p_extension: float,
     base_target_r: float = 2.0,
     base_trail_factor: float = 2.0,
     high_prob_multiplier: float = 1.5,
-) -> dict:
+) -> RunnerParams:
     """Compute runner parameters based on probability.
     
     Higher probability → more aggressive runner settings.
@@ -229,7 +356,7 @@ def compute_runner_params(
         high_prob_multiplier: Multiplier for high prob
         
     Returns:
-        Dictionary with runner parameters
+        RunnerParams (use _asdict() for a dictionary)
     """
     # Scale target by probability
     # p=0.4 → 0.8x base, p=0.6 → 1.2x base, p=0.8 → 1.5x base
@@ -243,11 +370,7 @@ def compute_runner_params(
     trail_factor = base_trail_factor * (1.5 - prob_scale * 0.5)
     trail_factor = max(1.0, trail_factor)  # Min 1.0x ATR
     
-    return {
-        'runner_target_r': runner_target_r,
-        'trail_factor': trail_factor,
-        'p_extension': p_extension,
-    }
+    return RunnerParams(runner_target_r, trail_factor, p_extension)
 
 
 class RunnerActivationManager:
@@ -313,25 +436,25 @@ class RunnerActivationManager:
             return False
         
         if current_mfe_r > self.max_mfe_r:
-            logger.debug(f"MFE {current_mfe_r:.2f}R too high for runner activation")
+            logger.debug("MFE {:.2f}R too high for runner activation", current_mfe_r)
             return False
         
         # Activate runner
         self.runner_activated = True
         logger.info(
-            f"Runner activated: MFE={current_mfe_r:.2f}R, p={p_extension:.2f}"
+            "Runner activated: MFE={:.2f}R, p={:.2f}", current_mfe_r, p_extension
         )
         
         return True
     
-    def get_runner_params(self, p_extension: float) -> dict:
+    def get_runner_params(self, p_extension: float) -> RunnerParams:
         """Get runner parameters based on probability.
         
         Args:
             p_extension: Extension probability
             
         Returns:
-            Dictionary with runner parameters
+            RunnerParams
         """
         return compute_runner_params(p_extension)
 
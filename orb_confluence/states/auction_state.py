@@ -16,6 +16,19 @@ from typing import Dict, Optional, Tuple
 import numpy as np
 from loguru import logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Fallback: create dummy decorator
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+
 from orb_confluence.features.auction_metrics import AuctionMetrics, GapType
 from orb_confluence.features.or_layers import DualORState
 
@@ -30,6 +43,210 @@ class AuctionState(str, Enum):
     MIXED = "MIXED"  # Ambiguous
 
 
+# States with a score, in classify() order (ties go to the earlier state)
+_SCORED_STATES = (
+    AuctionState.INITIATIVE,
+    AuctionState.COMPRESSION,
+    AuctionState.GAP_REV,
+    AuctionState.BALANCED,
+    AuctionState.INVENTORY_FIX,
+)
+
+# Gap types that can set up a GAP_REV
+_FULL_GAPS = (GapType.FULL_UP, GapType.FULL_DOWN)
+
+
+# State scores on plain floats (compiled on first use, cached on disk)
+@njit(cache=True)
+def _initiative_score(
+    drive_energy: float,
+    rotations: float,
+    volume_z: float,
+    drive_threshold: float,
+    rotations_max: float,
+    vol_z_threshold: float,
+) -> float:
+    """INITIATIVE score 0-1, see AuctionStateClassifier._score_initiative."""
+    score = 0.0
+    
+    # High drive energy
+    if drive_energy >= drive_threshold:
+        score += 0.4
+    else:
+        score += drive_energy / drive_threshold * 0.4
+    
+    # Low rotations
+    if rotations <= rotations_max:
+        score += 0.3
+    else:
+        penalty = (rotations - rotations_max) * 0.1
+        score += max(0.0, 0.3 - penalty)
+    
+    # Volume participation
+    if volume_z >= vol_z_threshold:
+        score += 0.3
+    elif volume_z > 0:
+        score += volume_z / vol_z_threshold * 0.3
+    
+    return min(score, 1.0)
+
+
+@njit(cache=True)
+def _compression_score(
+    width_norm: float,
+    drive_energy: float,
+    volume_z: float,
+) -> float:
+    """COMPRESSION score 0-1 (NaN width_norm if unknown)."""
+    score = 0.0
+    
+    # Narrow width (use primary width norm)
+    if not np.isnan(width_norm):
+        # Assume compression_width_pct represents target normalized width
+        # E.g., if width_norm < 0.5, strong compression
+        compression_target = 0.5
+        if width_norm <= compression_target:
+            score += 0.5
+        else:
+            # Decay score as width increases
+            score += max(0.0, 0.5 * (1 - (width_norm - compression_target)))
+    
+    # Low drive energy
+    if drive_energy <= 0.3:
+        score += 0.3
+    else:
+        score += max(0.0, 0.3 * (1 - drive_energy))
+    
+    # Low volume
+    if volume_z < 0:
+        score += 0.2
+    
+    return min(score, 1.0)
+
+
+@njit(cache=True)
+def _gap_reversion_score(
+    is_full_gap: bool,
+    gap_size_norm: float,
+    max_wick_ratio: float,
+    drive_energy: float,
+    gap_threshold: float,
+) -> float:
+    """GAP_REV score 0-1."""
+    # Must have significant gap
+    if not is_full_gap:
+        return 0.0
+    
+    if gap_size_norm < gap_threshold:
+        return 0.0
+    
+    score = 0.0
+    
+    # Large gap
+    if gap_size_norm >= gap_threshold:
+        score += 0.5
+    
+    # Failure to extend (high wick ratio indicates rejection)
+    if max_wick_ratio > 1.0:
+        score += 0.3
+    
+    # Low drive (gap not extending)
+    if drive_energy < 0.4:
+        score += 0.2
+    
+    return min(score, 1.0)
+
+
+@njit(cache=True)
+def _balanced_score(
+    rotations: float,
+    volume_ratio: float,
+    drive_energy: float,
+    balanced_rotations: float,
+) -> float:
+    """BALANCED score 0-1."""
+    score = 0.0
+    
+    # High rotations
+    if rotations >= balanced_rotations:
+        score += 0.5
+    else:
+        score += rotations / balanced_rotations * 0.5
+    
+    # Moderate volume (not spike, not dead)
+    if 0.8 <= volume_ratio <= 1.3:
+        score += 0.3
+    
+    # Moderate drive (not trending, not dead)
+    if 0.3 <= drive_energy <= 0.6:
+        score += 0.2
+    
+    return min(score, 1.0)
+
+
+@njit(cache=True)
+def _inventory_fix_score(
+    overnight_inventory_bias: float,
+    open_vs_prior_mid: float,
+    drive_energy: float,
+    inventory_threshold: float,
+) -> float:
+    """INVENTORY_FIX score 0-1."""
+    score = 0.0
+    
+    # Strong overnight inventory bias
+    if abs(overnight_inventory_bias) >= inventory_threshold:
+        score += 0.5
+    
+    # Open opposite to overnight bias (correction)
+    # If overnight was long-biased and open is below, that's a fix
+    if abs(open_vs_prior_mid) > 0.3:
+        # Check if direction is opposite to overnight bias
+        if open_vs_prior_mid * overnight_inventory_bias < 0:
+            score += 0.3
+    
+    # Moderate drive (some correction movement)
+    if 0.3 <= drive_energy <= 0.7:
+        score += 0.2
+    
+    return min(score, 1.0)
+
+
+@njit(cache=True)
+def _state_scores(
+    drive_energy: float,
+    rotations: float,
+    volume_z: float,
+    volume_ratio: float,
+    width_norm: float,
+    is_full_gap: bool,
+    gap_size_norm: float,
+    max_wick_ratio: float,
+    overnight_inventory_bias: float,
+    open_vs_prior_mid: float,
+    drive_threshold: float,
+    rotations_max: float,
+    vol_z_threshold: float,
+    gap_threshold: float,
+    balanced_rotations: float,
+    inventory_threshold: float,
+) -> np.ndarray:
+    """All state scores in one compiled call, in _SCORED_STATES order."""
+    scores = np.empty(5)
+    scores[0] = _initiative_score(
+        drive_energy, rotations, volume_z, drive_threshold, rotations_max, vol_z_threshold
+    )
+    scores[1] = _compression_score(width_norm, drive_energy, volume_z)
+    scores[2] = _gap_reversion_score(
+        is_full_gap, gap_size_norm, max_wick_ratio, drive_energy, gap_threshold
+    )
+    scores[3] = _balanced_score(rotations, volume_ratio, drive_energy, balanced_rotations)
+    scores[4] = _inventory_fix_score(
+        overnight_inventory_bias, open_vs_prior_mid, drive_energy, inventory_threshold
+    )
+    return scores
+
+
 @dataclass
 class StateClassification:
     """Auction state classification result."""
@@ -108,29 +325,31 @@ class AuctionStateClassifier:
         Returns:
             StateClassification with state and confidence
         """
-        # Compute scores for each state
-        scores = {}
-        
-        # INITIATIVE score
-        scores[AuctionState.INITIATIVE] = self._score_initiative(auction_metrics)
-        
-        # COMPRESSION score
-        scores[AuctionState.COMPRESSION] = self._score_compression(
-            auction_metrics, dual_or
+        # Compute scores for each state, in _SCORED_STATES order
+        width_norm = dual_or.primary_width_norm
+        scores = _state_scores(
+            auction_metrics.drive_energy,
+            auction_metrics.rotations,
+            auction_metrics.volume_z,
+            auction_metrics.volume_ratio,
+            np.nan if width_norm is None else width_norm,
+            auction_metrics.gap_type in _FULL_GAPS,
+            auction_metrics.gap_size_norm,
+            auction_metrics.max_wick_ratio,
+            auction_metrics.overnight_inventory_bias,
+            auction_metrics.open_vs_prior_mid,
+            self.drive_threshold,
+            self.rotations_max,
+            self.vol_z_threshold,
+            self.gap_threshold,
+            self.balanced_rotations,
+            self.inventory_threshold,
         )
+        score_values = scores.tolist()
         
-        # GAP_REV score
-        scores[AuctionState.GAP_REV] = self._score_gap_reversion(auction_metrics)
-        
-        # BALANCED score
-        scores[AuctionState.BALANCED] = self._score_balanced(auction_metrics)
-        
-        # INVENTORY_FIX score
-        scores[AuctionState.INVENTORY_FIX] = self._score_inventory_fix(auction_metrics)
-        
-        # Select highest score
-        max_state = max(scores, key=scores.get)
-        max_score = scores[max_state]
+        # Select highest score (first state on ties)
+        max_index = int(scores.argmax())
+        max_score = score_values[max_index]
         
         # If max score below threshold, classify as MIXED
         if max_score < 0.5:
@@ -138,19 +357,19 @@ class AuctionStateClassifier:
             confidence = 1.0 - max_score  # Inverse confidence
             reason = "No clear state pattern"
         else:
-            state = max_state
+            state = _SCORED_STATES[max_index]
             # Normalize confidence (softmax-style)
-            confidence = self._compute_confidence(scores, max_state)
+            confidence = self._compute_confidence(scores, max_index)
             reason = self._generate_reason(state, auction_metrics, dual_or)
         
         logger.debug(
-            f"Classified state: {state.value} (conf={confidence:.2f}) - {reason}"
+            "Classified state: {} (conf={:.2f}) - {}", state.value, confidence, reason
         )
         
         return StateClassification(
             state=state,
             confidence=confidence,
-            state_scores=scores,
+            state_scores=dict(zip(_SCORED_STATES, score_values)),
             reason=reason,
         )
     
@@ -163,28 +382,10 @@ class AuctionStateClassifier:
         Returns:
             Score 0-1
         """
-        score = 0.0
-        
-        # High drive energy
-        if metrics.drive_energy >= self.drive_threshold:
-            score += 0.4
-        else:
-            score += metrics.drive_energy / self.drive_threshold * 0.4
-        
-        # Low rotations
-        if metrics.rotations <= self.rotations_max:
-            score += 0.3
-        else:
-            penalty = (metrics.rotations - self.rotations_max) * 0.1
-            score += max(0, 0.3 - penalty)
-        
-        # Volume participation
-        if metrics.volume_z >= self.vol_z_threshold:
-            score += 0.3
-        elif metrics.volume_z > 0:
-            score += metrics.volume_z / self.vol_z_threshold * 0.3
-        
-        return min(score, 1.0)
+        return _initiative_score(
+            metrics.drive_energy, metrics.rotations, metrics.volume_z,
+            self.drive_threshold, self.rotations_max, self.vol_z_threshold,
+        )
     
     def _score_compression(
         self,
@@ -200,30 +401,12 @@ class AuctionStateClassifier:
         Returns:
             Score 0-1
         """
-        score = 0.0
-        
-        # Narrow width (use primary width norm)
-        if dual_or.primary_width_norm is not None:
-            # Assume compression_width_pct represents target normalized width
-            # E.g., if width_norm < 0.5, strong compression
-            compression_target = 0.5
-            if dual_or.primary_width_norm <= compression_target:
-                score += 0.5
-            else:
-                # Decay score as width increases
-                score += max(0, 0.5 * (1 - (dual_or.primary_width_norm - compression_target)))
-        
-        # Low drive energy
-        if metrics.drive_energy <= 0.3:
-            score += 0.3
-        else:
-            score += max(0, 0.3 * (1 - metrics.drive_energy))
-        
-        # Low volume
-        if metrics.volume_z < 0:
-            score += 0.2
-        
-        return min(score, 1.0)
+        width_norm = dual_or.primary_width_norm
+        return _compression_score(
+            np.nan if width_norm is None else width_norm,
+            metrics.drive_energy,
+            metrics.volume_z,
+        )
     
     def _score_gap_reversion(self, metrics: AuctionMetrics) -> float:
         """Score GAP_REV state.
@@ -234,28 +417,10 @@ class AuctionStateClassifier:
         Returns:
             Score 0-1
         """
-        # Must have significant gap
-        if metrics.gap_type not in [GapType.FULL_UP, GapType.FULL_DOWN]:
-            return 0.0
-        
-        if metrics.gap_size_norm < self.gap_threshold:
-            return 0.0
-        
-        score = 0.0
-        
-        # Large gap
-        if metrics.gap_size_norm >= self.gap_threshold:
-            score += 0.5
-        
-        # Failure to extend (high wick ratio indicates rejection)
-        if metrics.max_wick_ratio > 1.0:
-            score += 0.3
-        
-        # Low drive (gap not extending)
-        if metrics.drive_energy < 0.4:
-            score += 0.2
-        
-        return min(score, 1.0)
+        return _gap_reversion_score(
+            metrics.gap_type in _FULL_GAPS, metrics.gap_size_norm,
+            metrics.max_wick_ratio, metrics.drive_energy, self.gap_threshold,
+        )
     
     def _score_balanced(self, metrics: AuctionMetrics) -> float:
         """Score BALANCED state.
@@ -266,23 +431,10 @@ class AuctionStateClassifier:
         Returns:
             Score 0-1
         """
-        score = 0.0
-        
-        # High rotations
-        if metrics.rotations >= self.balanced_rotations:
-            score += 0.5
-        else:
-            score += metrics.rotations / self.balanced_rotations * 0.5
-        
-        # Moderate volume (not spike, not dead)
-        if 0.8 <= metrics.volume_ratio <= 1.3:
-            score += 0.3
-        
-        # Moderate drive (not trending, not dead)
-        if 0.3 <= metrics.drive_energy <= 0.6:
-            score += 0.2
-        
-        return min(score, 1.0)
+        return _balanced_score(
+            metrics.rotations, metrics.volume_ratio, metrics.drive_energy,
+            self.balanced_rotations,
+        )
     
     def _score_inventory_fix(self, metrics: AuctionMetrics) -> float:
         """Score INVENTORY_FIX state.
@@ -293,46 +445,32 @@ class AuctionStateClassifier:
         Returns:
             Score 0-1
         """
-        score = 0.0
-        
-        # Strong overnight inventory bias
-        if abs(metrics.overnight_inventory_bias) >= self.inventory_threshold:
-            score += 0.5
-        
-        # Open opposite to overnight bias (correction)
-        # If overnight was long-biased and open is below, that's a fix
-        if abs(metrics.open_vs_prior_mid) > 0.3:
-            # Check if direction is opposite to overnight bias
-            if metrics.open_vs_prior_mid * metrics.overnight_inventory_bias < 0:
-                score += 0.3
-        
-        # Moderate drive (some correction movement)
-        if 0.3 <= metrics.drive_energy <= 0.7:
-            score += 0.2
-        
-        return min(score, 1.0)
+        return _inventory_fix_score(
+            metrics.overnight_inventory_bias, metrics.open_vs_prior_mid,
+            metrics.drive_energy, self.inventory_threshold,
+        )
     
     def _compute_confidence(
         self,
-        scores: Dict[AuctionState, float],
-        selected_state: AuctionState,
+        scores: np.ndarray,
+        selected_index: int,
     ) -> float:
         """Compute confidence via softmax-style normalization.
         
         Args:
-            scores: State scores
-            selected_state: Selected state
+            scores: State scores, in _SCORED_STATES order
+            selected_index: Index of the selected state
             
         Returns:
             Confidence 0-1
         """
         # Softmax with temperature
         temperature = 2.0
-        exp_scores = {s: np.exp(score / temperature) for s, score in scores.items()}
-        total = sum(exp_scores.values())
+        exp_scores = np.exp(scores / temperature)
+        total = exp_scores.sum()
         
         if total > 0:
-            confidence = exp_scores[selected_state] / total
+            confidence = exp_scores[selected_index] / total
         else:
             confidence = 0.5
         
@@ -19,6 +19,12 @@ import pandas as pd
 from loguru import logger
 
 
+# Breakout delay buckets (minutes) and their upper edges, see
+# ContextExclusionMatrix.create_signature
+_DELAY_EDGES = np.array([10.0, 25.0, 40.0])
+_DELAY_BUCKETS = np.array(["0-10", "10-25", "25-40", ">40"], dtype=object)
+
+
 @dataclass
 class ContextSignature:
     """Multi-dimensional context signature for trade classification."""
@@ -207,30 +213,33 @@ class ContextExclusionMatrix:
             for q in [0.33, 0.67]
         ]
         
-        # Create signatures for all trades
-        trades_df = trades_df.copy()
-        trades_df["context_signature"] = trades_df.apply(
-            lambda row: self.create_signature(
-                or_width_norm=row[or_width_norm_col],
-                breakout_delay=row[breakout_delay_col],
-                volume_quality=row[volume_quality_col],
-                auction_state=row[auction_state_col],
-                gap_type=row[gap_type_col],
-            ),
-            axis=1,
-        )
+        # Bucket all trades at once, with the same <= bin edges as
+        # create_signature (NaN lands in the top bucket, as it does there)
+        or_quartiles = np.searchsorted(
+            self.width_quartiles, trades_df[or_width_norm_col].to_numpy(dtype=float)
+        ) + 1
+        delay_buckets = _DELAY_BUCKETS[np.searchsorted(
+            _DELAY_EDGES, trades_df[breakout_delay_col].to_numpy(dtype=float)
+        )]
+        vol_terciles = np.searchsorted(
+            self.volume_terciles, trades_df[volume_quality_col].to_numpy(dtype=float)
+        ) + 1
         
-        # Group by context and compute metrics
-        grouped = trades_df.groupby("context_signature")
-        
-        for signature, group in grouped:
-            cell = self._compute_cell_metrics(
-                signature=signature,
-                group=group,
-                realized_r_col=realized_r_col,
-                p_extension_col=p_extension_col,
-            )
-            self.cells[signature] = cell
+        # Compute metrics for every context at once
+        p_values = None
+        if p_extension_col and p_extension_col in trades_df.columns:
+            p_values = trades_df[p_extension_col].to_numpy(dtype=float)
+        self.cells = self._compute_cell_metrics(
+            keys=[
+                or_quartiles,
+                delay_buckets,
+                vol_terciles,
+                trades_df[auction_state_col].to_numpy(),
+                trades_df[gap_type_col].to_numpy(),
+            ],
+            r_values=trades_df[realized_r_col].to_numpy(dtype=float),
+            p_values=p_values,
+        )
         
         # Apply exclusion rules
         self._apply_exclusion_rules()
@@ -347,57 +356,102 @@ class ContextExclusionMatrix:
     
     def _compute_cell_metrics(
         self,
-        signature: ContextSignature,
-        group: pd.DataFrame,
-        realized_r_col: str,
-        p_extension_col: Optional[str],
-    ) -> ContextCell:
-        """Compute metrics for a context cell.
+        keys: List[np.ndarray],
+        r_values: np.ndarray,
+        p_values: Optional[np.ndarray],
+    ) -> Dict[ContextSignature, ContextCell]:
+        """Compute metrics for all context cells in one grouped aggregation.
         
         Args:
-            signature: Context signature
-            group: DataFrame of trades in this context
-            realized_r_col: Column name for realized R
-            p_extension_col: Optional column for p(extension)
+            keys: Per-trade OR width quartile, delay bucket, volume tercile,
+                auction state and gap type
+            r_values: Realized R per trade
+            p_values: Optional p(extension) per trade
             
         Returns:
-            ContextCell with computed metrics
+            ContextCell per signature (signatures are built once per context)
         """
-        r_values = group[realized_r_col].values
-        n_trades = len(r_values)
-        n_winners = (r_values > 0).sum()
-        n_losers = (r_values < 0).sum()
+        # Winner / loser R with everything else masked out, so plain
+        # count and mean give the winner and loser stats
+        frame = pd.DataFrame({
+            "r": r_values,
+            "winner": np.where(r_values > 0, r_values, np.nan),
+            "loser": np.where(r_values < 0, r_values, np.nan),
+        })
+        aggregations = dict(
+            n_trades=("r", "size"),
+            expectancy=("r", "mean"),
+            std=("r", "std"),
+            n_winners=("winner", "count"),
+            avg_winner=("winner", "mean"),
+            n_losers=("loser", "count"),
+            avg_loser=("loser", "mean"),
+        )
+        if p_values is not None:
+            frame["p_extension"] = p_values
+            aggregations["p_extension_mean"] = ("p_extension", "mean")
+        
+        stats = frame.groupby(keys, dropna=False).agg(**aggregations)
         
-        expectancy = float(np.mean(r_values))
-        win_rate = n_winners / n_trades if n_trades > 0 else 0.0
-        avg_winner = float(np.mean(r_values[r_values > 0])) if n_winners > 0 else 0.0
-        avg_loser = float(np.mean(r_values[r_values < 0])) if n_losers > 0 else 0.0
+        n_trades = stats["n_trades"].to_numpy()
+        n_winners = stats["n_winners"].to_numpy()
+        expectancy = stats["expectancy"].to_numpy()
+        win_rate = n_winners / n_trades
         
         # Standard error and CI
-        stderr = float(np.std(r_values, ddof=1) / np.sqrt(n_trades)) if n_trades > 1 else 0.0
+        stderr = np.where(
+            n_trades > 1, stats["std"].to_numpy() / np.sqrt(n_trades), 0.0
+        )
         z_score = 1.96  # 95% CI
         ci_lower = expectancy - z_score * stderr
         ci_upper = expectancy + z_score * stderr
         
-        # P(extension) if available
-        p_ext_mean = None
-        if p_extension_col and p_extension_col in group.columns:
-            p_ext_mean = float(group[p_extension_col].mean())
-        
-        return ContextCell(
-            signature=signature,
-            n_trades=n_trades,
-            n_winners=n_winners,
-            n_losers=n_losers,
-            expectancy=expectancy,
-            win_rate=win_rate,
-            avg_winner=avg_winner,
-            avg_loser=avg_loser,
-            p_extension_mean=p_ext_mean,
-            expectancy_stderr=stderr,
-            expectancy_ci_lower=ci_lower,
-            expectancy_ci_upper=ci_upper,
-        )
+        if p_values is None:
+            p_ext_mean = [None] * len(stats)
+        else:
+            p_ext_mean = stats["p_extension_mean"].tolist()
+        
+        cells = {}
+        for (
+            (or_quartile, delay_bucket, vol_tercile, auction_state, gap_type),
+            n, wins, losses, mean_r, rate, avg_win, avg_loss, p_mean, se, lower, upper,
+        ) in zip(
+            stats.index,
+            n_trades.tolist(),
+            n_winners.tolist(),
+            stats["n_losers"].tolist(),
+            expectancy.tolist(),
+            win_rate.tolist(),
+            stats["avg_winner"].fillna(0.0).tolist(),
+            stats["avg_loser"].fillna(0.0).tolist(),
+            p_ext_mean,
+            stderr.tolist(),
+            ci_lower.tolist(),
+            ci_upper.tolist(),
+        ):
+            signature = ContextSignature(
+                or_width_quartile=int(or_quartile),
+                breakout_delay_bucket=delay_bucket,
+                volume_quality_tercile=int(vol_tercile),
+                auction_state=auction_state,
+                gap_type=gap_type,
+            )
+            cells[signature] = ContextCell(
+                signature=signature,
+                n_trades=n,
+                n_winners=wins,
+                n_losers=losses,
+                expectancy=mean_r,
+                win_rate=rate,
+                avg_winner=avg_win,
+                avg_loser=avg_loss,
+                p_extension_mean=p_mean,
+                expectancy_stderr=se,
+                expectancy_ci_lower=lower,
+                expectancy_ci_upper=upper,
+            )
+        
+        return cells
     
     def _apply_exclusion_rules(self) -> None:
         """Apply exclusion rules to all cells."""
@@ -198,14 +198,12 @@ class EnhancedMultiPlaybookStrategy(MultiPlaybookStrategy):
             
             # Apply TopStep risk management circuit breaker
             if self.risk_manager:
-                risk_status = self.risk_manager.can_trade()
-                if not risk_status.can_trade:
+                can_trade, adjusted_size = self.risk_manager.check_can_trade_fast(adjusted_size)
+                if not can_trade:
                     logger.warning(
-                        f"HALT: {signal.playbook_name} - TopStep limit: {', '.join(risk_status.reasons)}"
+                        f"HALT: {signal.playbook_name} - TopStep limit: {self.risk_manager.halt_reason_name}"
                     )
                     continue
-                
-                adjusted_size = self.risk_manager.get_position_size_limit(adjusted_size)
             
             # Update allocation
             allocation.final_size = adjusted_size
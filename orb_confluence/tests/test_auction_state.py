@@ -1,5 +1,6 @@
 """Tests for auction state classification."""
 
+import math
 from datetime import datetime
 
 import pytest
@@ -279,3 +280,46 @@ def test_confidence_bounds(initiative_metrics, wide_or):
     
     assert 0.0 <= result.confidence <= 1.0
 
+
+def test_confidence_is_softmax_of_scores(balanced_metrics, wide_or):
+    """Confidence is the selected state's softmax weight over all scores."""
+    classifier = AuctionStateClassifier()
+    
+    result = classifier.classify(balanced_metrics, wide_or)
+    
+    weights = {state: math.exp(score / 2.0) for state, score in result.state_scores.items()}
+    assert result.state == max(result.state_scores, key=result.state_scores.get)
+    assert result.confidence == pytest.approx(weights[result.state] / sum(weights.values()))
+
+
+@pytest.mark.parametrize("primary_width_norm, compression", [
+    (0.3, 0.8),
+    (1.2, 0.45),
+    (None, 0.3),
+])
+def test_state_scores_gap_reversion(gap_rev_metrics, wide_or, primary_width_norm, compression):
+    """Compiled scores match the reference scoring formulas."""
+    wide_or.primary_width_norm = primary_width_norm
+    
+    scores = AuctionStateClassifier().classify(gap_rev_metrics, wide_or).state_scores
+    
+    assert scores == pytest.approx({
+        AuctionState.INITIATIVE: 0.6318181818181818,
+        AuctionState.COMPRESSION: compression,
+        AuctionState.GAP_REV: 1.0,
+        AuctionState.BALANCED: 0.6333333333333333,
+        AuctionState.INVENTORY_FIX: 0.0,
+    })
+
+
+def test_state_scores_balanced(balanced_metrics, wide_or):
+    """Compiled scores match the reference scoring formulas."""
+    scores = AuctionStateClassifier().classify(balanced_metrics, wide_or).state_scores
+    
+    assert scores == pytest.approx({
+        AuctionState.INITIATIVE: 0.38727272727272727,
+        AuctionState.COMPRESSION: 0.165,
+        AuctionState.GAP_REV: 0.0,
+        AuctionState.BALANCED: 1.0,
+        AuctionState.INVENTORY_FIX: 0.2,
+    })
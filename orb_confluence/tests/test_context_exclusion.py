@@ -0,0 +1,70 @@
+"""Tests for the context exclusion matrix."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from orb_confluence.states.context_exclusion import ContextExclusionMatrix
+
+
+def make_trades(n, seed=0):
+    """Random trade records with the default fit() columns."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "or_width_norm": np.round(rng.gamma(2, 0.5, n), 1),
+        "breakout_delay_minutes": rng.choice([0, 10, 10.5, 25, 30, 40, 41, 90], n).astype(float),
+        "volume_quality_score": np.round(rng.uniform(0, 1, n), 1),
+        "auction_state": rng.choice(["INITIATIVE", "BALANCED"], n),
+        "gap_type": rng.choice(["NO_GAP", "FULL_UP"], n),
+        "realized_r": np.round(rng.normal(0.05, 1.2, n), 2),
+    })
+
+
+class TestFit:
+    """Test fitting cells from trade records."""
+
+    def test_cells_match_per_trade_signatures(self):
+        """Cells group and summarize trades as create_signature buckets them."""
+        trades = make_trades(2000)
+        trades.loc[:4, "or_width_norm"] = np.nan
+        matrix = ContextExclusionMatrix(min_trades_per_cell=10)
+        matrix.fit(trades)
+
+        signatures = [
+            matrix.create_signature(row.or_width_norm, row.breakout_delay_minutes,
+                                    row.volume_quality_score, row.auction_state, row.gap_type)
+            for row in trades.itertuples()
+        ]
+        expected = pd.Series(trades["realized_r"].to_numpy()).groupby(
+            [hash(s) for s in signatures]
+        )
+
+        assert set(matrix.cells) == set(signatures)
+        assert sum(cell.n_trades for cell in matrix.cells.values()) == len(trades)
+        for signature in set(signatures):
+            r = expected.get_group(hash(signature))
+            cell = matrix.cells[signature]
+            winners, losers = r[r > 0], r[r < 0]
+            assert (cell.n_trades, cell.n_winners, cell.n_losers) == (
+                len(r), len(winners), len(losers)
+            )
+            assert cell.expectancy == pytest.approx(r.mean())
+            assert cell.avg_winner == pytest.approx(winners.mean() if len(winners) else 0.0)
+            assert cell.avg_loser == pytest.approx(losers.mean() if len(losers) else 0.0)
+            assert cell.expectancy_stderr == pytest.approx(
+                r.std() / np.sqrt(len(r)) if len(r) > 1 else 0.0
+            )
+
+    def test_excludes_poor_context(self):
+        """A well-sampled context far below global expectancy is excluded."""
+        trades = make_trades(3000, seed=1)
+        poor = trades["gap_type"].eq("FULL_UP") & trades["auction_state"].eq("BALANCED")
+        trades.loc[poor, "realized_r"] -= 1.0
+        matrix = ContextExclusionMatrix(min_trades_per_cell=20)
+        matrix.fit(trades)
+
+        excluded = [cell for cell in matrix.cells.values() if cell.is_excluded]
+
+        assert excluded
+        assert all(cell.signature.gap_type == "FULL_UP" for cell in excluded)
+        assert matrix.get_exclusion_reason(excluded[0].signature).startswith("Expectancy")
@@ -0,0 +1,169 @@
+"""Tests for partial exit and time-decay exit management."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from orb_confluence.risk.partial_exits import (
+    PartialExitManager,
+    PartialTarget,
+    TimeDecayExitManager,
+)
+
+
+NOW = datetime(2024, 1, 2, 15, 0)
+
+
+class TestTimeDecayExitManager:
+    """Test time-decay exit conditions."""
+
+    def test_rolling_slope_matches_regression(self):
+        """Running-sum slope agrees with a least-squares fit over the window."""
+        rng = np.random.default_rng(11)
+        mfe = np.cumsum(rng.normal(0.01, 0.05, 200))
+        window = 20
+        manager = TimeDecayExitManager(slope_window=window, slope_threshold=-np.inf,
+                                       no_progress_bars=10_000)
+
+        for i, value in enumerate(mfe):
+            assert manager.update(float(value), NOW) is None
+            if i + 1 >= window:
+                numerator = window * manager._sum_xy - manager._sum_x * manager._sum_y
+                denominator = window * manager._sum_x2 - manager._sum_x ** 2
+                expected = np.polyfit(np.arange(window), mfe[i + 1 - window:i + 1], 1)[0]
+                assert numerator / denominator == pytest.approx(expected, abs=1e-9)
+
+    def test_flat_mfe_has_zero_slope(self):
+        """Flat MFE never produces a negative slope from rounding."""
+        manager = TimeDecayExitManager(slope_window=5, slope_threshold=0.0,
+                                       no_progress_bars=10_000)
+
+        for _ in range(50):
+            assert manager.update(0.1, NOW) is None
+
+    def test_slope_decay_exit(self):
+        """Declining MFE slope triggers a decay exit once the window fills."""
+        manager = TimeDecayExitManager(slope_window=5, slope_threshold=0.01)
+
+        reasons = [manager.update(1.0 - 0.1 * i, NOW) for i in range(5)]
+
+        assert reasons[:4] == [None] * 4
+        assert reasons[4].startswith("SLOPE_DECAY")
+
+    def test_reset_clears_window(self):
+        """Reset starts a fresh slope window."""
+        manager = TimeDecayExitManager(slope_window=3, slope_threshold=0.0)
+        for value in (3.0, 2.0, 1.0):
+            manager.update(value, NOW)
+
+        manager.reset()
+
+        assert manager.update(5.0, NOW) is None
+        assert manager.update(5.5, NOW) is None
+
+    def test_history_bounded_to_lookback(self):
+        """MFE history keeps only the bars the exit checks can read."""
+        manager = TimeDecayExitManager(slope_window=4, no_progress_bars=6,
+                                       slope_threshold=-np.inf, no_progress_threshold_r=-np.inf)
+        for i in range(100):
+            manager.update(float(i), NOW)
+
+        assert manager.mfe_history == [float(i) for i in range(93, 100)]
+
+        manager.reset()
+        assert manager.mfe_history == []
+
+
+def _targets():
+    return [
+        PartialTarget(target_r=1.0, size_fraction=0.5),
+        PartialTarget(target_r=1.5, size_fraction=0.25),
+        PartialTarget(target_r=2.0, size_fraction=0.25),
+    ]
+
+
+class TestPartialExitManager:
+    """Test partial target fills."""
+
+    @pytest.mark.parametrize("direction", ["long", "short"])
+    def test_vectorized_matches_bar_loop(self, direction):
+        """Bulk target check produces the same fills as the per-bar check."""
+        rng = np.random.default_rng(5)
+        sign = 1 if direction == "long" else -1
+        close = 100 + sign * (np.linspace(0, 6, 60) + rng.normal(0, 0.5, 60))
+        highs = close + rng.uniform(0, 1, 60)
+        lows = close - rng.uniform(0, 1, 60)
+        highs[10] = np.nan
+        lows[10] = np.nan
+        timestamps = [datetime(2024, 1, 2, 15, i) for i in range(60)]
+
+        scalar = PartialExitManager(direction, 100.0, 2.0, _targets())
+        expected = []
+        for i in range(60):
+            expected += scalar.check_targets(close[i], highs[i], lows[i], timestamps[i])
+
+        bulk = PartialExitManager(direction, 100.0, 2.0, _targets())
+        fills = bulk.check_targets_vectorized(highs[:30], lows[:30], timestamps[:30])
+        fills += bulk.check_targets_vectorized(highs[30:], lows[30:], timestamps[30:])
+
+        assert expected
+        assert fills == expected
+        assert bulk.remaining_size == scalar.remaining_size
+        assert bulk.all_targets_hit == scalar.all_targets_hit
+
+    def test_vectorized_same_bar_fills_in_target_order(self):
+        """Targets touched on the same bar fill in ascending order."""
+        manager = PartialExitManager("long", 100.0, 5.0, _targets())
+
+        fills = manager.check_targets_vectorized(
+            np.array([101.0, 111.0]), np.array([99.0, 100.0]), [NOW, NOW]
+        )
+
+        assert [f.target_number for f in fills] == [1, 2, 3]
+        assert manager.remaining_size == 0.0
+        assert manager.all_targets_hit
+
+    @pytest.mark.parametrize("direction, expected", [
+        ("long", [102.0, 103.0, 104.0]),
+        ("short", [98.0, 97.0, 96.0]),
+    ])
+    def test_targets_sorted_and_priced(self, direction, expected):
+        """Targets are ordered by R and priced from entry and risk."""
+        targets = list(reversed(_targets()))
+        manager = PartialExitManager(direction, 100.0, 2.0, targets)
+
+        assert [t.target_r for t in manager.targets] == [1.0, 1.5, 2.0]
+        assert [t.price for t in manager.targets] == expected
+        assert manager.get_next_target() is manager.targets[0]
+
+
+@pytest.mark.parametrize("settings", [
+    {"slope_window": 5, "slope_threshold": 0.01},
+    {"slope_window": 20, "no_progress_bars": 10, "no_progress_threshold_r": 0.05},
+    {"max_bars": 40, "slope_threshold": -np.inf, "no_progress_threshold_r": -np.inf},
+])
+def test_first_exit_matches_update(settings):
+    """Compiled path scan finds the same exit as per-bar updates."""
+    rng = np.random.default_rng(17)
+    for _ in range(20):
+        mfe = np.maximum.accumulate(np.cumsum(rng.normal(0.03, 0.1, 150)))
+        manager = TimeDecayExitManager(**settings)
+
+        expected = (-1, None)
+        for i, value in enumerate(mfe):
+            reason = manager.update(float(value), NOW)
+            if reason:
+                expected = (i, reason)
+                break
+
+        assert TimeDecayExitManager(**settings).first_exit(mfe) == expected
+
+
+def test_hit_target_repr():
+    """A filled target is reported as hit."""
+    target = PartialTarget(target_r=1.0, size_fraction=0.5)
+    manager = PartialExitManager("long", 100.0, 1.0, [target])
+    manager.check_targets(101.0, 101.0, 100.0, NOW)
+
+    assert repr(target) == "Target(1.0R, 50%) [HIT]"
@@ -0,0 +1,217 @@
+"""Tests for ORB 2.0 playbooks (PB2 failure fade, PB3 pullback continuation)."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from orb_confluence.playbooks import (
+    DIR_LONG,
+    DIR_SHORT,
+    DIRECTION_NAMES,
+    FailureFadePlaybook,
+    PullbackContinuationPlaybook,
+    compute_bar_features,
+)
+
+
+@pytest.fixture
+def fade_context():
+    """Context with an upside wick-only failure bar closing near OR mid."""
+    bar = pd.Series({"open": 100.5, "high": 101.5, "low": 100.2, "close": 100.45})
+    return {
+        "current_bar": bar,
+        "or_primary_high": 101.0,
+        "or_primary_low": 99.8,
+        "or_primary_finalized": True,
+        "volume_ratio": 0.5,
+        "atr_14": 1.0,
+        "timestamp": datetime(2024, 1, 2, 15, 0),
+    }
+
+
+class TestEligibility:
+    """Test cached OR-readiness eligibility."""
+
+    def test_not_eligible_before_or_finalized(self):
+        """Playbooks are ineligible until the OR finalizes."""
+        for playbook in (FailureFadePlaybook(), PullbackContinuationPlaybook()):
+            assert not playbook.is_eligible({"or_primary_finalized": False})
+            assert playbook.generate_signals({"or_primary_finalized": False}) == []
+
+    def test_on_or_finalized_latches_readiness(self):
+        """Engine callback makes eligibility independent of context."""
+        playbook = PullbackContinuationPlaybook()
+        playbook.on_or_finalized()
+
+        assert playbook.is_eligible({})
+
+        playbook.reset_session()
+        assert not playbook.is_eligible({})
+
+    def test_disabled_playbook_not_eligible(self):
+        """Disabled playbooks never become eligible."""
+        playbook = FailureFadePlaybook(config={"enabled": False})
+        playbook.on_or_finalized()
+
+        assert not playbook.is_eligible({})
+
+
+class TestFailureFade:
+    """Test PB2 signal generation."""
+
+    def test_upside_failure_generates_short(self, fade_context):
+        """Wick-only upside failure produces a single short signal."""
+        playbook = FailureFadePlaybook()
+        signals = playbook.generate_signals(fade_context)
+
+        assert len(signals) == 1
+        signal = signals[0]
+        assert signal.direction == "short"
+        assert signal.entry_price == pytest.approx(100.4)
+        assert signal.initial_stop == pytest.approx(101.6)
+        assert signal.phase1_stop_distance == pytest.approx(1.2)
+
+    def test_exit_descriptor_shared(self, fade_context):
+        """Signals reuse the playbook's immutable exit descriptor."""
+        playbook = FailureFadePlaybook(config={"time_stop_minutes": 45})
+        signal = playbook.generate_signals(fade_context)[0]
+
+        assert signal.exit_mode is playbook.preferred_exit_mode(fade_context)
+        assert signal.exit_mode.time_limit_minutes == 45
+        with pytest.raises(AttributeError):
+            signal.exit_mode.time_limit_minutes = 10
+
+    def test_one_failure_per_session(self, fade_context):
+        """Playbook goes ineligible after a failure is detected."""
+        playbook = FailureFadePlaybook()
+        playbook.generate_signals(fade_context)
+
+        assert not playbook.is_eligible(fade_context)
+        assert playbook.generate_signals(fade_context) == []
+
+    def test_config_baked_into_step(self, fade_context):
+        """Step function honours reenter_mid and wick thresholds from config."""
+        fade_context["current_bar"] = pd.Series(
+            {"open": 100.95, "high": 101.5, "low": 100.8, "close": 100.9}
+        )
+        at_level = FailureFadePlaybook(config={"reenter_mid": False})
+        strict = FailureFadePlaybook(config={"reenter_mid": False, "wick_ratio_min": 50.0})
+
+        signals = at_level.generate_signals(dict(fade_context))
+        assert len(signals) == 1
+        assert signals[0].entry_price == pytest.approx(101.0)
+        assert strict.generate_signals(dict(fade_context)) == []
+
+    def test_continuation_signal_stop_distance(self):
+        """Stop distance is positive for both directions."""
+        playbook = PullbackContinuationPlaybook()
+        context = {"atr_14": 2.0, "timestamp": datetime(2024, 1, 2, 15, 0)}
+
+        long_signal = playbook._create_continuation_signal(DIR_LONG, 102.0, 101.5, 100.5, context)
+        short_signal = playbook._create_continuation_signal(DIR_SHORT, 98.0, 99.5, 98.5, context)
+
+        assert long_signal.initial_stop == pytest.approx(100.2)
+        assert long_signal.phase1_stop_distance == pytest.approx(1.8)
+        assert short_signal.initial_stop == pytest.approx(99.8)
+        assert short_signal.phase1_stop_distance == pytest.approx(1.8)
+        assert (long_signal.direction, short_signal.direction) == ("long", "short")
+
+    def test_detect_impulses_matches_bar_check(self):
+        """Vectorized impulse test agrees with the per-bar impulse check."""
+        rng = np.random.default_rng(3)
+        n = 200
+        close = 100 + rng.normal(0, 1.0, n)
+        open_ = close + rng.normal(0, 0.3, n)
+        high = np.maximum(open_, close) + 0.2
+        low = np.minimum(open_, close) - 0.2
+        atr = rng.uniform(0.0, 1.5, n)
+        delay = np.arange(n) % 25
+
+        features = compute_bar_features(open_, high, low, close, 100.5, 99.5, atr)
+        impulses = PullbackContinuationPlaybook().detect_impulses(features, delay)
+
+        for i in range(n):
+            playbook = PullbackContinuationPlaybook()
+            playbook.on_or_finalized(100.5, 99.5)
+            bar = pd.Series({"open": open_[i], "high": high[i], "low": low[i], "close": close[i]})
+            playbook._check_for_impulse(
+                {"atr_14": atr[i], "breakout_delay_minutes": delay[i]}, bar
+            )
+            expected = playbook.impulse_direction or 0
+            assert impulses[i] == expected
+
+
+class TestFailureFadeSweep:
+    """Test vectorized PB2 parameter sweep."""
+
+    @staticmethod
+    def _sessions(n_sessions=6, n_bars=120):
+        rng = np.random.default_rng(7)
+        sessions, levels = [], []
+        for s in range(n_sessions):
+            n = n_bars - 10 * s  # Ragged session lengths
+            close = 100 + np.cumsum(rng.normal(0, 0.15, n))
+            open_ = np.r_[close[0], close[:-1]]
+            sessions.append(pd.DataFrame({
+                "open": open_,
+                "high": np.maximum(open_, close) + rng.uniform(0, 0.3, n),
+                "low": np.minimum(open_, close) - rng.uniform(0, 0.3, n),
+                "close": close,
+                "volume_ratio": rng.uniform(0.4, 1.2, n),
+            }))
+            levels.append((100.3, 99.7))
+        return sessions, levels
+
+    def test_sweep_matches_bar_replay(self):
+        """Sweep returns the same first failure as replaying generate_signals."""
+        sessions, levels = self._sessions()
+        grid = {"wick_ratio_min": [0.3, 0.55, 1.0], "volume_fade_threshold": [0.6, 0.9]}
+
+        results = FailureFadePlaybook.sweep(sessions, levels, grid)
+        assert len(results) == 6 * 6
+
+        for row in results.itertuples(index=False):
+            playbook = FailureFadePlaybook(config={
+                "wick_ratio_min": row.wick_ratio_min,
+                "volume_fade_threshold": row.volume_fade_threshold,
+            })
+            playbook.on_or_finalized(*levels[row.session])
+            bars = sessions[row.session]
+            fired = []
+            for i in range(len(bars)):
+                context = {
+                    "current_bar": bars.iloc[i],
+                    "volume_ratio": bars["volume_ratio"].iloc[i],
+                    "timestamp": datetime(2024, 1, 2, 15, 0),
+                }
+                if not playbook.failure_detected:
+                    detected_at = i
+                fired.extend(playbook.generate_signals(context))
+
+            if playbook.failure_detected:
+                assert row.bar_index == detected_at
+            else:
+                assert row.bar_index == -1
+            assert row.signal == bool(fired)
+            if fired:
+                assert DIRECTION_NAMES[row.direction] == fired[0].direction
+                assert row.entry_price == pytest.approx(fired[0].entry_price)
+
+
+class TestPullbackContinuation:
+    """Test PB3 impulse/flag state machine."""
+
+    def test_impulse_range_cached_on_detection(self):
+        """Impulse range is computed once against the cached OR level."""
+        playbook = PullbackContinuationPlaybook()
+        playbook.on_or_finalized(101.0, 99.8)
+
+        bar = pd.Series({"open": 101.0, "high": 102.5, "low": 100.9, "close": 102.2})
+        context = {"current_bar": bar, "atr_14": 1.0, "breakout_delay_minutes": 2}
+        assert playbook.generate_signals(context) == []
+
+        assert playbook.impulse_detected
+        assert playbook.impulse_direction == DIR_LONG
+        assert playbook.impulse_range == pytest.approx(1.5)
@@ -0,0 +1,87 @@
+"""Tests for probability gating and runner activation."""
+
+import numpy as np
+import pytest
+
+from orb_confluence.signals.probability_gate import (
+    ProbabilityGate,
+    ProbabilityGateConfig,
+    RunnerParams,
+    apply_probability_gate,
+    compute_runner_params,
+)
+
+
+CONFIGS = [
+    ProbabilityGateConfig(),
+    ProbabilityGateConfig(p_min_floor=0.4, p_soft_floor=0.4, p_runner_threshold=0.7,
+                          reduced_size_factor=0.25, adjust_targets_by_prob=False),
+]
+
+
+class TestProbabilityGate:
+    """Test signal gating decisions."""
+
+    @pytest.mark.parametrize("p_extension, passed, size, runner, target", [
+        (0.30, False, 1.0, False, 1.0),
+        (0.35, True, 0.5, False, 0.8),
+        (0.50, True, 1.0, False, 1.0),
+        (0.55, True, 1.0, True, 1.3),
+    ])
+    def test_evaluate_bands(self, p_extension, passed, size, runner, target):
+        """Floors, runner threshold and target multipliers apply by band."""
+        result = ProbabilityGate().evaluate("signal", p_extension)
+
+        assert result.passed_gate == passed
+        assert (result.size_adjustment, result.runner_enabled, result.target_adjustment) == (
+            size, runner, target
+        )
+        if not passed:
+            assert result.rejection_reason == "p_extension 0.30 < min_floor 0.35"
+
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_batch_matches_evaluate(self, config):
+        """Batch evaluation (and filtering) matches evaluating each signal."""
+        probs = np.random.default_rng(3).uniform(0, 1, 300).tolist()
+        probs += [0.35, 0.4, 0.45, 0.55, 0.7, float("nan")]
+        pairs = [(f"signal-{i}", p) for i, p in enumerate(probs)]
+        gate = ProbabilityGate(config)
+
+        results = gate.batch_evaluate(pairs)
+
+        assert results[:-1] == [gate.evaluate(signal, p) for signal, p in pairs[:-1]]
+        assert results[-1].passed_gate and results[-1].size_adjustment == 1.0
+        assert gate.batch_evaluate([]) == []
+        assert gate.evaluate_and_filter(pairs) == gate.filter_passing_signals(results)
+        assert gate.evaluate_and_filter([]) == []
+
+
+@pytest.mark.parametrize("config", [None] + CONFIGS)
+def test_apply_probability_gate_matches_gate(config):
+    """The convenience function decides as a gate with the same config."""
+    for p_extension in (0.3, 0.4, 0.5, 0.6):
+        assert apply_probability_gate("signal", p_extension, config) == (
+            ProbabilityGate(config).evaluate("signal", p_extension)
+        )
+
+
+@pytest.mark.parametrize("p_extension, target, trail", [
+    (0.4, 2.6, 1.7),
+    (0.8, 3.0, 1.5),
+    (0.1, 1.4, 2.3),
+])
+def test_runner_params_scale_with_probability(p_extension, target, trail):
+    """Runner target grows and trail tightens with probability, capped at the multiplier."""
+    params = compute_runner_params(p_extension)
+
+    assert isinstance(params, RunnerParams)
+    assert params.runner_target_r == pytest.approx(target)
+    assert params.trail_factor == pytest.approx(trail)
+    assert compute_runner_params(p_extension) is params
+
+
+def test_signal_with_prob_repr():
+    """Gate results render decision, probability, size and runner flag."""
+    result = ProbabilityGate(ProbabilityGateConfig()).evaluate("signal", 0.6)
+
+    assert repr(result) == "SignalWithProb(PASS, p=0.60, size=100%, runner=True)"
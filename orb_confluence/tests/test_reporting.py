@@ -1,6 +1,6 @@
 """Tests for HTML report generation."""
 
-from datetime import datetime
+from datetime import datetime, time
 from pathlib import Path
 
 import pytest
@@ -9,12 +9,13 @@ from orb_confluence.reporting import generate_report
 from orb_confluence.backtest.event_loop import BacktestResult
 from orb_confluence.config.schema import (
     StrategyConfig,
+    InstrumentConfig,
     ORBConfig,
-    BufferConfig,
-    FactorsConfig,
+    BuffersConfig,
     TradeConfig,
     GovernanceConfig,
     ScoringConfig,
+    BacktestConfig,
 )
 from orb_confluence.strategy.trade_state import ActiveTrade, TradeSignal
 import pandas as pd
@@ -23,24 +24,27 @@ import pandas as pd
 def create_test_config() -> StrategyConfig:
     """Create test configuration."""
     return StrategyConfig(
+        instruments={
+            "SPY": InstrumentConfig(
+                symbol="SPY",
+                proxy_symbol="SPY",
+                data_source="synthetic",
+                session_start=time(9, 30),
+                session_end=time(16, 0),
+                tick_size=0.01,
+                point_value=1.0,
+            )
+        },
         orb=ORBConfig(
-            or_length_minutes=15,
+            base_minutes=15,
             adaptive=False,
             min_atr_mult=0.3,
             max_atr_mult=3.0,
         ),
-        buffer=BufferConfig(
-            mode='fixed',
-            fixed_ticks=2,
+        buffers=BuffersConfig(
+            fixed=0.02,
             atr_mult=0.1,
         ),
-        factors=FactorsConfig(
-            rel_vol_lookback=20,
-            rel_vol_spike_threshold=1.5,
-            price_action_pivot_len=3,
-            adx_period=14,
-            adx_threshold=25.0,
-        ),
         trade=TradeConfig(
             partials=True,
             t1_r=1.0,
@@ -60,8 +64,12 @@ def create_test_config() -> StrategyConfig:
         ),
         scoring=ScoringConfig(
             weights={'rel_vol': 1.0, 'price_action': 1.0, 'profile': 1.0},
-            base_requirement=1.0,
-            weak_trend_requirement=2.0,
+            base_required=1,
+            weak_trend_required=2,
+        ),
+        backtest=BacktestConfig(
+            start_date="2024-01-01",
+            end_date="2024-01-31",
         ),
     )
 
@@ -209,6 +217,28 @@ class TestGenerateReport:
         assert 'rel_vol' in html
         assert 'price_action' in html
 
+    def test_report_factor_attribution_no_factors(self):
+        """Test attribution table has no rows when no trade carries factors."""
+        config = create_test_config()
+        
+        trades = [
+            create_dummy_trade('T1', 1.0, {}, 2.0),
+            create_dummy_trade('T2', -1.0, {}, 1.5),
+        ]
+        
+        result = BacktestResult(
+            trades=trades,
+            equity_curve=pd.DataFrame(),
+            factor_snapshots=[],
+            daily_stats={},
+            governance_events=[],
+        )
+        
+        html = generate_report(result, config)
+        
+        section = html.split('<h2>Factor Attribution</h2>')[1].split('</table>')[0]
+        assert '<td>' not in section
+
     def test_report_score_buckets(self):
         """Test score buckets section."""
         config = create_test_config()
@@ -269,6 +299,59 @@ class TestGenerateReport:
         
         assert 'Generated:' in html
 
+    def test_report_analytics_memoized(self):
+        """Test analytics are reused for an identical trade list."""
+        from orb_confluence.reporting import _metrics_for
+        
+        config = create_test_config()
+        
+        def make_result(r):
+            trades = [
+                create_dummy_trade('T1', 1.5, {'rel_vol': 1.0}, 2.5),
+                create_dummy_trade('T2', r, {'rel_vol': 0.0}, 1.5),
+            ]
+            return BacktestResult(
+                trades=trades,
+                equity_curve=pd.DataFrame(),
+                factor_snapshots=[],
+                daily_stats={},
+                governance_events=[],
+            )
+        
+        _metrics_for.cache_clear()
+        generate_report(make_result(-1.0), config)
+        generate_report(make_result(-1.0), config)
+        assert _metrics_for.cache_info().hits == 1
+        
+        # A changed trade is a cache miss
+        html = generate_report(make_result(0.5), config)
+        assert _metrics_for.cache_info().misses == 2
+        assert '2.00R' in html
+
+    def test_report_optional_sections(self):
+        """Test attribution and score bucket sections can be skipped."""
+        config = create_test_config()
+        
+        trades = [
+            create_dummy_trade('T1', 1.5, {'rel_vol': 1.0}, 2.5),
+            create_dummy_trade('T2', -1.0, {'rel_vol': 0.0}, 1.5),
+        ]
+        result = BacktestResult(
+            trades=trades,
+            equity_curve=pd.DataFrame(),
+            factor_snapshots=[],
+            daily_stats={},
+            governance_events=[],
+        )
+        
+        html = generate_report(
+            result, config, include_attribution=False, include_score_buckets=False
+        )
+        
+        assert 'Total R' in html
+        assert '<h2>Factor Attribution</h2>' not in html
+        assert '<h2>Confluence Score Performance</h2>' not in html
+
     def test_report_save_to_file(self, tmp_path):
         """Test saving report to file."""
         config = create_test_config()
@@ -292,6 +375,49 @@ class TestGenerateReport:
         saved_html = output_path.read_text()
         assert saved_html == html
 
+    def test_report_stream_to_file(self, tmp_path):
+        """Test streaming report to file without returning HTML."""
+        config = create_test_config()
+        
+        result = BacktestResult(
+            trades=[],
+            equity_curve=pd.DataFrame(),
+            factor_snapshots=[],
+            daily_stats={},
+            governance_events=[],
+        )
+        
+        output_path = tmp_path / 'streamed_report.html'
+        
+        html = generate_report(result, config, output_path=output_path, return_html=False)
+        
+        assert html is None
+        assert '</html>' in output_path.read_text()
+        
+        # Streaming needs somewhere to write
+        with pytest.raises(ValueError):
+            generate_report(result, config, return_html=False)
+
+    def test_report_external_css(self, tmp_path):
+        """Test reports can link a shared stylesheet."""
+        config = create_test_config()
+        
+        result = BacktestResult(
+            trades=[],
+            equity_curve=pd.DataFrame(),
+            factor_snapshots=[],
+            daily_stats={},
+            governance_events=[],
+        )
+        
+        html = generate_report(
+            result, config, output_path=tmp_path / 'report.html', external_css=True
+        )
+        
+        assert '<style>' not in html
+        assert 'href="styles.css"' in html
+        assert (tmp_path / 'styles.css').exists()
+
     def test_report_with_run_id(self, tmp_path):
         """Test report generation with run_id."""
         config = create_test_config()
@@ -317,3 +443,25 @@ class TestGenerateReport:
             assert expected_path.exists()
         finally:
             os.chdir(original_cwd)
+
+
+class TestChartSources:
+    """Test chart image source resolution."""
+
+    def test_inline_without_output_path(self):
+        """Charts are inlined as data URIs for in-memory reports."""
+        from orb_confluence.reporting import _chart_sources
+        
+        sources = _chart_sources({'r_distribution': b'\x89PNG'}, None)
+        
+        assert sources == {'r_distribution': 'data:image/png;base64,iVBORw=='}
+
+    def test_written_next_to_report(self, tmp_path):
+        """Charts are written to charts/ and referenced relatively."""
+        from orb_confluence.reporting import _chart_sources
+        
+        output_path = tmp_path / 'report.html'
+        sources = _chart_sources({'r_distribution': b'\x89PNG'}, output_path)
+        
+        assert sources == {'r_distribution': 'charts/r_distribution.png'}
+        assert (tmp_path / 'charts' / 'r_distribution.png').read_bytes() == b'\x89PNG'
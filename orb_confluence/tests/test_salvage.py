@@ -0,0 +1,169 @@
+"""Tests for salvage abort logic."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from orb_confluence.risk.salvage import (
+    SalvageConditions,
+    SalvageEvent,
+    SalvageManager,
+    SalvagePool,
+    analyze_salvage_performance,
+)
+
+
+def _replay(mfe, r, prices, timestamps, conditions):
+    """Run the per-bar evaluate() loop and return the first event."""
+    manager = SalvageManager("long", 5000.0, 5.0, 4995.0, conditions)
+    for i in range(len(mfe)):
+        event = manager.evaluate(prices[i], float(mfe[i]), float(r[i]), timestamps[i])
+        if event:
+            return event
+    return None
+
+
+class TestSalvageManager:
+    """Test per-bar salvage evaluation."""
+
+    def test_salvage_after_confirmed_retrace(self):
+        """Armed trade that gives back most of its MFE salvages after confirmation."""
+        conditions = SalvageConditions(confirmation_bars=2)
+        manager = SalvageManager("long", 5000.0, 5.0, 4995.0, conditions)
+        now = datetime(2024, 1, 2, 15, 0)
+
+        assert manager.evaluate(5005.0, 1.0, 1.0, now) is None
+        assert manager.is_armed
+        assert manager.evaluate(5001.0, 1.0, 0.2, now) is None
+        event = manager.evaluate(5001.0, 1.0, 0.2, now)
+
+        assert event is not None
+        assert event.mfe_r == 1.0
+        assert event.retrace_ratio == pytest.approx(0.8)
+        assert event.salvage_benefit_r == pytest.approx(1.2)
+        assert manager.is_triggered
+
+    def test_recovery_resets_confirmation(self):
+        """Recovering above the recovery threshold restarts confirmation."""
+        conditions = SalvageConditions(confirmation_bars=2)
+        manager = SalvageManager("long", 5000.0, 5.0, 4995.0, conditions)
+        now = datetime(2024, 1, 2, 15, 0)
+
+        manager.evaluate(5005.0, 1.0, 1.0, now)
+        manager.evaluate(5001.0, 1.0, 0.2, now)
+        assert manager.evaluate(5004.0, 1.0, 0.8, now) is None
+        assert manager.false_salvage_count == 1
+        assert manager.evaluate(5001.0, 1.0, 0.2, now) is None
+
+
+class TestEvaluateSeries:
+    """Test vectorized salvage path evaluation."""
+
+    @pytest.mark.parametrize("conditions", [
+        SalvageConditions(),
+        SalvageConditions(trigger_mfe_r=0.2, retrace_threshold=0.4, confirmation_bars=2),
+        SalvageConditions(confirmation_bars=1, recovery_threshold=0.8, max_bars_from_peak=5),
+    ])
+    def test_matches_bar_replay(self, conditions):
+        """Series evaluation finds the same event as the per-bar loop."""
+        rng = np.random.default_rng(21)
+        fired = 0
+        for _ in range(50):
+            r = np.cumsum(rng.normal(0.0, 0.15, 120))
+            mfe = np.maximum.accumulate(np.maximum(r, 0.0))
+            prices = 5000.0 + 5.0 * r
+            timestamps = [datetime(2024, 1, 2, 15, 0) + timedelta(minutes=i) for i in range(120)]
+
+            expected = _replay(mfe, r, prices, timestamps, conditions)
+            event = SalvageManager.evaluate_series(mfe, r, prices, timestamps, conditions)
+
+            assert event == expected
+            fired += event is not None
+
+        assert fired > 0
+
+    def test_never_armed(self):
+        """Paths that never reach the trigger MFE return None."""
+        mfe = np.full(20, 0.1)
+        r = np.linspace(0.1, -0.9, 20)
+
+        assert SalvageManager.evaluate_series(mfe, r, r, list(range(20))) is None
+
+    def test_vectorized_fallback_matches_compiled_scan(self):
+        """NumPy fallback scan agrees with the compiled scan."""
+        from orb_confluence.risk.salvage import _scan_salvage, _scan_salvage_vectorized
+
+        rng = np.random.default_rng(8)
+        for max_bars in (None, 4):
+            for _ in range(50):
+                r = np.cumsum(rng.normal(0.0, 0.15, 100))
+                mfe = np.maximum.accumulate(np.maximum(r, 0.0))
+                args = (mfe, r, 0.3, 0.5, 2, 0.6, max_bars is not None, max_bars or 0)
+
+                assert _scan_salvage_vectorized(*args) == pytest.approx(_scan_salvage(*args))
+
+
+class TestSalvagePool:
+    """Test array-based salvage evaluation across many trades."""
+
+    def test_matches_per_trade_managers(self):
+        """Each pool slot tracks the same state as its own SalvageManager."""
+        grid = [
+            SalvageConditions(),
+            SalvageConditions(trigger_mfe_r=0.2, retrace_threshold=0.4, confirmation_bars=2),
+            SalvageConditions(confirmation_bars=1, recovery_threshold=0.8, max_bars_from_peak=5),
+        ]
+        conditions = grid * 30
+        rng = np.random.default_rng(13)
+        r = np.cumsum(rng.normal(0.0, 0.15, (120, len(conditions))), axis=0)
+        mfe = np.maximum.accumulate(np.maximum(r, 0.0), axis=0)
+
+        pool = SalvagePool(len(conditions), conditions)
+        managers = [SalvageManager("long", 5000.0, 5.0, 4995.0, c) for c in conditions]
+        now = datetime(2024, 1, 2, 15, 0)
+        for t in range(len(r)):
+            fired = pool.evaluate_all(mfe[t], r[t])
+            expected = [m.evaluate(5000.0, float(mfe[t, j]), float(r[t, j]), now) is not None
+                        for j, m in enumerate(managers)]
+
+            assert fired.tolist() == expected
+            assert pool.retrace_confirmation_bars.tolist() == [
+                m.retrace_confirmation_bars for m in managers
+            ]
+
+        assert pool.salvage_triggered.any()
+        assert pool.false_salvage_count.tolist() == [m.false_salvage_count for m in managers]
+
+    def test_conditions_length_checked(self):
+        """Per-slot conditions must match the pool size."""
+        with pytest.raises(ValueError):
+            SalvagePool(3, [SalvageConditions()] * 2)
+
+
+def test_salvage_conditions_frozen():
+    """Salvage conditions are immutable and hash by value."""
+    conditions = SalvageConditions()
+
+    with pytest.raises(AttributeError):
+        conditions.trigger_mfe_r = 1.0
+    assert hash(conditions) == hash(SalvageConditions())
+
+
+def test_analyze_salvage_performance():
+    """Summary statistics aggregate benefit and exit R across events."""
+    now = datetime(2024, 1, 2, 15, 0)
+    events = [
+        SalvageEvent(now, 1.0, -0.2, 1.2, 4, 4999.0, 0.8),
+        SalvageEvent(now, 0.8, 0.1, 0.875, 6, 5000.5, 1.1),
+    ]
+
+    result = analyze_salvage_performance(events, [object()] * 6)
+
+    assert result["n_salvage_trades"] == 2
+    assert result["total_benefit_r"] == pytest.approx(1.9)
+    assert result["avg_benefit_r"] == pytest.approx(0.95)
+    assert result["avg_loss_with_salvage"] == pytest.approx(-0.05)
+    assert result["loss_reduction"] == pytest.approx(-0.95)
+    assert result["salvage_rate"] == pytest.approx(0.25)
+    assert analyze_salvage_performance([], [])["n_salvage_trades"] == 0
@@ -0,0 +1,80 @@
+"""Tests for the memory-mapped session bar cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from orb_confluence.data.session_cache import (
+    SESSION_BAR_DTYPE,
+    SessionArrayCache,
+    bars_to_session_array,
+    session_array_to_frame,
+)
+from orb_confluence.playbooks import FailureFadePlaybook
+
+
+@pytest.fixture
+def two_session_bars():
+    """Bars spanning two sessions."""
+    ts = pd.date_range("2024-01-02 14:30", periods=5, freq="1min", tz="UTC").append(
+        pd.date_range("2024-01-03 14:30", periods=4, freq="1min", tz="UTC")
+    )
+    n = len(ts)
+    return pd.DataFrame({
+        "timestamp_utc": ts,
+        "open": np.linspace(100, 101, n),
+        "high": np.linspace(100.5, 101.5, n),
+        "low": np.linspace(99.5, 100.5, n),
+        "close": np.linspace(100.2, 101.2, n),
+        "volume": np.arange(n) * 100.0,
+    })
+
+
+def test_round_trip_fills_optional_columns(two_session_bars):
+    """Structured array round-trips OHLCV and fills optional features."""
+    arr = bars_to_session_array(two_session_bars)
+
+    assert arr.dtype == SESSION_BAR_DTYPE
+    assert np.all(arr["volume_ratio"] == 1.0)
+    assert np.all(np.isnan(arr["atr_14"]))
+
+    df = session_array_to_frame(arr)
+    pd.testing.assert_series_equal(df["timestamp_utc"], two_session_bars["timestamp_utc"])
+    np.testing.assert_allclose(df["close"], two_session_bars["close"])
+
+
+def test_cache_writes_one_file_per_session(tmp_path, two_session_bars):
+    """Cache splits by session date and loads read-only memory maps."""
+    cache = SessionArrayCache(tmp_path)
+    paths = cache.write(two_session_bars)
+
+    assert len(paths) == 2
+    assert cache.available_sessions() == ["2024-01-02", "2024-01-03"]
+
+    arr = cache.load("2024-01-03")
+    assert isinstance(arr, np.memmap)
+    assert len(arr) == 4
+    assert not arr.flags.writeable
+
+    assert list(cache.load_range(start_date="2024-01-03")) == ["2024-01-03"]
+
+
+def test_missing_session_raises(tmp_path):
+    """Loading an uncached session raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        SessionArrayCache(tmp_path).load("2024-01-02")
+
+
+def test_sweep_accepts_memory_mapped_sessions(tmp_path, two_session_bars):
+    """Playbook sweep consumes cached arrays the same as DataFrames."""
+    cache = SessionArrayCache(tmp_path)
+    cache.write(two_session_bars)
+    sessions = list(cache.load_range().values())
+    frames = [session_array_to_frame(arr) for arr in sessions]
+    levels = [(100.8, 100.0), (101.0, 100.6)]
+    grid = {"wick_ratio_min": [0.2, 0.6]}
+
+    from_arrays = FailureFadePlaybook.sweep(sessions, levels, grid)
+    from_frames = FailureFadePlaybook.sweep(frames, levels, grid)
+
+    pd.testing.assert_frame_equal(from_arrays, from_frames)
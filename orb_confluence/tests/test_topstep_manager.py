@@ -0,0 +1,187 @@
+"""Tests for TopStep-compliant risk management."""
+
+import dataclasses
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from orb_confluence.risk.topstep_manager import HaltReason, TopStepRiskManager
+
+
+class TestDailyWeeklyTracking:
+    """Test day and week rollover of PNL tracking."""
+
+    def test_daily_pnl_resets_on_new_day(self):
+        """Daily PNL accumulates within a day and resets on the next."""
+        manager = TopStepRiskManager()
+        manager.update_equity(-300, datetime(2024, 1, 2, 15, 0))
+        manager.update_equity(-200, datetime(2024, 1, 2, 16, 0))
+
+        assert manager.daily_pnl == -500
+        assert manager.weekly_pnl == -500
+
+        manager.update_equity(100, datetime(2024, 1, 3, 15, 0))
+
+        assert manager.daily_pnl == 100
+        assert manager.weekly_pnl == -400
+
+    def test_weekly_pnl_resets_on_new_iso_week(self):
+        """Weekly PNL resets when the first trade of a new ISO week arrives."""
+        manager = TopStepRiskManager()
+        manager.update_equity(-400, datetime(2024, 1, 5, 15, 0))   # Friday, week 1
+        manager.update_equity(-100, datetime(2024, 1, 8, 15, 0))   # Monday, week 2
+
+        assert manager.current_week == 2
+        assert manager.weekly_pnl == -100
+        assert manager.week_start_equity == pytest.approx(99600)
+
+    def test_daily_halt_lifts_next_day(self):
+        """A daily-loss halt is cleared on the next trading day."""
+        manager = TopStepRiskManager()
+        manager.update_equity(-1000, datetime(2024, 1, 2, 15, 0))
+
+        assert manager.trading_halted
+        assert not manager.check_risk_status().can_trade
+
+        manager.update_equity(0, datetime(2024, 1, 3, 15, 0))
+
+        assert not manager.trading_halted
+        assert manager.check_risk_status().can_trade
+
+
+class TestReplaySeries:
+    """Test vectorized PNL replay."""
+
+    @pytest.mark.parametrize("is_combine, enable_weekly_limit", [
+        (True, True),
+        (False, True),
+        (True, False),
+    ])
+    def test_matches_update_equity_loop(self, is_combine, enable_weekly_limit):
+        """Halt mask agrees with replaying update_equity trade by trade."""
+        rng = np.random.default_rng(4)
+        halted = 0
+        for _ in range(20):
+            pnls = np.round(rng.normal(-10, 300, 300), 2)
+            gaps = rng.choice([5, 90, 1440, 4000], size=300)
+            timestamps = [datetime(2024, 1, 1, 14, 30) + timedelta(minutes=int(m))
+                          for m in np.cumsum(gaps)]
+
+            manager = TopStepRiskManager(is_combine=is_combine,
+                                         enable_weekly_limit=enable_weekly_limit)
+            expected = []
+            for pnl, ts in zip(pnls, timestamps):
+                manager.update_equity(float(pnl), ts)
+                expected.append(manager.trading_halted)
+
+            mask = TopStepRiskManager(
+                is_combine=is_combine, enable_weekly_limit=enable_weekly_limit
+            ).replay_series(pnls, timestamps)
+
+            assert mask.tolist() == expected
+            halted += mask.sum()
+
+        assert halted > 0
+
+    def test_does_not_modify_manager(self):
+        """Replay leaves the live manager state untouched."""
+        manager = TopStepRiskManager()
+        mask = manager.replay_series(np.array([-600.0, -500.0, 200.0]), [
+            datetime(2024, 1, 2, 15, 0),
+            datetime(2024, 1, 2, 16, 0),
+            datetime(2024, 1, 3, 15, 0),
+        ])
+
+        assert mask.tolist() == [False, True, False]
+        assert manager.current_equity == manager.account_size
+        assert not manager.trading_halted
+
+
+class TestRiskStatus:
+    """Test limit usage and circuit-breaker sizing."""
+
+    @pytest.mark.parametrize("daily_pnl, expected", [
+        (-999.0, 4),
+        (-1000.0, 3),
+        (-1400.0, 2),
+        (-1699.0, 2),
+        (-1700.0, 1),
+    ])
+    def test_circuit_breaker_bands(self, daily_pnl, expected):
+        """Position size steps down at 50%, 70% and 85% of the daily limit."""
+        manager = TopStepRiskManager(is_combine=False)
+        manager.daily_pnl = daily_pnl
+
+        assert manager.get_position_size_limit(4) == expected
+
+    def test_halt_reason_reported_by_name(self):
+        """Halt reasons are enum members internally and names in reports."""
+        manager = TopStepRiskManager()
+        manager.update_equity(-1600, datetime(2024, 1, 2, 15, 0))
+
+        assert manager.halt_reason == HaltReason.DAILY
+        assert manager.get_statistics()['current_state']['halt_reason'] == "DAILY_LOSS_LIMIT"
+
+        manager.update_equity(0, datetime(2024, 1, 3, 15, 0))
+
+        assert manager.halt_reason == HaltReason.WEEKLY
+        assert manager.halt_reason_name == "WEEKLY_LOSS_LIMIT"
+        assert manager.check_risk_status().reason == "Trading halted: WEEKLY_LOSS_LIMIT"
+        assert TopStepRiskManager.reason_name(HaltReason.NONE) is None
+
+    def test_status_object_reused(self):
+        """Polling returns the same status object, refreshed in place."""
+        manager = TopStepRiskManager()
+        first = manager.check_risk_status()
+        snapshot = dataclasses.replace(first)
+
+        manager.update_equity(-300, datetime(2024, 1, 2, 15, 0))
+        second = manager.check_risk_status()
+
+        assert second is first
+        assert second.daily_pnl == -300
+        assert snapshot.daily_pnl == 0.0
+
+    def test_fast_gate_matches_status(self):
+        """Fast gate agrees with the full status and sizing calls."""
+        rng = np.random.default_rng(9)
+        manager = TopStepRiskManager(is_combine=False)
+        for i, pnl in enumerate(np.round(rng.normal(-30, 250, 200), 2)):
+            manager.update_equity(float(pnl), datetime(2024, 1, 1) + timedelta(hours=7 * i))
+            status = manager.check_risk_status()
+
+            assert manager.check_can_trade_fast() == (status.can_trade, status.max_position_size)
+            assert manager.check_can_trade_fast(4)[1] == manager.get_position_size_limit(4)
+
+    def test_repeat_poll_skips_recompute(self):
+        """Unchanged state returns the cached status; any change refreshes it."""
+        manager = TopStepRiskManager()
+        manager.update_equity(-750, datetime(2024, 1, 2, 15, 0))
+        status = manager.check_risk_status()
+        status.reason = "stale"
+
+        assert manager.check_risk_status().reason == "stale"
+
+        manager.update_equity(-10, datetime(2024, 1, 2, 16, 0))
+
+        assert manager.check_risk_status().reason == "⚠️ Warning: 76% of daily limit used"
+
+
+class TestBreachJournal:
+    """Test binary journaling of limit breaches."""
+
+    def test_flush_decodes_and_clears(self):
+        """Each halt is journaled once and decoded on flush."""
+        manager = TopStepRiskManager(log_breaches=False)
+        manager.update_equity(-1100, datetime(2024, 1, 2, 15, 0))
+        manager.update_equity(-200, datetime(2024, 1, 2, 16, 0))
+        manager.update_equity(-300, datetime(2024, 1, 3, 15, 0))
+
+        breaches = manager.flush_breaches()
+
+        assert breaches == [
+            (date(2024, 1, 2), HaltReason.DAILY, -1100.0, -1100.0, -1100.0),
+            (date(2024, 1, 3), HaltReason.WEEKLY, -300.0, -1600.0, -1600.0),
+        ]
+        assert manager.flush_breaches() == []
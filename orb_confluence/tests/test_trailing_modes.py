@@ -0,0 +1,249 @@
+"""Tests for advanced trailing stop modes."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from orb_confluence.playbooks.base import ExitMode
+from orb_confluence.risk.trailing_modes import (
+    HybridTrailingStop,
+    PivotTrailingStop,
+    TrailingStopManager,
+    VolatilityTrailingStop,
+    swing_pivot_mask,
+)
+
+
+NOW = datetime(2024, 1, 2, 15, 0)
+
+
+class TestVolatilityTrailingStop:
+    """Test ATR-based trailing."""
+
+    def test_stop_ratchets_with_favorable_extreme(self):
+        """Stop trails the best price by the ATR distance and never loosens."""
+        trail = VolatilityTrailingStop("long", 100.0, 98.0, atr_multiple=2.0)
+
+        assert trail.update(101.0, 103.0, 100.5, NOW, atr=1.0).new_stop == pytest.approx(101.0)
+        assert trail.update(100.0, 101.0, 99.5, NOW, atr=1.0) is None
+        assert trail.current_stop == pytest.approx(101.0)
+        assert trail.highest_favorable == 103.0
+
+    @pytest.mark.parametrize("direction, hit, safe", [
+        ("long", 98.0, 98.25),
+        ("SHORT", 102.0, 101.75),
+    ])
+    def test_check_stop_hit(self, direction, hit, safe):
+        """Stop is hit at or through the stop price on the protective side."""
+        initial_stop = 98.0 if direction == "long" else 102.0
+        trail = VolatilityTrailingStop(direction, 100.0, initial_stop)
+
+        assert trail.check_stop_hit(hit)
+        assert not trail.check_stop_hit(safe)
+
+    def test_missing_atr_skips_update(self):
+        """Bars without ATR leave the stop and favorable extreme untouched."""
+        trail = VolatilityTrailingStop("short", 100.0, 102.0)
+
+        assert trail.update(97.0, 98.0, 96.0, NOW, atr=None) is None
+        assert trail.highest_favorable == 100.0
+
+
+class TestPivotTrailingStop:
+    """Test swing-pivot trailing."""
+
+    def test_swing_low_confirmed_after_lookback(self):
+        """A swing low confirms once lookback bars close on each side."""
+        trail = PivotTrailingStop("long", 100.0, 95.0, pivot_lookback=2, buffer_atr_mult=0.0)
+        lows = [99.0, 98.0, 97.0, 98.5, 99.5]
+        for i, low in enumerate(lows[:-1]):
+            trail.update(low + 1.0, low + 2.0, low, NOW + timedelta(minutes=i), atr=1.0)
+            assert not trail.confirmed_pivots
+
+        update = trail.update(100.5, 101.5, lows[-1], NOW + timedelta(minutes=4), atr=1.0)
+
+        assert [p.price for p in trail.confirmed_pivots] == [97.0]
+        assert trail.confirmed_pivots[0].timestamp == NOW + timedelta(minutes=2)
+        assert update.new_stop == 97.0
+
+    def test_equal_lows_are_not_pivots(self):
+        """Ties with a neighbouring bar do not confirm a pivot."""
+        trail = PivotTrailingStop("long", 100.0, 95.0, pivot_lookback=1)
+        for low in (98.0, 97.0, 97.0, 98.0):
+            trail.update(low, low + 1.0, low, NOW, atr=1.0)
+
+        assert not trail.confirmed_pivots
+
+    @pytest.mark.parametrize("direction", ["long", "short"])
+    def test_keeps_five_unique_pivots(self, direction):
+        """Only the five most recent distinct pivots are retained."""
+        rng = np.random.default_rng(2)
+        sign = 1 if direction == "long" else -1
+        close = 100 + sign * np.cumsum(rng.normal(0.05, 0.5, 400))
+        trail = PivotTrailingStop(direction, 100.0, 100.0 - sign * 3, pivot_lookback=2)
+        for i, c in enumerate(close):
+            trail.update(c, c + 0.3, c - 0.3, NOW + timedelta(minutes=i), atr=1.0)
+
+        prices = [p.price for p in trail.confirmed_pivots]
+        assert len(prices) == 5
+        assert trail._sorted_pivots == sorted(trail.confirmed_pivots, key=lambda p: sign * p.price)
+        assert trail._pivot_keys == sorted(sign * p for p in prices)
+
+    @pytest.mark.parametrize("direction", ["long", "short"])
+    def test_cached_best_pivot_matches_scan(self, direction):
+        """Cached best pivot equals a fresh scan of the confirmed pivots every bar."""
+        rng = np.random.default_rng(4)
+        sign = 1 if direction == "long" else -1
+        close = 100 + np.round(np.cumsum(rng.normal(0.05 * sign, 0.6, 300)), 2)
+        trail = PivotTrailingStop(direction, 100.0, 100.0 - sign * 3, pivot_lookback=1)
+        for i, c in enumerate(close):
+            trail.update(c, c + 0.25, c - 0.25, NOW + timedelta(minutes=i), atr=1.0)
+            valid = [p for p in trail.confirmed_pivots
+                     if sign * (trail.highest_favorable - p.price) > 0]
+            expected = max(valid, key=lambda p: sign * p.price) if valid else None
+
+            assert trail._find_best_pivot() is expected
+
+    @pytest.mark.parametrize("direction", ["long", "short"])
+    @pytest.mark.parametrize("lookback", [0, 1, 3])
+    def test_swing_pivot_mask_matches_definition(self, direction, lookback):
+        """Vectorized mask flags exactly the strict swing pivots, ties excluded."""
+        rng = np.random.default_rng(lookback)
+        values = 100 + np.round(np.cumsum(rng.normal(0, 0.5, 300)), 1)
+        sign = 1 if direction == "long" else -1
+
+        expected = [
+            lookback <= i < len(values) - lookback and all(
+                sign * (values[j] - values[i]) > 0
+                for j in range(i - lookback, i + lookback + 1) if j != i
+            )
+            for i in range(len(values))
+        ]
+
+        mask = swing_pivot_mask(values, lookback, direction)
+        assert mask.tolist() == expected
+        assert 0 < mask.sum() < len(values) or lookback == 0
+
+    def test_swing_pivot_mask_short_series(self):
+        """Series shorter than the pivot window have no pivots."""
+        assert not swing_pivot_mask(np.array([3.0, 1.0, 2.0]), 2).any()
+
+
+def test_hybrid_takes_tighter_stop():
+    """Hybrid trail reports the tighter of the pivot and ATR stops."""
+    rng = np.random.default_rng(6)
+    close = 100 + np.cumsum(rng.normal(0.05, 0.5, 200))
+    trail = HybridTrailingStop("long", 100.0, 97.0)
+    for i, c in enumerate(close):
+        trail.update(c, c + 0.3, c - 0.3, NOW + timedelta(minutes=i),
+                     atr=None if i % 7 == 0 else 1.0)
+
+        assert trail.current_stop == max(trail.pivot_trail.current_stop, trail.vol_stop)
+        assert trail.highest_favorable == max(trail.pivot_trail.highest_favorable,
+                                              trail.vol_favorable)
+
+    assert {u.reason for u in trail.trail_updates} == {
+        "Hybrid trail: pivot", "Hybrid trail: ATR fallback"
+    }
+
+
+@pytest.mark.parametrize("exit_mode", [
+    ExitMode.TRAIL_VOL, ExitMode.TRAIL_PIVOT, ExitMode.HYBRID_VOL_PIVOT,
+])
+@pytest.mark.parametrize("direction", ["long", "short"])
+@pytest.mark.parametrize("with_atr", [True, False])
+def test_update_batch_matches_bar_updates(exit_mode, direction, with_atr):
+    """Chunked batch replay reproduces per-bar updates and trail state."""
+    rng = np.random.default_rng(12)
+    sign = 1 if direction == "long" else -1
+    n = 250
+    close = 100 + np.round(np.cumsum(rng.normal(0.03 * sign, 0.5, n)), 2)
+    highs = close + np.round(rng.uniform(0, 0.5, n), 2)
+    lows = close - np.round(rng.uniform(0, 0.5, n), 2)
+    atrs = rng.uniform(0.5, 2.0, n)
+    atrs[40] = np.nan
+    timestamps = [NOW + timedelta(minutes=i) for i in range(n)]
+
+    def make():
+        return TrailingStopManager(direction, 100.0, 100.0 - sign * 3, exit_mode, 2.5,
+                                   trail_factor=1.5, pivot_lookback=2)
+
+    scalar = make()
+    expected = []
+    for i in range(n):
+        update = scalar.update(current_price=close[i], bar_high=highs[i], bar_low=lows[i],
+                               timestamp=timestamps[i], atr=atrs[i] if with_atr else None)
+        if update:
+            expected.append(update)
+
+    batch = make()
+    updates = []
+    for lo, hi in ((0, 1), (1, 90), (90, 91), (91, n)):
+        updates += batch.update_batch(highs[lo:hi], lows[lo:hi], timestamps[lo:hi],
+                                      atrs[lo:hi] if with_atr else None)
+
+    assert len(expected) > 3 or (exit_mode == ExitMode.TRAIL_VOL and not with_atr)
+    assert updates == expected
+    assert batch.strategy.trail_updates == scalar.strategy.trail_updates
+    assert batch.current_stop == scalar.current_stop
+    assert batch.strategy.highest_favorable == scalar.strategy.highest_favorable
+    if exit_mode == ExitMode.TRAIL_PIVOT:
+        assert batch.strategy.confirmed_pivots == scalar.strategy.confirmed_pivots
+        assert batch.strategy._sorted_pivots == scalar.strategy._sorted_pivots
+
+
+@pytest.mark.parametrize("exit_mode", [
+    ExitMode.TRAIL_VOL, ExitMode.TRAIL_PIVOT, ExitMode.HYBRID_VOL_PIVOT,
+])
+def test_unrecorded_trail_tracks_same_stop(exit_mode):
+    """With recording off the stop moves identically but no updates are built."""
+    rng = np.random.default_rng(3)
+    close = 100 + np.round(np.cumsum(rng.normal(0.05, 0.5, 200)), 2)
+    highs, lows = close + 0.3, close - 0.3
+    timestamps = [NOW + timedelta(minutes=i) for i in range(200)]
+
+    recorded = TrailingStopManager("long", 100.0, 97.0, exit_mode, 3.0)
+    silent = TrailingStopManager("long", 100.0, 97.0, exit_mode, 3.0, record_updates=False)
+    for i in range(150):
+        kwargs = dict(current_price=close[i], bar_high=highs[i], bar_low=lows[i],
+                      timestamp=timestamps[i], atr=1.0)
+        recorded.update(**kwargs)
+
+        assert silent.update(**kwargs) is None
+        assert silent.current_stop == recorded.current_stop
+
+    recorded.update_batch(highs[150:], lows[150:], timestamps[150:], np.ones(50))
+
+    assert silent.update_batch(highs[150:], lows[150:], timestamps[150:], np.ones(50)) == []
+    assert silent.current_stop == recorded.current_stop
+    assert recorded.strategy.trail_updates
+    assert not silent.strategy.trail_updates
+
+
+def test_trail_update_repr():
+    """Trail updates render mode, stop move and MFE."""
+    trail = PivotTrailingStop("long", 100.0, 95.0, pivot_lookback=1, buffer_atr_mult=0.0)
+    for low in (99.0, 98.0, 99.5):
+        update = trail.update(low, low + 2.0, low, NOW, atr=1.0)
+
+    assert repr(update) == "TrailUpdate(TRAIL_PIVOT, 95.00 → 98.00, MFE=0.30R)"
+
+
+def test_max_history_keeps_latest_updates():
+    """Bounded history keeps the most recent updates from both update paths."""
+    rng = np.random.default_rng(5)
+    close = 100 + np.round(np.cumsum(rng.normal(0.1, 0.5, 200)), 2)
+    highs, lows = close + 0.3, close - 0.3
+    timestamps = [NOW + timedelta(minutes=i) for i in range(200)]
+
+    full = TrailingStopManager("long", 100.0, 97.0, ExitMode.TRAIL_VOL, 3.0)
+    bounded = TrailingStopManager("long", 100.0, 97.0, ExitMode.TRAIL_VOL, 3.0, max_history=4)
+    for manager in (full, bounded):
+        for i in range(100):
+            manager.update(current_price=close[i], bar_high=highs[i], bar_low=lows[i],
+                           timestamp=timestamps[i], atr=1.0)
+        manager.update_batch(highs[100:], lows[100:], timestamps[100:], np.ones(100))
+
+    assert len(full.strategy.trail_updates) > 4
+    assert list(bounded.strategy.trail_updates) == full.strategy.trail_updates[-4:]
@@ -0,0 +1,182 @@
+"""Tests for the two-phase stop system."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from orb_confluence.risk.two_phase_stop import (
+    STOP_PARAMS_DTYPE,
+    StopPhase,
+    TwoPhaseStopManager,
+    compute_phase1_stop_from_mae_distribution,
+    simulate_stops,
+)
+
+
+NOW = datetime(2024, 1, 2, 15, 0)
+
+
+class TestTwoPhaseStopManager:
+    """Test per-bar phase transitions."""
+
+    @pytest.mark.parametrize("direction, sign", [("long", 1), ("SHORT", -1)])
+    def test_breakeven_then_phase2(self, direction, sign):
+        """Stop moves to entry first, then to the structural anchor in Phase 2."""
+        manager = TwoPhaseStopManager(direction, 5000.0, 5.0, phase1_stop_distance=4.0,
+                                      structural_anchor=5000.0 + sign * 1.0,
+                                      structural_buffer=0.25)
+
+        assert manager.current_stop == pytest.approx(5000.0 - sign * 5.2)
+        assert manager.update(5001.0, 0.1, NOW) is None
+
+        breakeven = manager.update(5002.0, 0.4, NOW)
+        assert breakeven.new_stop == 5000.0
+        assert breakeven.new_phase == StopPhase.PHASE1_STATISTICAL
+
+        phase2 = manager.update(5004.0, 0.7, NOW)
+        assert phase2.new_phase == StopPhase.PHASE2_EXPANSION
+        assert phase2.new_stop == 5000.0 + sign * 0.75
+        assert repr(phase2).startswith("StopUpdate(PHASE1_STATISTICAL → PHASE2_EXPANSION,")
+        assert manager.get_stop_distance_r() == pytest.approx(0.15)
+
+    def test_runner_requires_extension_probability(self):
+        """Phase 3 is only enabled when p_extension clears the threshold."""
+        gated = TwoPhaseStopManager("long", 5000.0, 5.0, 4.0, breakeven_trigger_r=5.0,
+                                    p_extension=0.3)
+        runner = TwoPhaseStopManager("long", 5000.0, 5.0, 4.0, breakeven_trigger_r=5.0,
+                                     p_extension=0.5)
+        for manager in (gated, runner):
+            manager.update(5004.0, 0.8, NOW)
+            manager.update(5010.0, 2.0, NOW)
+
+        assert gated.phase == StopPhase.PHASE2_EXPANSION
+        assert runner.is_in_runner_phase
+        assert runner.stop_updates[-1].reason == "Runner enabled at 2.00R (p=0.50)"
+
+
+@pytest.mark.parametrize("direction", ["long", "short"])
+@pytest.mark.parametrize("with_anchor, p_extension", [(False, None), (True, 0.5)])
+def test_update_batch_matches_bar_updates(direction, with_anchor, p_extension):
+    """Chunked batch replay reproduces per-bar updates and manager state."""
+    sign = 1 if direction == "long" else -1
+    anchor = 5000.0 - sign * 1.5 if with_anchor else None
+    timestamps = [NOW + timedelta(minutes=i) for i in range(150)]
+
+    def make():
+        return TwoPhaseStopManager(direction, 5000.0, 5.0, 3.0, phase2_trigger_r=0.5,
+                                   runner_trigger_r=1.0, structural_anchor=anchor,
+                                   structural_buffer=0.25, p_extension=p_extension)
+
+    for seed in range(10):
+        rng = np.random.default_rng(seed)
+        mfe = np.round(np.maximum.accumulate(np.cumsum(rng.normal(0.03, 0.15, 150))), 3)
+        anchors = np.where(rng.random(150) < 0.1, 5000.0 + rng.normal(0, 3, 150), np.nan)
+
+        scalar = make()
+        expected = []
+        for i in range(150):
+            new_anchor = None if np.isnan(anchors[i]) else anchors[i]
+            update = scalar.update(5000.0, mfe[i], timestamps[i], new_anchor)
+            if update:
+                expected.append(update)
+
+        batch = make()
+        updates = []
+        for lo, hi in ((0, 40), (40, 41), (41, 150)):
+            updates += batch.update_batch(mfe[lo:hi], timestamps[lo:hi], anchors[lo:hi])
+
+        assert updates == expected
+        assert batch.stop_updates == scalar.stop_updates
+        assert (batch.current_stop, batch.phase, batch.highest_mfe_r) == (
+            scalar.current_stop, scalar.phase, scalar.highest_mfe_r
+        )
+        assert batch.structural_anchor == scalar.structural_anchor
+
+
+def test_unrecorded_manager_tracks_same_stop():
+    """With recording off the stop and phase move identically, with no updates."""
+    rng = np.random.default_rng(7)
+    mfe = np.round(np.maximum.accumulate(np.cumsum(rng.normal(0.03, 0.15, 200))), 3)
+    timestamps = [NOW + timedelta(minutes=i) for i in range(200)]
+    kwargs = dict(runner_trigger_r=1.0, structural_anchor=4999.0, p_extension=0.5)
+
+    recorded = TwoPhaseStopManager("long", 5000.0, 5.0, 3.0, **kwargs)
+    silent = TwoPhaseStopManager("long", 5000.0, 5.0, 3.0, record_updates=False, **kwargs)
+    for i in range(100):
+        recorded.update(5000.0, mfe[i], timestamps[i])
+
+        assert silent.update(5000.0, mfe[i], timestamps[i]) is None
+        assert (silent.current_stop, silent.phase) == (recorded.current_stop, recorded.phase)
+
+    recorded.update_batch(mfe[100:], timestamps[100:])
+
+    assert silent.update_batch(mfe[100:], timestamps[100:]) == []
+    assert (silent.current_stop, silent.phase) == (recorded.current_stop, recorded.phase)
+    assert recorded.is_in_runner_phase
+    assert not silent.stop_updates
+
+
+class TestPhase1StopFromMae:
+    """Test Phase 1 stop distance from the winner MAE distribution."""
+
+    @pytest.mark.parametrize("percentile", [0.0, 37.5, 80.0, 100.0])
+    def test_matches_percentile_of_abs_mae(self, percentile):
+        """Lists and arrays give the interpolated percentile of |MAE|."""
+        mae = np.random.default_rng(1).normal(-0.3, 0.4, 501)
+        original = mae.copy()
+        expected = np.percentile([abs(m) for m in mae], percentile)
+
+        assert compute_phase1_stop_from_mae_distribution(list(mae), percentile) == expected
+        assert compute_phase1_stop_from_mae_distribution(mae, percentile) == expected
+        np.testing.assert_array_equal(mae, original)
+
+    @pytest.mark.parametrize("values", [[], np.array([])])
+    def test_empty_falls_back_to_one_r(self, values):
+        """No winners falls back to a 1R stop."""
+        assert compute_phase1_stop_from_mae_distribution(values) == 1.0
+
+
+def test_simulate_stops_matches_managers():
+    """Whole-backtest simulation matches a fresh manager per trade."""
+    rng = np.random.default_rng(11)
+    n_trades, n_bars = 40, 120
+    mfe = np.round(np.maximum.accumulate(
+        np.cumsum(rng.normal(0.03, 0.15, (n_trades, n_bars)), axis=1), axis=1), 3)
+    mfe[0, 80:] = np.nan  # Shorter trade, padded
+    anchors = np.where(rng.random(mfe.shape) < 0.05, 5000.0 + rng.normal(0, 3, mfe.shape),
+                       np.nan)
+    params = np.zeros(n_trades, dtype=STOP_PARAMS_DTYPE)
+    kwargs = []
+    for t in range(n_trades):
+        long = t % 2 == 0
+        p_extension = rng.uniform(0.2, 0.7)
+        kw = dict(direction="long" if long else "short", entry_price=5000.0,
+                  initial_risk=5.0, phase1_stop_distance=rng.uniform(2.0, 5.0),
+                  phase2_trigger_r=0.5, runner_trigger_r=1.0,
+                  structural_anchor=None if t % 3 else 5000.0 - (1 if long else -1) * 1.5,
+                  structural_buffer=0.25, p_extension=p_extension)
+        kwargs.append(kw)
+        params[t] = (1 if long else -1, 5000.0, 5.0, kw["phase1_stop_distance"] * 1.3,
+                     0.5, 1.0, 0.3, kw["structural_anchor"] or np.nan, 0.25,
+                     p_extension >= 0.42)
+
+    stops, phases = simulate_stops(mfe, params, anchors)
+
+    assert stops.shape == phases.shape == mfe.shape
+    for t, kw in enumerate(kwargs):
+        manager = TwoPhaseStopManager(**kw)
+        expected_stops, expected_phases = [], []
+        for i in range(n_bars):
+            if np.isnan(mfe[t, i]):
+                break
+            anchor = None if np.isnan(anchors[t, i]) else anchors[t, i]
+            manager.update(5000.0, mfe[t, i], NOW, anchor)
+            expected_stops.append(manager.current_stop)
+            expected_phases.append(manager.phase)
+
+        k = len(expected_stops)
+        assert stops[t, :k].tolist() == expected_stops
+        assert phases[t, :k].tolist() == expected_phases
+    assert (stops[0, 80:] == stops[0, 79]).all()
+    assert {1, 2} <= set(phases[:, -1].tolist())